@@ -0,0 +1,142 @@
+"""
+Benchmark de contención: inscripción directa vs admisión por turnos
+Reproduce la apertura de un taller de alta demanda (cientos de estudiantes en
+pocos segundos) sobre un modelo del item WORKSHOP#<id>/METADATA y compara:
+
+- directo: cada request ejecuta la transacción de inscripción; dos transacciones
+  simultáneas sobre el mismo item chocan (TransactionConflict) y el SDK reintenta
+  con backoff exponencial; agotados los reintentos el cliente recibe un 500.
+- cola: cada request crea un ticket en su propia partición y lo encola en
+  LocalTicketQueue (el mismo sustituto de SQS que usan las pruebas locales); un
+  único consumidor lo drena en lotes de 10, una transacción a la vez. El cliente
+  consulta el ticket cada --poll-ms.
+
+Las duraciones de cada operación son parámetros del modelo, no mediciones.
+
+Uso:
+  python Lambda/benchmarks/admission_bench.py [--students 500] [--burst 5] [--poll-ms 1000]
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'functions'))
+
+from shared.admission import LocalTicketQueue
+
+# Duración de la transacción de inscripción sobre el item del taller (ms)
+TXN_MS = 25
+# Overhead del request en API Gateway + Lambda caliente (ms)
+REQUEST_MS = 15
+# Escritura del ticket y envío a la cola (ms)
+TICKET_MS = 20
+# Lectura + cierre del ticket en el consumidor (ms por ticket, fuera del item caliente)
+TICKET_UPDATE_MS = 10
+# Latencia del event source mapping de SQS al entregar un lote (ms)
+EVENT_SOURCE_MS = 50
+# Tamaño de lote del consumidor (SqsEventSource batchSize)
+BATCH_SIZE = 10
+# Reintentos del SDK ante TransactionConflict (modo estándar de botocore)
+MAX_RETRIES = 3
+BACKOFF_BASE_MS = 50
+
+
+def arrivals(students, burst_s, seed):
+    """Llegadas uniformes dentro de la ventana de apertura (ms)"""
+    rng = random.Random(seed)
+    return sorted(rng.uniform(0, burst_s * 1000) for _ in range(students))
+
+
+def simulate_direct(times, seed):
+    """
+    Devuelve (latencias hasta la respuesta final, errores 500, intentos sobre el item)
+    """
+    rng = random.Random(seed)
+    queue = [(t + REQUEST_MS, i, 0) for i, t in enumerate(times)]
+    heapq.heapify(queue)
+    busy_until = 0.0
+    attempts = 0
+    errors = 0
+    latencies = []
+    while queue:
+        t, i, retry = heapq.heappop(queue)
+        attempts += 1
+        if t < busy_until:
+            # Conflicto con la transacción en curso sobre el mismo item
+            if retry >= MAX_RETRIES:
+                errors += 1
+                latencies.append(t - times[i])
+                continue
+            backoff = rng.uniform(0, BACKOFF_BASE_MS * 2 ** retry)
+            heapq.heappush(queue, (t + backoff, i, retry + 1))
+            continue
+        # Con cupo o sin él la transacción ocupa el item (la condición se evalúa dentro)
+        busy_until = t + TXN_MS
+        latencies.append(busy_until - times[i])
+    return latencies, errors, attempts
+
+
+def simulate_queue(times, poll_ms):
+    """
+    Devuelve (latencias hasta que el cliente ve el resultado, errores, escrituras sobre el item)
+    """
+    queue = LocalTicketQueue()
+    enqueued_at = {}
+    pending = sorted((t + REQUEST_MS + TICKET_MS, i) for i, t in enumerate(times))
+    consumer_free = 0.0
+    next_arrival = 0
+    latencies = []
+    writes = 0
+    while next_arrival < len(pending) or queue.messages:
+        # El consumidor toma lo que ya está en la cola cuando queda libre
+        now = consumer_free
+        if not queue.messages:
+            now = max(now, pending[next_arrival][0])
+        while next_arrival < len(pending) and pending[next_arrival][0] <= now:
+            at, i = pending[next_arrival]
+            enqueued_at[i] = at
+            queue.send({'ticket_id': str(i), 'workshop_id': 'hot'})
+            next_arrival += 1
+        batch = queue.drain(BATCH_SIZE)['Records']
+        t = now + EVENT_SOURCE_MS
+        for record in batch:
+            i = int(json.loads(record['body'])['ticket_id'])
+            t += TXN_MS + TICKET_UPDATE_MS
+            writes += 1
+            # El cliente se entera en la primera consulta posterior al cierre del ticket
+            polls = max(1, -(-(t - enqueued_at[i]) // poll_ms))
+            latencies.append(enqueued_at[i] + polls * poll_ms - times[i])
+        consumer_free = t
+    return latencies, 0, writes
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--burst', type=float, default=5, help='segundos en que llegan todas las peticiones')
+    parser.add_argument('--poll-ms', type=float, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    times = arrivals(args.students, args.burst, args.seed)
+    direct = simulate_direct(times, args.seed)
+    queued = simulate_queue(times, args.poll_ms)
+    
+    print(f'{args.students} estudiantes en {args.burst}s, '
+          f'transacción {TXN_MS} ms, consulta de ticket cada {args.poll_ms:.0f} ms')
+    print(f'{"modo":<10} {"errores 500":>12} {"escrituras item":>16} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    for name, (latencies, errors, writes) in (('directo', direct), ('cola', queued)):
+        print(f'{name:<10} {errors:>12} {writes:>16} '
+              f'{percentile(latencies, 50):>9.0f} {percentile(latencies, 95):>9.0f} {percentile(latencies, 99):>9.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark de cold start por handler
+Cada módulo con handler en Lambda/functions se importa en un proceso nuevo
+(como un contenedor recién creado) y se invoca una vez con un evento sin
+credenciales. Las llamadas a AWS están stubbeadas: con botocore instalado se
+reemplaza BaseClient._make_api_call para que no haya red; sin boto3 se usa un
+módulo falso, y el tiempo de import no incluye el de boto3.
+
+Uso: python Lambda/benchmarks/cold_start_bench.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+FUNCTIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'functions'))
+
+CHILD = r'''
+import importlib, importlib.abc, importlib.util, json, sys, time, types
+from unittest import mock
+
+class StubApiCalls(importlib.abc.MetaPathFinder):
+    """Parchea botocore.client al importarse para que no haya llamadas de red"""
+    def find_spec(self, name, path, target=None):
+        if name != 'botocore.client':
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        exec_module = spec.loader.exec_module
+        def patched(module):
+            exec_module(module)
+            module.BaseClient._make_api_call = lambda self, operation, params: {}
+        spec.loader.exec_module = patched
+        return spec
+
+real_boto3 = importlib.util.find_spec('boto3') is not None
+if real_boto3:
+    sys.meta_path.insert(0, StubApiCalls())
+else:
+    for name in ('boto3', 'boto3.dynamodb', 'boto3.dynamodb.conditions', 'boto3.dynamodb.types'):
+        sys.modules[name] = mock.MagicMock(name=name)
+
+module_name = sys.argv[1]
+start = time.perf_counter()
+module = importlib.import_module(module_name)
+import_ms = (time.perf_counter() - start) * 1000
+boto3_at_import = 'boto3' in sys.modules and real_boto3
+
+event = {'httpMethod': 'GET', 'headers': {}, 'queryStringParameters': None,
+         'pathParameters': None, 'requestContext': {}, 'body': None}
+start = time.perf_counter()
+try:
+    status = (module.handler(event, None) or {}).get('statusCode')
+except Exception as e:
+    status = type(e).__name__
+invoke_ms = (time.perf_counter() - start) * 1000
+
+print(json.dumps({'import_ms': import_ms, 'invoke_ms': invoke_ms, 'status': status,
+                  'boto3_at_import': boto3_at_import, 'real_boto3': real_boto3}))
+'''
+
+
+def handler_modules():
+    """Módulos que exponen un handler (excluye shared/ y maintenance/)"""
+    modules = []
+    for root, dirs, files in os.walk(FUNCTIONS_DIR):
+        rel = os.path.relpath(root, FUNCTIONS_DIR)
+        if rel.split(os.sep)[0] in ('shared', 'maintenance', '__pycache__'):
+            continue
+        for name in sorted(files):
+            if not name.endswith('.py') or name == '__init__.py':
+                continue
+            with open(os.path.join(root, name), encoding='utf-8') as f:
+                if 'def handler(' not in f.read():
+                    continue
+            module = name[:-3] if rel == '.' else f'{rel.replace(os.sep, ".")}.{name[:-3]}'
+            modules.append(module)
+    return sorted(modules)
+
+
+def measure(module):
+    """Un cold start: proceso nuevo, import + primera invocación"""
+    env = dict(os.environ, PYTHONPATH=FUNCTIONS_DIR, PYTHONDONTWRITEBYTECODE='1',
+               TABLE_NAME='bench-table', AWS_DEFAULT_REGION='us-east-1',
+               AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench')
+    out = subprocess.run([sys.executable, '-c', CHILD, module], env=env, cwd=FUNCTIONS_DIR,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f'{"módulo":<28} {"import ms":>10} {"1a invocación ms":>17} {"status":>8} {"boto3 en import":>15}')
+    real_boto3 = True
+    for module in handler_modules():
+        runs = [measure(module) for _ in range(args.runs)]
+        real_boto3 = runs[0]['real_boto3']
+        import_ms = statistics.median(r['import_ms'] for r in runs)
+        invoke_ms = statistics.median(r['invoke_ms'] for r in runs)
+        loaded = 'sí' if runs[0]['boto3_at_import'] else 'no'
+        print(f'{module:<28} {import_ms:>10.1f} {invoke_ms:>17.1f} {str(runs[0]["status"]):>8} {loaded:>15}')
+    if not real_boto3:
+        print('boto3 no está instalado: se usó un módulo falso y los tiempos no incluyen su import')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark de compresión de respuestas JSON
+Mide bytes ahorrados y costo de CPU de gzip/br para listados de talleres
+de distintos tamaños.
+
+Uso: python Lambda/benchmarks/compression_bench.py
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'functions'))
+
+from shared.compression import brotli, GZIP_LEVEL, BROTLI_QUALITY, MIN_COMPRESSION_SIZE
+
+SIZES = [1, 10, 50, 100, 500]
+REPEAT = 50
+CATEGORIAS = ['tecnologia', 'arte', 'negocios', 'idiomas', 'salud']
+
+
+def sample_workshop(i):
+    """Taller sintético con forma similar a la respuesta real"""
+    return {
+        '_id': f'{i:08x}-5f1c-4a2b-9d3e-7c6b5a4f3e2d',
+        'nombre': f'Taller de ejemplo número {i}',
+        'descripcion': 'Aprende los fundamentos y practica con ejercicios guiados durante la sesión. ' * 2,
+        'fecha': f'2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}',
+        'hora': f'{9 + i % 8:02d}:00',
+        'lugar': f'Sala {i % 20}',
+        'categoria': CATEGORIAS[i % len(CATEGORIAS)],
+        'tipo': 'presencial',
+        'instructor': f'Instructor {i % 30}',
+        'rating': 4.5,
+        'cupo': 30,
+        'cupos_disponibles': 30 - i % 30,
+        'inscritos': i % 30,
+    }
+
+
+def timed(fn, data):
+    """Devuelve (resultado, milisegundos promedio)"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn(data)
+    return result, (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    codecs = [('gzip', lambda d: gzip.compress(d, compresslevel=GZIP_LEVEL, mtime=0))]
+    if brotli:
+        codecs.append(('br', lambda d: brotli.compress(d, quality=BROTLI_QUALITY)))
+    else:
+        print('brotli no está instalado: solo se mide gzip')
+    
+    print(f'Umbral de compresión: {MIN_COMPRESSION_SIZE} bytes')
+    print(f'{"talleres":>8} {"codec":>5} {"original":>10} {"comprimido":>10} {"ahorro":>7} {"ms":>7}')
+    for size in SIZES:
+        raw = json.dumps({'workshops': [sample_workshop(i) for i in range(size)], 'nextCursor': None}).encode('utf-8')
+        for name, fn in codecs:
+            compressed, ms = timed(fn, raw)
+            saved = 100 * (1 - len(compressed) / len(raw))
+            print(f'{size:>8} {name:>5} {len(raw):>10} {len(compressed):>10} {saved:>6.1f}% {ms:>7.3f}')
+
+
+if __name__ == '__main__':
+    main()
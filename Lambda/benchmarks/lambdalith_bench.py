@@ -0,0 +1,147 @@
+"""
+Comparación por-función vs lambdalith (router.py)
+Reproduce una mezcla de tráfico sobre un modelo de contenedores Lambda y
+reporta frecuencia de cold starts y p50/p95 de latencia en ambos modos.
+
+El costo de init de cada módulo se mide de verdad (proceso nuevo, AWS
+stubbeado, ver cold_start_bench.py); la latencia warm de cada ruta es un
+parámetro del modelo. En modo lambdalith el contenedor paga el import del
+router al arrancar y el de cada módulo la primera vez que recibe su ruta.
+
+Uso:
+  python Lambda/benchmarks/lambdalith_bench.py [--minutes 120] [--rps 0.5]
+  python Lambda/benchmarks/lambdalith_bench.py --replay trafico.jsonl
+    (una línea JSON por request: {"t": segundos, "resource": "/workshops", "method": "GET"})
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'functions'))
+
+from cold_start_bench import measure
+from router import ROUTES
+
+# Mezcla de tráfico por defecto (peso relativo, latencia warm en ms)
+TRAFFIC_MIX = {
+    ('/workshops', 'GET'): (40, 25),
+    ('/workshops/{id}', 'GET'): (15, 12),
+    ('/categories', 'GET'): (10, 8),
+    ('/stats', 'GET'): (5, 15),
+    ('/registrations/me', 'GET'): (8, 30),
+    ('/workshops/{id}/register', 'POST'): (6, 35),
+    ('/workshops/{id}/register', 'DELETE'): (2, 35),
+    ('/auth/estudiantes/login', 'POST'): (5, 180),
+    ('/auth/login', 'POST'): (1, 180),
+    ('/auth/refresh', 'POST'): (3, 120),
+    ('/auth/estudiantes/registro', 'POST'): (1, 400),
+    ('/workshops', 'POST'): (0.5, 40),
+    ('/workshops/{id}', 'PUT'): (0.5, 40),
+    ('/workshops/{id}', 'DELETE'): (0.2, 30),
+    ('/students', 'GET'): (0.5, 60),
+    ('/students/{id}', 'DELETE'): (0.1, 200),
+    ('/ai/assistant', 'POST'): (1, 900),
+    ('/api', 'GET'): (0.2, 2),
+}
+# Tiempo que Lambda mantiene un contenedor inactivo antes de reciclarlo (aprox.)
+IDLE_TIMEOUT_S = 600
+# Arranque del runtime Python antes del import del handler (ms)
+RUNTIME_INIT_MS = 150
+
+
+def synthetic_traffic(minutes, rps, seed):
+    """Llegadas Poisson con la mezcla TRAFFIC_MIX"""
+    rng = random.Random(seed)
+    routes = list(TRAFFIC_MIX)
+    weights = [TRAFFIC_MIX[r][0] for r in routes]
+    t = 0.0
+    requests = []
+    while t < minutes * 60:
+        t += rng.expovariate(rps)
+        requests.append((t, rng.choices(routes, weights)[0]))
+    return requests
+
+
+def replayed_traffic(path):
+    """Lee un log de requests (JSON por línea) ordenado por tiempo"""
+    requests = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                requests.append((float(entry['t']), (entry['resource'], entry['method'])))
+    return sorted(requests)
+
+
+def simulate(requests, function_for, init_ms, module_import_ms):
+    """
+    Modelo de contenedores: cada función tiene contenedores con (libre_desde, último_uso,
+    módulos_importados). Si no hay uno libre y tibio se crea otro (cold start).
+    """
+    containers = {}
+    latencies = []
+    cold_starts = 0
+    for t, route in requests:
+        function = function_for(route)
+        module = ROUTES[route]
+        warm_ms = TRAFFIC_MIX.get(route, (0, 30))[1]
+        pool = containers.setdefault(function, [])
+        pool[:] = [c for c in pool if t - c['last_used'] < IDLE_TIMEOUT_S or c['busy_until'] > t]
+        idle = [c for c in pool if c['busy_until'] <= t]
+        latency = warm_ms
+        if idle:
+            container = max(idle, key=lambda c: c['last_used'])
+        else:
+            cold_starts += 1
+            latency += RUNTIME_INIT_MS + init_ms[function]
+            container = {'busy_until': t, 'last_used': t, 'modules': set()}
+            pool.append(container)
+        if module not in container['modules']:
+            latency += module_import_ms.get((function, module), 0)
+            container['modules'].add(module)
+        container['busy_until'] = t + latency / 1000
+        container['last_used'] = container['busy_until']
+        latencies.append(latency)
+    return cold_starts, latencies
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--minutes', type=float, default=120)
+    parser.add_argument('--rps', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--replay', help='log JSONL de requests a reproducir')
+    parser.add_argument('--runs', type=int, default=3, help='mediciones de init por módulo')
+    args = parser.parse_args()
+    
+    requests = replayed_traffic(args.replay) if args.replay else synthetic_traffic(args.minutes, args.rps, args.seed)
+    requests = [(t, route) for t, route in requests if route in ROUTES]
+    
+    modules = sorted(set(ROUTES.values()))
+    import_ms = {m: statistics.median(measure(m)['import_ms'] for _ in range(args.runs)) for m in modules}
+    router_ms = statistics.median(measure('router')['import_ms'] for _ in range(args.runs))
+    
+    # Por función: cada módulo es su propia Lambda y paga su import en el init
+    per_function = simulate(requests, lambda route: ROUTES[route], import_ms, {})
+    # Lambdalith: una sola Lambda; los módulos se importan en la primera petición de su ruta
+    lambdalith = simulate(requests, lambda route: 'router', {'router': router_ms},
+                          {('router', m): ms for m, ms in import_ms.items()})
+    
+    print(f'{len(requests)} requests, contenedor inactivo reciclado a los {IDLE_TIMEOUT_S}s')
+    print(f'{"modo":<14} {"cold starts":>12} {"% cold":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for name, (cold, latencies) in (('por función', per_function), ('lambdalith', lambdalith)):
+        print(f'{name:<14} {cold:>12} {100 * cold / len(latencies):>7.2f}% '
+              f'{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de serialización de listados de talleres
+Compara el DecimalEncoder anterior (json + subclase) con shared.serialization
+(orjson si está instalado, json compacto si no) para 1k y 10k talleres.
+
+Uso: python Lambda/benchmarks/serialization_bench.py
+"""
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'functions'))
+
+from shared import serialization
+from shared.serialization import dumps
+
+SIZES = [1000, 10000]
+REPEAT = 10
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """Encoder que tenía cada Lambda antes de shared.serialization"""
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        return super(DecimalEncoder, self).default(obj)
+
+
+def sample_workshop(i):
+    """Taller como lo devuelve DynamoDB (números en Decimal)"""
+    return {
+        '_id': f'{i:08x}-5f1c-4a2b-9d3e-7c6b5a4f3e2d',
+        'nombre': f'Taller de programación número {i}',
+        'descripcion': 'Aprende los fundamentos y practica con ejercicios guiados.',
+        'fecha': f'2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}',
+        'hora': f'{9 + i % 8:02d}:00',
+        'lugar': f'Sala {i % 20}',
+        'categoria': 'tecnologia',
+        'tipo': 'presencial',
+        'instructor': f'Instructor {i % 30}',
+        'rating': Decimal('4.5'),
+        'cupo': Decimal(30),
+        'cupos_disponibles': Decimal(30 - i % 30),
+        'inscritos': Decimal(i % 30),
+    }
+
+
+def timed(fn, payload):
+    """Milisegundos promedio por serialización"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(payload)
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    backend = 'orjson' if serialization.orjson else 'json (respaldo)'
+    print(f'Backend de shared.serialization: {backend}')
+    print(f'{"talleres":>8} {"DecimalEncoder ms":>18} {"dumps ms":>10} {"bytes antes":>12} {"bytes ahora":>12}')
+    for size in SIZES:
+        payload = {'workshops': [sample_workshop(i) for i in range(size)], 'nextCursor': None}
+        legacy = lambda p: json.dumps(p, cls=DecimalEncoder)
+        legacy_ms = timed(legacy, payload)
+        shared_ms = timed(dumps, payload)
+        print(f'{size:>8} {legacy_ms:>18.2f} {shared_ms:>10.2f} {len(legacy(payload)):>12} {len(dumps(payload)):>12}')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,16 +5,18 @@ Usa Amazon Nova Micro (free tier disponible)
 
 import json
 import os
-import boto3
 from datetime import datetime
-from decimal import Decimal
+from shared.catalog import all_workshops
+from shared.projection import registration_count
+from shared.http import parse_json_body
+from shared.serialization import dumps
+from shared.aws import lazy_client, lazy_table
 
 # Cliente de DynamoDB
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ.get('TABLE_NAME', 'SkillsForge-Dev-Workshops'))
+table = lazy_table(os.environ.get('TABLE_NAME', 'SkillsForge-Dev-Workshops'))
 
 # Cliente de Bedrock Runtime
-bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+bedrock = lazy_client('bedrock-runtime', region_name='us-east-1')
 
 # Modelo a usar (Free Tier) - Amazon Nova Micro
 MODEL_ID = 'amazon.nova-micro-v1:0'
@@ -24,28 +26,18 @@ MAX_INPUT_TOKENS = 500  # Limitar input para ahorrar tokens
 MAX_OUTPUT_TOKENS = 200  # Limitar output para ahorrar tokens
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """Encoder para manejar Decimals de DynamoDB"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
-
-
 def get_workshops_data():
     """Obtiene datos reales de talleres desde DynamoDB"""
     try:
-        response = table.query(
-            IndexName='GSI1',
-            KeyConditionExpression='GSI1PK = :pk',
-            ExpressionAttributeValues={':pk': 'WORKSHOP#ALL'},
-            Limit=20  # Limitar para no exceder tokens
-        )
+        # Catálogo cacheado por versión; limitar a 20 para no exceder tokens
+        items = all_workshops(table)[:20]
         
         workshops = []
-        for item in response.get('Items', []):
+        for item in items:
+            cupo = int(item.get('cupo', 0))
+            inscritos = registration_count(item)
             workshops.append({
-                'id': item.get('_id', ''),
+                'id': item['PK'].replace('WORKSHOP#', ''),
                 'nombre': item.get('nombre', ''),
                 'descripcion': item.get('descripcion', '')[:100],  # Truncar descripción
                 'categoria': item.get('categoria', ''),
@@ -54,10 +46,10 @@ def get_workshops_data():
                 'hora': item.get('hora', ''),
                 'lugar': item.get('lugar', ''),
                 'instructor': item.get('instructor', ''),
-                'cupos_disponibles': int(item.get('cupos_disponibles', 0)),
-                'cupo': int(item.get('cupo', 0)),
+                'cupos_disponibles': max(cupo - inscritos, 0),
+                'cupo': cupo,
                 'rating': float(item.get('rating', 0)),
-                'inscritos': len(item.get('inscripciones', []))
+                'inscritos': inscritos
             })
         
         return workshops
@@ -94,14 +86,8 @@ def get_student_registrations(student_email: str):
 def get_platform_stats():
     """Obtiene estadísticas de la plataforma"""
     try:
-        # Contar talleres
-        workshops_response = table.query(
-            IndexName='GSI1',
-            KeyConditionExpression='GSI1PK = :pk',
-            ExpressionAttributeValues={':pk': 'WORKSHOP#ALL'},
-            Select='COUNT'
-        )
-        total_workshops = workshops_response.get('Count', 0)
+        # Contar talleres (catálogo cacheado por versión)
+        total_workshops = len(all_workshops(table))
         
         # Contar estudiantes
         students_response = table.query(
@@ -239,7 +225,7 @@ def handler(event, context):
     
     try:
         # Parsear body
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         # Soportar ambos nombres de campo
         user_message = body.get('mensaje', body.get('message', '')).strip()
         user_type = body.get('tipo_usuario', body.get('type', 'student'))  # 'student' o 'admin'
@@ -274,12 +260,12 @@ def handler(event, context):
         return {
             'statusCode': 200,
             'headers': headers,
-            'body': json.dumps({
+            'body': dumps({
                 'respuesta': response_text,  # Nombre en español para el frontend
                 'response': response_text,   # Mantener compatibilidad
                 'model': MODEL_ID,
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
-            }, cls=DecimalEncoder)
+            })
         }
         
     except json.JSONDecodeError:
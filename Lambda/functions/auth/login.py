@@ -5,12 +5,12 @@ POST /auth/login o /auth/estudiantes/login
 import json
 import os
 from datetime import datetime, timedelta
-import boto3
 import base64
+from shared.http import parse_json_body
+from shared.aws import lazy_client, lazy_table
 
-cognito = boto3.client('cognito-idp')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+cognito = lazy_client('cognito-idp')
+table = lazy_table()
 
 USER_POOL_ID = os.environ.get('USER_POOL_ID')
 CLIENT_ID = os.environ.get('CLIENT_ID')
@@ -39,7 +39,7 @@ def handler(event, context):
     Autentica usuarios (admin o estudiante) usando Cognito
     """
     try:
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         
         # Determinar si es login de admin o estudiante
         path = event.get('path', '')
@@ -5,9 +5,10 @@ POST /auth/refresh
 import json
 import os
 from datetime import datetime, timedelta
-import boto3
+from shared.http import parse_json_body
+from shared.aws import lazy_client
 
-cognito = boto3.client('cognito-idp')
+cognito = lazy_client('cognito-idp')
 
 USER_POOL_ID = os.environ.get('USER_POOL_ID')
 CLIENT_ID = os.environ.get('CLIENT_ID')
@@ -17,7 +18,7 @@ def handler(event, context):
     Refresca un token JWT usando el refresh token
     """
     try:
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         refresh_token = body.get('refresh_token', '')
         
         if not refresh_token:
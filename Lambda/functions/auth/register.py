@@ -5,22 +5,55 @@ POST /auth/estudiantes/registro
 import json
 import os
 from datetime import datetime
-import boto3
+from shared.http import parse_json_body
+from shared.idempotency import idempotent
+from shared.users import email_taken, create_user_transaction
+from shared.registrations import cancellation_reasons, condition_failed
+from shared.aws import lazy_client, lazy_table
 
-cognito = boto3.client('cognito-idp')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+cognito = lazy_client('cognito-idp')
+table = lazy_table()
 
 USER_POOL_ID = os.environ.get('USER_POOL_ID')
 CLIENT_ID = os.environ.get('CLIENT_ID')
+# Ventana corta: solo cubre los reintentos de un mismo envío del formulario
+IDEMPOTENCY_TTL_SECONDS = 15 * 60
 
+
+def replay_response(response):
+    """
+    Respuesta que se guarda para los reintentos: sin tokens. El reintento
+    recibe el estudiante creado y debe iniciar sesión.
+    """
+    try:
+        body = json.loads(response.get('body') or '{}')
+    except ValueError:
+        return response
+    if 'token' not in body and 'refresh_token' not in body:
+        return response
+    return {
+        **response,
+        'body': json.dumps({
+            'mensaje': 'Usuario creado. Por favor inicia sesión.',
+            'estudiante': body.get('estudiante')
+        })
+    }
+
+
+# La contraseña no entra en la huella y los tokens no se guardan en IDEMP#
+@idempotent(
+    'auth.register',
+    ttl_seconds=IDEMPOTENCY_TTL_SECONDS,
+    secret_fields=('contrasena',),
+    stored_response=replay_response,
+)
 def handler(event, context):
     """
     Registra un nuevo estudiante en Cognito y DynamoDB
     """
     try:
         print(f"Event body: {event.get('body', 'NO BODY')}")
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         print(f"Parsed body: {body}")
         
         nombre = body.get('nombre', '').strip()
@@ -77,12 +110,9 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'Formato de email inválido'})
             }
         
-        # Verificar si el email ya existe en DynamoDB (doble verificación)
-        existing_users = table.scan(
-            FilterExpression='email = :email',
-            ExpressionAttributeValues={':email': email}
-        )
-        if existing_users.get('Items'):
+        # Verificar si el email ya existe (GetItem del item EMAIL#) antes de crear
+        # el usuario en Cognito; la garantía la da la condición de la transacción
+        if email_taken(table, email):
             return {
                 'statusCode': 409,
                 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
@@ -147,7 +177,25 @@ def handler(event, context):
             'creado_en': now
         }
         
-        table.put_item(Item=item)
+        # USER# y EMAIL# en una transacción: si falla, se deshace el usuario
+        # recién creado en Cognito; solo la condición de EMAIL# es un duplicado
+        client = table.meta.client
+        try:
+            client.transact_write_items(TransactItems=create_user_transaction(table, item))
+        except client.exceptions.TransactionCanceledException as e:
+            try:
+                cognito.admin_delete_user(UserPoolId=USER_POOL_ID, Username=email)
+            except Exception as delete_error:
+                print(f'Error deshaciendo usuario en Cognito: {str(delete_error)}')
+            reasons = cancellation_reasons(e)
+            # Conflicto con otra transacción, throttling...: error del servidor
+            if len(reasons) != 2 or not condition_failed(reasons[1]):
+                raise
+            return {
+                'statusCode': 409,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'El email ya está registrado'})
+            }
         
         # Agregar usuario al grupo de estudiantes
         try:
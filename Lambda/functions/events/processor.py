@@ -4,10 +4,10 @@ Triggered by: EventBridge rules
 """
 import json
 import os
-import boto3
+from shared.aws import lazy_client, lazy_table
 
-sns = boto3.client('sns')
-dynamodb = boto3.resource('dynamodb')
+sns = lazy_client('sns')
+table = lazy_table()
 
 SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN')
 TABLE_NAME = os.environ.get('TABLE_NAME')
@@ -29,6 +29,10 @@ def handler(event, context):
             return handle_workshop_created(detail)
         elif detail_type == 'STUDENT_REGISTERED':
             return handle_student_registered(detail)
+        elif detail_type == 'STUDENT_UNREGISTERED':
+            return handle_student_unregistered(detail)
+        elif detail_type == 'STUDENT_PROMOTED':
+            return handle_student_promoted(detail)
         else:
             print(f'Tipo de evento no manejado: {detail_type}')
             return {'statusCode': 200, 'body': 'Evento ignorado'}
@@ -71,12 +75,27 @@ Accede al panel de administración para más detalles.
     
     return {'statusCode': 200, 'body': 'Evento procesado'}
 
+def get_workshop_name(workshop_id):
+    """
+    Nombre del taller para eventos que no lo traen (la inscripción no relee
+    el taller después de la transacción)
+    """
+    try:
+        response = table.get_item(
+            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            ProjectionExpression='nombre'
+        )
+        return response.get('Item', {}).get('nombre', '')
+    except Exception as e:
+        print(f'Error leyendo taller {workshop_id}: {e}')
+        return ''
+
 def handle_student_registered(detail):
     """
     Maneja el evento de estudiante inscrito
     """
     workshop_id = detail.get('workshopId')
-    workshop_name = detail.get('workshopName')
+    workshop_name = detail.get('workshopName') or get_workshop_name(workshop_id)
     student_name = detail.get('studentName')
     student_email = detail.get('studentEmail')
     registered_at = detail.get('registeredAt')
@@ -107,3 +126,69 @@ Equipo SkillsForge
         print(f'Error enviando notificación SNS: {str(e)}')
     
     return {'statusCode': 200, 'body': 'Evento procesado'}
+
+def handle_student_unregistered(detail):
+    """
+    Maneja el evento de inscripción anulada
+    """
+    workshop_id = detail.get('workshopId')
+    workshop_name = detail.get('workshopName')
+    student_name = detail.get('studentName')
+    student_email = detail.get('studentEmail')
+    
+    # Enviar confirmación al estudiante
+    message = f"""
+Inscripción anulada
+
+Hola {student_name},
+
+Tu inscripción al taller {workshop_name} fue anulada.
+Si fue un error, puedes volver a inscribirte mientras queden cupos.
+
+Equipo SkillsForge
+    """.strip()
+    
+    try:
+        sns.publish(
+            TopicArn=SNS_TOPIC_ARN,
+            Subject=f'Inscripción anulada - {workshop_name}',
+            Message=message
+        )
+        print(f'Notificación de anulación enviada a {student_email} (taller {workshop_id})')
+    except Exception as e:
+        print(f'Error enviando notificación SNS: {str(e)}')
+    
+    return {'statusCode': 200, 'body': 'Evento procesado'}
+
+def handle_student_promoted(detail):
+    """
+    Maneja el evento de promoción desde la lista de espera
+    """
+    workshop_id = detail.get('workshopId')
+    workshop_name = detail.get('workshopName')
+    student_name = detail.get('studentName')
+    student_email = detail.get('studentEmail')
+    
+    # Avisar al estudiante que ya tiene cupo
+    message = f"""
+¡Se liberó un cupo!
+
+Hola {student_name},
+
+Estabas en la lista de espera del taller {workshop_name} y ya quedaste inscrito.
+Si ya no puedes asistir, anula tu inscripción para liberar el cupo.
+
+Equipo SkillsForge
+    """.strip()
+    
+    try:
+        sns.publish(
+            TopicArn=SNS_TOPIC_ARN,
+            Subject=f'Inscripción confirmada - {workshop_name}',
+            Message=message
+        )
+        print(f'Notificación de promoción enviada a {student_email} (taller {workshop_id})')
+    except Exception as e:
+        print(f'Error enviando notificación SNS: {str(e)}')
+    
+    return {'statusCode': 200, 'body': 'Evento procesado'}
@@ -4,24 +4,18 @@ Checks for workshops coming up in the next 24-48 hours and sends reminders
 """
 import json
 import os
-import boto3
 from datetime import datetime, timedelta
-from decimal import Decimal
+from shared.serialization import dumps
+from shared.projection import registration_count
+from shared.registrations import list_registrations
+from shared.aws import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-sns = boto3.client('sns')
+sns = lazy_client('sns')
 
 table_name = os.environ.get('TABLE_NAME')
 sns_topic_arn = os.environ.get('SNS_TOPIC_ARN')
 
-table = dynamodb.Table(table_name)
-
-class DecimalEncoder(json.JSONEncoder):
-    """Helper class to convert DynamoDB Decimal to JSON"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+table = lazy_table(table_name)
 
 def handler(event, context):
     """
@@ -55,7 +49,7 @@ def handler(event, context):
                 continue
             
             # Get registered students
-            registrations = workshop.get('inscripciones', [])
+            registrations = list_registrations(table, workshop_id) if registration_count(workshop) else []
             
             if registrations:
                 # Send reminder via SNS
@@ -72,7 +66,7 @@ def handler(event, context):
                 sns.publish(
                     TopicArn=sns_topic_arn,
                     Subject=f'Recordatorio: {workshop.get("nombre")} mañana',
-                    Message=json.dumps(message, cls=DecimalEncoder)
+                    Message=dumps(message)
                 )
                 
                 # Mark as reminder sent
@@ -93,7 +87,7 @@ def handler(event, context):
             'statusCode': 200,
             'body': json.dumps({
                 'mensaje': f'Processed {len(workshops_to_remind)} workshops',
-                'workshops_reminded': len([w for w in workshops_to_remind if w.get('inscripciones')])
+                'workshops_reminded': len([w for w in workshops_to_remind if registration_count(w)])
             })
         }
         
@@ -5,12 +5,11 @@ Triggered by: EventBridge Scheduler (diariamente)
 import json
 import os
 from datetime import datetime, timedelta
-from boto3.dynamodb.conditions import Key, Attr
-import boto3
+from shared.registrations import list_registrations
+from shared.aws import lazy_client, lazy_table
 
-sns = boto3.client('sns')
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+sns = lazy_client('sns')
+table = lazy_table()
 
 SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN')
 
@@ -19,6 +18,8 @@ def handler(event, context):
     Busca talleres que ocurren en las próximas 24 horas
     y envía recordatorios a los estudiantes inscritos
     """
+    from boto3.dynamodb.conditions import Key, Attr
+    
     try:
         # Calcular fecha de mañana
         tomorrow = (datetime.utcnow() + timedelta(days=1)).date()
@@ -43,7 +44,7 @@ def handler(event, context):
             workshop_date = workshop.get('fecha')
             workshop_time = workshop.get('hora')
             workshop_location = workshop.get('lugar')
-            inscripciones = workshop.get('inscripciones', [])
+            inscripciones = list_registrations(table, workshop['PK'].replace('WORKSHOP#', ''))
             
             # Enviar recordatorio a cada estudiante inscrito
             for inscripcion in inscripciones:
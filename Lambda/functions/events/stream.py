@@ -0,0 +1,359 @@
+"""
+Lambda function para procesar el stream de DynamoDB
+Triggered by: DynamoDB Streams (NEW_AND_OLD_IMAGES)
+Mantiene las proyecciones derivadas de la tabla (índice de búsqueda de talleres,
+estadísticas globales, por categoría y series de tiempo, inscripciones por
+estudiante) y asigna los cupos liberados a la lista de espera
+
+Los contadores se suman en transacciones que además escriben un marcador
+STREAM#<eventID> del primer registro del grupo: si Lambda reintenta desde ese
+registro, el marcador ya existe y el grupo no se vuelve a sumar. Ante un
+error se reporta el primer registro sin aplicar (batchItemFailures) y Lambda
+reintenta desde ahí, así cada reintento empieza en el inicio de un grupo.
+"""
+import copy
+import json
+import os
+import time
+from datetime import datetime
+from boto3.dynamodb.types import TypeDeserializer
+from shared.search import sync_workshop_terms
+from shared.registrations import REG_PREFIX, cancellation_reasons, condition_failed, student_count_update, migration_write
+from shared.waitlist import has_free_seat, waitlist_items, promote_transaction, leave_waitlist_transaction
+from shared.stats import (
+    workshop_totals, student_totals, diff_totals, diff_category_totals,
+    merge_deltas, delta_update, category_key, category_counts,
+)
+from shared.metrics import OCCUPANCY, bucket_periods, registration_flows, category_occupancy, bucket_update, record_bucket
+from shared.aws import lazy_client, lazy_table
+
+events = lazy_client('events')
+table = lazy_table()
+
+# Bus donde están las reglas de notificación (no el bus por defecto)
+EVENT_BUS_NAME = os.environ.get('EVENT_BUS_NAME', 'default')
+
+# Límite de entradas por PutEvents
+PUT_EVENTS_MAX_ENTRIES = 10
+# Límite de TransactWriteItems: el marcador más los contadores de un grupo
+TRANSACT_MAX_ITEMS = 100
+# Los marcadores solo deben durar más que la retención del stream (24 h)
+MARKER_TTL_SECONDS = 2 * 24 * 3600
+# Reintentos de un grupo ante conflictos con otra transacción (p. ej. otro shard)
+TRANSACT_ATTEMPTS = 5
+CONFLICT_BACKOFF_SECONDS = 0.05
+
+deserializer = TypeDeserializer()
+
+
+def deserialize(image):
+    """Convierte una imagen del stream (formato DynamoDB JSON) en un dict"""
+    return {k: deserializer.deserialize(v) for k, v in (image or {}).items()}
+
+
+def promote_waitlist(workshop_id, item):
+    """
+    Inscribe en orden de llegada a los estudiantes en espera mientras quede cupo.
+    Cada promoción es una transacción condicionada, así que reintentos del lote
+    o promociones concurrentes nunca sobrepasan el cupo ni duplican inscripciones.
+    Devuelve las entradas promovidas.
+    """
+    client = table.meta.client
+    promoted = []
+    for entry in waitlist_items(table, workshop_id):
+        registrado_en = datetime.utcnow().isoformat()
+        try:
+            client.transact_write_items(
+                TransactItems=promote_transaction(table, workshop_id, entry, registrado_en)
+            )
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = cancellation_reasons(e)
+            if len(reasons) != 3:
+                raise
+            if condition_failed(reasons[0]):
+                # Sin cupo (o el taller ya no existe): se detiene la promoción
+                break
+            if condition_failed(reasons[2]):
+                # Ya estaba inscrito: su entrada de espera sobra
+                try:
+                    client.transact_write_items(
+                        TransactItems=leave_waitlist_transaction(table, workshop_id, entry['estudiante_id'])
+                    )
+                except client.exceptions.TransactionCanceledException:
+                    pass
+                continue
+            if condition_failed(reasons[1]):
+                # Salió de la lista mientras tanto
+                continue
+            raise
+        promoted.append({**entry, 'registrado_en': registrado_en})
+    
+    if promoted:
+        publish_promoted(workshop_id, item, promoted)
+    return promoted
+
+
+def publish_promoted(workshop_id, item, promoted):
+    """Un evento STUDENT_PROMOTED por estudiante promovido"""
+    entries = [{
+        'EventBusName': EVENT_BUS_NAME,
+        'Source': 'skillsforge.registrations',
+        'DetailType': 'STUDENT_PROMOTED',
+        'Detail': json.dumps({
+            'workshopId': workshop_id,
+            'workshopName': item.get('nombre'),
+            'studentId': entry['estudiante_id'],
+            'studentName': entry.get('nombre', ''),
+            'studentEmail': entry.get('email', ''),
+            'waitingSince': entry.get('en_espera_desde'),
+            'registeredAt': entry['registrado_en']
+        })
+    } for entry in promoted]
+    for start in range(0, len(entries), PUT_EVENTS_MAX_ENTRIES):
+        try:
+            events.put_events(Entries=entries[start:start + PUT_EVENTS_MAX_ENTRIES])
+        except Exception as e:
+            print(f'Error emitiendo eventos: {e}')
+
+
+def handle_workshop_change(workshop_id, old_image, new_image):
+    """
+    Propaga un cambio del item METADATA de un taller
+    """
+    writes = sync_workshop_terms(table, workshop_id, old_image, new_image)
+    if writes:
+        print(f'Índice de búsqueda actualizado para taller {workshop_id}: {writes} escrituras')
+    
+    # Cupo liberado (anulación, estudiante eliminado o cupo ampliado) con gente esperando
+    if new_image and int(new_image.get('en_espera', 0)) > 0 and has_free_seat(new_image):
+        promoted = promote_waitlist(workshop_id, new_image)
+        if promoted:
+            print(f'Promovidos desde la lista de espera del taller {workshop_id}: {len(promoted)}')
+
+
+def record_deltas(record):
+    """
+    Aplica los efectos de un registro que no son contadores (índice de
+    búsqueda, lista de espera; ambos idempotentes) y devuelve sus deltas:
+    {'stats', 'categories', 'metrics', 'students', 'latest'}, o None
+    """
+    change = record.get('dynamodb', {})
+    keys = deserialize(change.get('Keys'))
+    pk = keys.get('PK', '')
+    sk = keys.get('SK', '')
+    
+    if pk.startswith('WORKSHOP#') and sk.startswith(REG_PREFIX):
+        # La migración copia inscripciones existentes: no son altas nuevas
+        if migration_write(deserialize(change.get('OldImage')), deserialize(change.get('NewImage'))):
+            return None
+        # Alta (+1) o baja (-1) de una inscripción, venga del flujo que venga
+        delta = bool(change.get('NewImage')) - bool(change.get('OldImage'))
+        return {'students': {sk[len(REG_PREFIX):]: delta}} if delta else None
+    if sk != 'METADATA':
+        return None
+    
+    if pk.startswith('WORKSHOP#'):
+        old_image = deserialize(change.get('OldImage'))
+        new_image = deserialize(change.get('NewImage'))
+        handle_workshop_change(pk.replace('WORKSHOP#', ''), old_image, new_image)
+        if migration_write(old_image, new_image):
+            # `inscritos` recalculado por la migración: no es un flujo de inscripciones
+            return None
+        
+        # El instante del cambio (no el del procesamiento) decide el bucket
+        timestamp = change.get('ApproximateCreationDateTime') or time.time()
+        flows = registration_flows(old_image, new_image)
+        return {
+            'stats': diff_totals(workshop_totals(old_image), workshop_totals(new_image)),
+            'categories': diff_category_totals(old_image, new_image),
+            'metrics': {key: dict(flows) for key in bucket_periods(timestamp).items()} if flows else {},
+            'latest': timestamp,
+        }
+    if pk.startswith('USER#'):
+        return {'stats': diff_totals(
+            student_totals(deserialize(change.get('OldImage'))),
+            student_totals(deserialize(change.get('NewImage'))),
+        )}
+    return None
+
+
+def merge_record_deltas(total, deltas):
+    """Acumula los deltas de un registro en los de su grupo"""
+    merge_deltas(total.setdefault('stats', {}), deltas.get('stats', {}))
+    for category, delta in deltas.get('categories', {}).items():
+        merge_deltas(total.setdefault('categories', {}).setdefault(category, {}), delta)
+    for bucket, flows in deltas.get('metrics', {}).items():
+        merge_deltas(total.setdefault('metrics', {}).setdefault(bucket, {}), flows)
+    merge_deltas(total.setdefault('students', {}), deltas.get('students', {}))
+    if deltas.get('latest'):
+        total['latest'] = max(total.get('latest') or 0, deltas['latest'])
+    return total
+
+
+def counter_items(deltas):
+    """
+    TransactItems con los ADD de un grupo. Devuelve (items, estudiantes), donde
+    estudiantes[i] es el ID del estudiante del item i (None si no es un estudiante).
+    """
+    updates = [(delta_update(deltas.get('stats', {})), None)]
+    for category, delta in deltas.get('categories', {}).items():
+        updates.append((delta_update(delta, category_key(category)), None))
+    for (granularity, period), flows in deltas.get('metrics', {}).items():
+        flows = {counter: value for counter, value in flows.items() if value}
+        if flows:
+            updates.append((bucket_update(granularity, period, flows), None))
+    for student_id, delta in deltas.get('students', {}).items():
+        if delta:
+            updates.append((student_count_update(student_id, delta), student_id))
+    updates = [(update, student_id) for update, student_id in updates if update]
+    return (
+        [{'Update': {'TableName': table.name, **update}} for update, _ in updates],
+        [student_id for _, student_id in updates],
+    )
+
+
+def sequence_number(record):
+    return record['dynamodb']['SequenceNumber']
+
+
+def marker_item(first_record, last_record):
+    """Marcador del grupo: existe si sus deltas ya se sumaron"""
+    return {
+        'PK': f"STREAM#{first_record['eventID']}",
+        'SK': 'METADATA',
+        'ultimo': sequence_number(last_record),
+        'ttl': int(time.time()) + MARKER_TTL_SECONDS,
+    }
+
+
+def apply_group(first_record, last_record, deltas):
+    """
+    Suma los deltas del grupo en una transacción junto con su marcador.
+    Devuelve (SequenceNumber del último registro que el grupo cubre, True si
+    se escribió); si otra invocación ya lo había aplicado, el del marcador y False.
+    """
+    client = table.meta.client
+    deltas = {**deltas, 'students': dict(deltas.get('students', {}))}
+    for attempt in range(TRANSACT_ATTEMPTS):
+        items, students = counter_items(deltas)
+        marker = {'Put': {
+            'TableName': table.name,
+            'Item': marker_item(first_record, last_record),
+            'ConditionExpression': 'attribute_not_exists(PK)',
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+        }}
+        try:
+            client.transact_write_items(TransactItems=[marker] + items)
+            return sequence_number(last_record), True
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = cancellation_reasons(e)
+            if len(reasons) != len(items) + 1:
+                raise
+            if condition_failed(reasons[0]):
+                # Ya aplicado: el marcador dice hasta qué registro
+                return deserialize(reasons[0].get('Item')).get('ultimo') or sequence_number(last_record), False
+            gone = [
+                student_id for student_id, reason in zip(students, reasons[1:])
+                if student_id and condition_failed(reason)
+            ]
+            if gone:
+                for student_id in gone:
+                    print(f'Estudiante {student_id} ya no existe: contador de inscripciones omitido')
+                    deltas['students'].pop(student_id)
+                continue
+            if any(reason.get('Code') == 'TransactionConflict' for reason in reasons):
+                time.sleep(CONFLICT_BACKOFF_SECONDS * 2 ** attempt)
+                continue
+            raise
+    raise RuntimeError(f"Grupo {first_record['eventID']} sin aplicar tras {TRANSACT_ATTEMPTS} intentos")
+
+
+def apply_contributions(contributions):
+    """
+    Agrupa los deltas de los registros (en orden) en transacciones de hasta
+    TRANSACT_MAX_ITEMS items y las aplica. Devuelve (deltas escritos en esta
+    invocación, registro en el que se detuvo o None si aplicó todo).
+    """
+    applied = {}
+    index = 0
+    while index < len(contributions):
+        group = merge_record_deltas({}, contributions[index][1])
+        end = index + 1
+        while end < len(contributions):
+            candidate = merge_record_deltas(copy.deepcopy(group), contributions[end][1])
+            if len(counter_items(candidate)[0]) + 1 > TRANSACT_MAX_ITEMS:
+                break
+            group = candidate
+            end += 1
+        
+        first_record = contributions[index][0]
+        try:
+            covered, written = apply_group(first_record, contributions[end - 1][0], group)
+        except Exception as e:
+            print(f"Error sumando contadores desde el registro {first_record['eventID']}: {e}")
+            return applied, first_record
+        
+        while index < len(contributions) and int(sequence_number(contributions[index][0])) <= int(covered):
+            if written:
+                merge_record_deltas(applied, contributions[index][1])
+            index += 1
+    return applied, None
+
+
+def record_occupancy(applied):
+    """
+    Fija la ocupación de las categorías tocadas en los buckets del registro más
+    reciente. Es un SET (idempotente), por eso va fuera de las transacciones.
+    """
+    categories = list(applied.get('categories', {}))
+    if not categories or not applied.get('latest'):
+        return
+    occupancy = {}
+    for category, counter in category_counts(table, categories).items():
+        percent = category_occupancy(counter)
+        if percent is not None:
+            occupancy[f'{OCCUPANCY}#{category}'] = percent
+    if occupancy:
+        for granularity, period in bucket_periods(applied['latest']).items():
+            record_bucket(table, granularity, period, {}, occupancy)
+
+
+def handler(event, context):
+    """
+    Procesa los registros del stream en orden. Si uno falla (o no se pueden
+    sumar los contadores), se reporta como batchItemFailure y Lambda reintenta
+    desde ese registro; lo anterior queda confirmado.
+    """
+    processed = 0
+    # [(registro, deltas)] de los registros procesados que suman contadores
+    contributions = []
+    failed_record = None
+    for record in event.get('Records', []):
+        try:
+            deltas = record_deltas(record)
+        except Exception as e:
+            print(f"Error procesando el registro {record.get('eventID')}: {e}")
+            failed_record = record
+            break
+        processed += 1
+        # Solo los registros que cambian algún contador forman grupos
+        if deltas and counter_items(deltas)[0]:
+            contributions.append((record, deltas))
+    
+    applied, stopped_at = apply_contributions(contributions)
+    stats = {counter: value for counter, value in applied.get('stats', {}).items() if value}
+    if stats:
+        print(f'Estadísticas globales actualizadas: {stats}')
+    for category, delta in applied.get('categories', {}).items():
+        if any(delta.values()):
+            print(f'Contador de la categoría {category} actualizado: {delta}')
+    try:
+        record_occupancy(applied)
+    except Exception as e:
+        print(f'Error registrando la ocupación: {e}')
+    
+    failed_record = stopped_at or failed_record
+    print(f'Registros procesados: {processed}')
+    if failed_record:
+        return {'batchItemFailures': [{'itemIdentifier': sequence_number(failed_record)}]}
+    return {'batchItemFailures': []}
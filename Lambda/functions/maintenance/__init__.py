@@ -0,0 +1 @@
+# Tareas de mantenimiento (backfills y migraciones)
@@ -0,0 +1,54 @@
+"""
+Crea el item de unicidad EMAIL#<email> de los usuarios registrados antes de
+que existiera
+Invocación manual: aws lambda invoke o `python -m maintenance.backfill_email_index`
+Es idempotente: el Put está condicionado a que el item no exista. Correrlo una
+vez al desplegar, antes de que el registro y el borrado dependan de él.
+"""
+import json
+from shared.users import email_key, email_item
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def handler(event, context):
+    """
+    Recorre los items USER#/METADATA con email y crea su EMAIL# si falta.
+    Los emails repetidos (el primero gana) se reportan para revisarlos a mano.
+    """
+    from boto3.dynamodb.conditions import Attr
+    
+    created = 0
+    duplicates = []
+    scan_kwargs = {
+        'FilterExpression': Attr('PK').begins_with('USER#') & Attr('SK').eq('METADATA') & Attr('email').exists(),
+        'ProjectionExpression': 'PK, email, creado_en',
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            user_id = item['PK'].replace('USER#', '')
+            try:
+                table.put_item(
+                    Item=email_item(item['email'], user_id, item.get('creado_en', '')),
+                    ConditionExpression='attribute_not_exists(PK)'
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                existing = table.get_item(Key=email_key(item['email'])).get('Item', {})
+                if existing.get('user_id') != user_id:
+                    duplicates.append({'email': item['email'], 'user_id': user_id})
+                continue
+            created += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Items de email creados: {created}')
+    for duplicate in duplicates:
+        print(f"Email duplicado: {duplicate['email']} (usuario {duplicate['user_id']})")
+    return {'statusCode': 200, 'body': json.dumps({'creados': created, 'duplicados': duplicates})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
@@ -0,0 +1,61 @@
+"""
+Recalcula el contador `inscritos` de cada taller a partir de sus items REG#
+Invocación manual: aws lambda invoke o `python -m maintenance.backfill_inscritos`
+Correrlo después de migrate_registrations y cada vez que los contadores se
+desvíen. Es idempotente y no pisa inscripciones concurrentes: si el contador
+cambia entre la cuenta y la escritura, el taller se omite y se reporta.
+"""
+import json
+from shared.registrations import count_registrations
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def handler(event, context):
+    """
+    Cuenta los items REG# de cada taller (Select=COUNT) y fija `inscritos`
+    donde no coincide
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    updated = 0
+    skipped = []
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('WORKSHOP#ALL'),
+        'ProjectionExpression': 'PK, SK, inscritos',
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            count = count_registrations(table, item['PK'].replace('WORKSHOP#', ''))
+            if item.get('inscritos') == count:
+                continue
+            update_kwargs = {
+                'Key': {'PK': item['PK'], 'SK': item['SK']},
+                'UpdateExpression': 'SET inscritos = :count',
+                'ExpressionAttributeValues': {':count': count},
+            }
+            # Solo si nadie se inscribió ni anuló desde que se leyó el contador
+            if 'inscritos' in item:
+                update_kwargs['ConditionExpression'] = 'inscritos = :previous'
+                update_kwargs['ExpressionAttributeValues'][':previous'] = item['inscritos']
+            else:
+                update_kwargs['ConditionExpression'] = 'attribute_exists(PK) AND attribute_not_exists(inscritos)'
+            try:
+                table.update_item(**update_kwargs)
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                skipped.append(item['PK'].replace('WORKSHOP#', ''))
+                continue
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Talleres actualizados: {updated}, omitidos por cambios concurrentes: {len(skipped)}')
+    return {'statusCode': 200, 'body': json.dumps({'actualizados': updated, 'omitidos': skipped})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
@@ -0,0 +1,54 @@
+"""
+Agrega las llaves de GSI3 (inscripciones y esperas por estudiante) a los
+items REG# y WAIT# creados antes de que se indexaran
+Invocación manual: aws lambda invoke o `python -m maintenance.backfill_registration_index`
+Es idempotente: solo toca items sin GSI3PK.
+"""
+import json
+from shared.registrations import REG_PREFIX, student_index_keys
+from shared.waitlist import WAIT_PREFIX
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def handler(event, context):
+    """
+    Recorre los items REG# y WAIT# sin GSI3PK y les agrega GSI3PK/GSI3SK
+    """
+    from boto3.dynamodb.conditions import Attr
+    
+    updated = 0
+    scan_kwargs = {
+        'FilterExpression': (Attr('SK').begins_with(REG_PREFIX) | Attr('SK').begins_with(WAIT_PREFIX))
+                            & Attr('GSI3PK').not_exists(),
+        'ProjectionExpression': 'PK, SK, estudiante_id, registrado_en, en_espera_desde',
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if item['SK'].startswith(WAIT_PREFIX):
+                keys = student_index_keys(item['estudiante_id'], item.get('en_espera_desde') or '', WAIT_PREFIX)
+            else:
+                keys = student_index_keys(item['estudiante_id'], item.get('registrado_en') or '')
+            try:
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET GSI3PK = :pk, GSI3SK = :sk',
+                    ConditionExpression='attribute_exists(SK)',
+                    ExpressionAttributeValues={':pk': keys['GSI3PK'], ':sk': keys['GSI3SK']}
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                # La inscripción (o la espera) se anuló mientras tanto
+                continue
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Inscripciones indexadas: {updated}')
+    return {'statusCode': 200, 'body': json.dumps({'indexadas': updated})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
@@ -0,0 +1,73 @@
+"""
+Recalcula el contador `inscritos_count` de cada estudiante a partir de sus
+inscripciones en GSI3
+Invocación manual: aws lambda invoke o `python -m maintenance.backfill_student_counts`
+Correrlo una vez al desplegar (después de backfill_student_index y
+backfill_registration_index) y cada vez que los contadores se desvíen.
+"""
+import json
+from shared.registrations import REG_PREFIX, STUDENT_INDEX, STUDENT_COUNTER
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def registration_count(student_id):
+    """Inscripciones del estudiante contadas en GSI3 (todas las páginas)"""
+    from boto3.dynamodb.conditions import Key
+    
+    count = 0
+    query_kwargs = {
+        'IndexName': STUDENT_INDEX,
+        'KeyConditionExpression': Key('GSI3PK').eq(f'USER#{student_id}') & Key('GSI3SK').begins_with(REG_PREFIX),
+        'Select': 'COUNT',
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        count += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return count
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def handler(event, context):
+    """
+    Recorre los estudiantes de GSI1 y fija `inscritos_count` donde no coincide
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    updated = 0
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('USER#STUDENTS'),
+        'ProjectionExpression': 'PK, SK, #count',
+        'ExpressionAttributeNames': {'#count': STUDENT_COUNTER},
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            count = registration_count(item['PK'].replace('USER#', ''))
+            if item.get(STUDENT_COUNTER) == count:
+                continue
+            try:
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET #count = :count',
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeNames={'#count': STUDENT_COUNTER},
+                    ExpressionAttributeValues={':count': count}
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                # El estudiante se eliminó mientras tanto
+                continue
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Estudiantes actualizados: {updated}')
+    return {'statusCode': 200, 'body': json.dumps({'actualizados': updated})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
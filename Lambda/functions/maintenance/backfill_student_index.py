@@ -0,0 +1,51 @@
+"""
+Agrega las llaves de GSI1 (listado de estudiantes) a los items USER# de
+estudiantes creados antes de que se indexaran
+Invocación manual: aws lambda invoke o `python -m maintenance.backfill_student_index`
+Es idempotente: solo toca estudiantes sin GSI1PK.
+"""
+import json
+from datetime import datetime
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def handler(event, context):
+    """
+    Recorre los estudiantes sin GSI1PK y les agrega GSI1PK/GSI1SK
+    (GSI1SK = creado_en; si falta, se usa la fecha actual)
+    """
+    from boto3.dynamodb.conditions import Attr
+    
+    updated = 0
+    scan_kwargs = {
+        'FilterExpression': Attr('PK').begins_with('USER#') & Attr('SK').eq('METADATA')
+                            & Attr('role').eq('student') & Attr('GSI1PK').not_exists(),
+        'ProjectionExpression': 'PK, SK, creado_en',
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            creado_en = item.get('creado_en') or datetime.utcnow().isoformat()
+            try:
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET GSI1PK = :pk, GSI1SK = :sk, creado_en = if_not_exists(creado_en, :sk)',
+                    ConditionExpression='attribute_exists(SK)',
+                    ExpressionAttributeValues={':pk': 'USER#STUDENTS', ':sk': creado_en}
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                # El estudiante se eliminó mientras tanto
+                continue
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Estudiantes indexados: {updated}')
+    return {'statusCode': 200, 'body': json.dumps({'indexados': updated})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
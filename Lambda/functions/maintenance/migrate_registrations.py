@@ -0,0 +1,92 @@
+"""
+Migra las inscripciones embebidas (lista `inscripciones` del item METADATA)
+a items propios WORKSHOP#<id> / REG#<studentId> y recalcula `inscritos`
+Invocación manual: aws lambda invoke o `python -m maintenance.migrate_registrations`
+Es idempotente: si se interrumpe se puede volver a ejecutar.
+
+Sus escrituras llevan `migrado_en` y el stream no las cuenta como altas (ni en
+estadísticas, ni en métricas, ni en los contadores por estudiante). Después de
+migrar, correr backfill_student_counts y reconcile_stats para fijar esos
+contadores con los valores absolutos.
+"""
+import json
+from datetime import datetime
+from shared.registrations import REGISTRATION_ATTRIBUTES, MIGRATION_MARKER, registration_item, count_registrations
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def migrate_workshop(item):
+    """
+    Copia las inscripciones de un taller a items REG# y elimina la lista.
+    Devuelve False si la lista cambió mientras tanto (se reintenta en otra ejecución).
+    """
+    workshop_id = item['PK'].replace('WORKSHOP#', '')
+    inscripciones = item.get('inscripciones') or []
+    migrado_en = datetime.utcnow().isoformat()
+    
+    with table.batch_writer(overwrite_by_pkeys=['PK', 'SK']) as batch:
+        for inscripcion in inscripciones:
+            if not inscripcion.get('estudiante_id'):
+                continue
+            batch.put_item(Item={
+                **registration_item(workshop_id, {attr: inscripcion.get(attr) for attr in REGISTRATION_ATTRIBUTES}),
+                MIGRATION_MARKER: migrado_en,
+            })
+    
+    # El contador se calcula sobre los items REG# (incluye los creados por el código
+    # nuevo) y se escribe solo si ninguna inscripción cambió `inscritos` mientras tanto
+    count = count_registrations(table, workshop_id)
+    condition = 'size(inscripciones) = :size AND '
+    values = {':count': count, ':size': len(inscripciones), ':migrado_en': migrado_en}
+    if 'inscritos' in item:
+        condition += 'inscritos = :previous'
+        values[':previous'] = item['inscritos']
+    else:
+        condition += 'attribute_not_exists(inscritos)'
+    try:
+        table.update_item(
+            Key={'PK': item['PK'], 'SK': item['SK']},
+            UpdateExpression=f'SET inscritos = :count, {MIGRATION_MARKER} = :migrado_en REMOVE inscripciones',
+            ConditionExpression=condition,
+            ExpressionAttributeValues=values
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        print(f'Taller {workshop_id} modificado durante la migración, se omite')
+        return False
+    return True
+
+
+def handler(event, context):
+    """
+    Recorre todos los talleres (GSI1) y migra los que aún tienen la lista embebida
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    migrated = 0
+    skipped = 0
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('WORKSHOP#ALL'),
+        'ProjectionExpression': 'PK, SK, inscripciones, inscritos',
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            if 'inscripciones' not in item:
+                continue
+            if migrate_workshop(item):
+                migrated += 1
+            else:
+                skipped += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Talleres migrados: {migrated}, omitidos: {skipped}')
+    return {'statusCode': 200, 'body': json.dumps({'migrados': migrated, 'omitidos': skipped})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
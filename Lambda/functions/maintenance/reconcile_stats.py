@@ -0,0 +1,97 @@
+"""
+Recalcula desde cero los items de estadísticas que mantiene el stream
+(STATS#GLOBAL y CATEGORY#<id>/COUNT)
+Invocación manual: aws lambda invoke o `python -m maintenance.reconcile_stats`
+Correrlo una vez al desplegar y cada vez que los totales se desvíen (p. ej.
+tras reintentos del stream). Un delta que el stream aplique mientras corre
+puede perderse: conviene hacerlo con poco tráfico.
+"""
+import json
+from shared.stats import (
+    STATS_KEY, STATS_COUNTERS, CATEGORY_COUNTERS,
+    workshop_totals, category_totals, merge_deltas, category_key,
+)
+from workshops.categories import CATEGORIES
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def workshop_stats():
+    """
+    Talleres, inscritos y cupos sumando todos los talleres de GSI1, y los
+    contadores de cada categoría. Devuelve (totales, {categoría: totales})
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    totals = {}
+    categories = {cat['id']: {} for cat in CATEGORIES}
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('WORKSHOP#ALL'),
+        'ProjectionExpression': 'cupo, inscritos, categoria',
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            merge_deltas(totals, workshop_totals(item))
+            for category, delta in category_totals(item).items():
+                merge_deltas(categories.setdefault(category, {}), delta)
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return totals, categories
+
+
+def student_count():
+    """
+    Estudiantes con un scan paginado: los registrados antes de GSI1 no tienen
+    GSI1PK, y el stream los cuenta por su rol igual que aquí
+    """
+    from boto3.dynamodb.conditions import Attr
+    
+    count = 0
+    scan_kwargs = {
+        'FilterExpression': Attr('PK').begins_with('USER#') & Attr('SK').eq('METADATA') & Attr('role').eq('student'),
+        'Select': 'COUNT',
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        count += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return count
+
+
+def overwrite(key, totals, counters):
+    """Sobrescribe los contadores del item con valores absolutos"""
+    totals = {counter: totals.get(counter, 0) for counter in counters}
+    table.update_item(
+        Key=key,
+        UpdateExpression='SET ' + ', '.join(f'#{c} = :{c}' for c in totals),
+        ExpressionAttributeNames={f'#{c}': c for c in totals},
+        ExpressionAttributeValues={f':{c}': v for c, v in totals.items()}
+    )
+    return totals
+
+
+def handler(event, context):
+    """
+    Sobrescribe STATS#GLOBAL y los contadores de categoría con los totales
+    recalculados (las categorías predefinidas sin talleres quedan en cero)
+    """
+    totals, categories = workshop_stats()
+    totals['estudiantes'] = student_count()
+    totals = overwrite(STATS_KEY, totals, STATS_COUNTERS)
+    
+    for category, counts in categories.items():
+        categories[category] = overwrite(category_key(category), counts, CATEGORY_COUNTERS)
+    
+    print(f'Estadísticas recalculadas: {totals}')
+    print(f'Categorías recalculadas: {categories}')
+    return {'statusCode': 200, 'body': json.dumps({**totals, 'categorias': categories})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
@@ -0,0 +1,40 @@
+"""
+Reconstruye el índice de búsqueda de talleres (items TERM#<token>)
+Invocación manual: aws lambda invoke o `python -m maintenance.reindex_search`
+"""
+import json
+from shared.search import sync_workshop_terms
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+
+def handler(event, context):
+    """
+    Indexa todos los talleres del catálogo.
+    Es idempotente: reescribe los términos de cada taller.
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    indexed = 0
+    writes = 0
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('WORKSHOP#ALL'),
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            workshop_id = item['PK'].replace('WORKSHOP#', '')
+            writes += sync_workshop_terms(table, workshop_id, None, item)
+            indexed += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    print(f'Talleres indexados: {indexed}, escrituras: {writes}')
+    return {'statusCode': 200, 'body': json.dumps({'talleres': indexed, 'escrituras': writes})}
+
+
+if __name__ == '__main__':
+    print(handler({}, None))
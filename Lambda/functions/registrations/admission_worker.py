@@ -0,0 +1,152 @@
+"""
+Lambda function para procesar la cola de admisión de talleres de alta demanda
+Triggered by: SQS FIFO (un grupo de mensajes por taller, concurrencia reservada 1)
+
+Convierte cada ticket en inscripción con la misma transacción que
+POST /workshops/{id}/register, uno tras otro: el item METADATA del taller
+recibe una escritura a la vez en lugar de cientos simultáneas.
+"""
+import json
+from datetime import datetime
+from shared.catalog import batch_get_workshops
+from shared.registrations import register_transaction, cancellation_reasons, condition_failed, registration_error, WORKSHOP_FULL
+from shared.waitlist import join_waitlist
+from shared.admission import (
+    ticket_key, parse_ticket,
+    TICKET_PENDING, TICKET_REGISTERED, TICKET_WAITLISTED, TICKET_REJECTED,
+)
+from shared.aws import lazy_client, lazy_table
+
+events = lazy_client('events')
+table = lazy_table()
+
+# Límite de entradas por PutEvents
+PUT_EVENTS_MAX_ENTRIES = 10
+
+
+def admit(ticket):
+    """
+    Intenta inscribir al estudiante del ticket.
+    La inscripción cierra el ticket en la misma transacción, así una entrega
+    repetida no puede tomarla por un duplicado. Devuelve los atributos con
+    los que se cerró (o se debe cerrar) el ticket, o None si ya estaba cerrado.
+    """
+    inscripcion = {
+        'estudiante_id': ticket['estudiante_id'],
+        'nombre': ticket.get('nombre', ''),
+        'email': ticket.get('email', ''),
+        'registrado_en': datetime.utcnow().isoformat()
+    }
+    registered = {'estado': TICKET_REGISTERED, 'mensaje': 'Inscripción confirmada', 'registrado_en': inscripcion['registrado_en']}
+    client = table.meta.client
+    try:
+        client.transact_write_items(
+            TransactItems=register_transaction(table, ticket['workshop_id'], inscripcion, admission=True) + [
+                {'Update': {'TableName': table.name, **close_ticket_update(ticket['ticket_id'], registered)}},
+            ]
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        reasons = cancellation_reasons(e)
+        if len(reasons) != 3:
+            raise
+        if condition_failed(reasons[2]):
+            # Otra entrega del mensaje ya cerró el ticket
+            return None
+        error = registration_error(*reasons[:2])
+        if error is None:
+            raise
+        if error == WORKSHOP_FULL:
+            return {
+                'estado': TICKET_WAITLISTED,
+                'mensaje': 'Cupo lleno: quedaste en la lista de espera',
+                'posicion': join_waitlist(table, ticket['workshop_id'], inscripcion),
+            }
+        return {'estado': TICKET_REJECTED, 'mensaje': error[1]}
+    return registered
+
+
+def close_ticket_update(ticket_id, result):
+    """Argumentos del Update que guarda el resultado en el ticket (solo si seguía pendiente)"""
+    return {
+        'Key': ticket_key(ticket_id),
+        'UpdateExpression': 'SET ' + ', '.join(f'#{k} = :{k}' for k in result) + ', procesado_en = :procesado_en',
+        'ConditionExpression': 'estado = :pendiente',
+        'ExpressionAttributeNames': {f'#{k}': k for k in result},
+        'ExpressionAttributeValues': {
+            **{f':{k}': v for k, v in result.items()},
+            ':procesado_en': datetime.utcnow().isoformat(),
+            ':pendiente': TICKET_PENDING,
+        },
+    }
+
+
+def close_ticket(ticket_id, result):
+    """Guarda el resultado de un ticket no admitido (en espera o rechazado)"""
+    try:
+        table.update_item(**close_ticket_update(ticket_id, result))
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        print(f'Ticket {ticket_id} ya procesado')
+
+
+def ticket_pending(ticket_id):
+    """SQS entrega al menos una vez: un ticket ya cerrado no se vuelve a procesar"""
+    response = table.get_item(Key=ticket_key(ticket_id), ConsistentRead=True)
+    item = response.get('Item')
+    return item is not None and item.get('estado') == TICKET_PENDING
+
+
+def publish_registered(admitted):
+    """Un evento STUDENT_REGISTERED por ticket admitido, en llamadas de hasta 10 entradas"""
+    workshops = batch_get_workshops(table, list({t['workshop_id'] for t, _ in admitted}), ('nombre',))
+    entries = [{
+        'Source': 'skillsforge.registrations',
+        'DetailType': 'STUDENT_REGISTERED',
+        'Detail': json.dumps({
+            'workshopId': ticket['workshop_id'],
+            'workshopName': workshops.get(ticket['workshop_id'], {}).get('nombre'),
+            'studentId': ticket['estudiante_id'],
+            'studentName': ticket.get('nombre', ''),
+            'studentEmail': ticket.get('email', ''),
+            'registeredAt': result['registrado_en']
+        })
+    } for ticket, result in admitted]
+    for start in range(0, len(entries), PUT_EVENTS_MAX_ENTRIES):
+        try:
+            events.put_events(Entries=entries[start:start + PUT_EVENTS_MAX_ENTRIES])
+        except Exception as e:
+            print(f'Error emitiendo eventos: {e}')
+
+
+def handler(event, context):
+    """
+    Procesa un lote de tickets en orden.
+    Si uno falla, él y los siguientes se devuelven a la cola (batchItemFailures)
+    para no adelantar a nadie dentro del grupo FIFO.
+    """
+    admitted = []
+    failures = []
+    for record in event.get('Records', []):
+        if failures:
+            failures.append({'itemIdentifier': record['messageId']})
+            continue
+        ticket = parse_ticket(record)
+        try:
+            if not ticket_pending(ticket['ticket_id']):
+                continue
+            result = admit(ticket)
+            if result is None:
+                continue
+            if result['estado'] != TICKET_REGISTERED:
+                close_ticket(ticket['ticket_id'], result)
+        except Exception as e:
+            print(f"Error procesando ticket {ticket['ticket_id']}: {e}")
+            failures.append({'itemIdentifier': record['messageId']})
+            continue
+        if result['estado'] == TICKET_REGISTERED:
+            admitted.append((ticket, result))
+    
+    if admitted:
+        publish_registered(admitted)
+    
+    print(f'Tickets admitidos: {len(admitted)}, reintentos: {len(failures)}')
+    return {'batchItemFailures': failures}
@@ -0,0 +1,206 @@
+"""
+Lambda function para inscribirse a varios talleres en una sola petición
+POST /registrations/batch (requiere auth estudiante)
+Body: { "talleres": ["<id>", ...] }
+"""
+import json
+from datetime import datetime
+from shared.catalog import batch_get_workshops
+from shared.projection import serialize_workshop
+from shared.registrations import register_transaction, cancellation_reasons, registration_error, WORKSHOP_FULL, ADMISSION_QUEUED
+from shared.waitlist import join_waitlist
+from shared.admission import issue_ticket, ticket_queue, TICKET_PENDING
+from shared.http import parse_json_body
+from shared.serialization import dumps
+from shared.aws import lazy_client, lazy_table
+
+events = lazy_client('events')
+table = lazy_table()
+# Cola de admisión para talleres con cola_inscripcion
+admission_queue = ticket_queue()
+
+# Máximo de talleres por petición
+MAX_BATCH_WORKSHOPS = 50
+# Límite de TransactWriteItems (cada inscripción usa 2 items: contador + REG#)
+TRANSACT_MAX_ITEMS = 100
+WORKSHOPS_PER_TRANSACTION = TRANSACT_MAX_ITEMS // 2
+# Límite de entradas por PutEvents
+PUT_EVENTS_MAX_ENTRIES = 10
+# Campos del taller que se devuelven por cada inscripción exitosa
+RESULT_FIELDS = ('nombre', 'cupos_disponibles')
+
+
+def register_chunk(workshop_ids, inscripcion, failures):
+    """
+    Inscribe los talleres del bloque en una transacción. Si se cancela, los talleres
+    cuya condición falló se anotan en `failures` y el resto se reintenta.
+    Devuelve los IDs inscritos.
+    """
+    client = table.meta.client
+    pending = list(workshop_ids)
+    while pending:
+        transact_items = []
+        for workshop_id in pending:
+            transact_items.extend(register_transaction(table, workshop_id, inscripcion))
+        try:
+            client.transact_write_items(TransactItems=transact_items)
+            return pending
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = cancellation_reasons(e)
+            failed = []
+            for index, workshop_id in enumerate(pending):
+                pair = reasons[2 * index:2 * index + 2]
+                error = registration_error(*pair) if len(pair) == 2 else None
+                if error is not None:
+                    failures[workshop_id] = error
+                    failed.append(workshop_id)
+            # Sin condiciones fallidas (conflicto, throttling...) no hay qué descartar
+            if not failed:
+                raise
+            pending = [workshop_id for workshop_id in pending if workshop_id not in failed]
+    return []
+
+
+def publish_registered(registered, workshops, inscripcion):
+    """Un evento STUDENT_REGISTERED por taller, en llamadas de hasta 10 entradas"""
+    entries = [{
+        'Source': 'skillsforge.registrations',
+        'DetailType': 'STUDENT_REGISTERED',
+        'Detail': json.dumps({
+            'workshopId': workshop_id,
+            'workshopName': workshops.get(workshop_id, {}).get('nombre'),
+            'studentId': inscripcion['estudiante_id'],
+            'studentName': inscripcion['nombre'],
+            'studentEmail': inscripcion['email'],
+            'registeredAt': inscripcion['registrado_en']
+        })
+    } for workshop_id in registered]
+    for start in range(0, len(entries), PUT_EVENTS_MAX_ENTRIES):
+        try:
+            response = events.put_events(Entries=entries[start:start + PUT_EVENTS_MAX_ENTRIES])
+            if response.get('FailedEntryCount'):
+                print(f"Eventos no publicados: {response['FailedEntryCount']}")
+        except Exception as e:
+            print(f'Error emitiendo eventos: {e}')
+
+
+def handler(event, context):
+    """
+    Inscribe a un estudiante en varios talleres y reporta el resultado de cada uno
+    (en los talleres llenos lo deja en la lista de espera)
+    """
+    try:
+        # Verificar autorización
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+        role = claims.get('custom:role', '')
+        
+        if role != 'student':
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Permisos de estudiante requeridos'})
+            }
+        
+        # Parsear body
+        body = parse_json_body(event)
+        workshop_ids = body.get('talleres')
+        if not isinstance(workshop_ids, list) or not workshop_ids or not all(
+            isinstance(workshop_id, str) and workshop_id for workshop_id in workshop_ids
+        ):
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Se requiere una lista de IDs de talleres'})
+            }
+        
+        # Un mismo item no puede aparecer dos veces en una transacción
+        workshop_ids = list(dict.fromkeys(workshop_ids))
+        if len(workshop_ids) > MAX_BATCH_WORKSHOPS:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': f'Máximo {MAX_BATCH_WORKSHOPS} talleres por petición'})
+            }
+        
+        # Crear inscripción (la misma para todos los talleres)
+        inscripcion = {
+            'estudiante_id': claims.get('sub'),
+            'nombre': claims.get('name', ''),
+            'email': claims.get('email', ''),
+            'registrado_en': datetime.utcnow().isoformat()
+        }
+        
+        # Cupo, duplicados y admisión por turnos se validan en la transacción de cada bloque
+        registered = []
+        failures = {}
+        for start in range(0, len(workshop_ids), WORKSHOPS_PER_TRANSACTION):
+            chunk = workshop_ids[start:start + WORKSHOPS_PER_TRANSACTION]
+            registered.extend(register_chunk(chunk, inscripcion, failures))
+        
+        # Talleres de alta demanda: igual que POST /workshops/{id}/register, se
+        # encola un ticket por taller en vez de escribir sobre su item
+        tickets = {}
+        for workshop_id in [workshop_id for workshop_id, error in failures.items() if error == ADMISSION_QUEUED]:
+            tickets[workshop_id] = issue_ticket(table, admission_queue, workshop_id, inscripcion)['ticket_id']
+            del failures[workshop_id]
+        
+        # Talleres llenos: igual que la inscripción individual, el estudiante
+        # queda en la lista de espera con su posición
+        waitlisted = {}
+        for workshop_id in [workshop_id for workshop_id, error in failures.items() if error == WORKSHOP_FULL]:
+            waitlisted[workshop_id] = join_waitlist(table, workshop_id, inscripcion)
+            del failures[workshop_id]
+        
+        workshops = {}
+        if registered:
+            # Talleres inscritos para la respuesta y los eventos (un solo BatchGetItem)
+            workshops = batch_get_workshops(table, registered, RESULT_FIELDS)
+            publish_registered(registered, workshops, inscripcion)
+        
+        # Resultado por taller, en el orden pedido
+        resultados = []
+        for workshop_id in workshop_ids:
+            if workshop_id in tickets:
+                resultados.append({
+                    '_id': workshop_id,
+                    'inscrito': False,
+                    'statusCode': 202,
+                    'mensaje': 'Inscripción en cola',
+                    'ticket': tickets[workshop_id],
+                    'estado': TICKET_PENDING,
+                })
+            elif workshop_id in waitlisted:
+                resultados.append({
+                    '_id': workshop_id,
+                    'inscrito': False,
+                    'statusCode': 202,
+                    'mensaje': 'Cupo lleno: quedaste en la lista de espera',
+                    'posicion': waitlisted[workshop_id],
+                })
+            elif workshop_id in failures:
+                status_code, mensaje = failures[workshop_id]
+                resultados.append({'_id': workshop_id, 'inscrito': False, 'statusCode': status_code, 'mensaje': mensaje})
+            else:
+                item = workshops.get(workshop_id)
+                taller = serialize_workshop(item, RESULT_FIELDS) if item else {'_id': workshop_id}
+                resultados.append({**taller, 'inscrito': True, 'statusCode': 201})
+        
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': dumps({
+                'resultados': resultados,
+                'inscritos': len(registered),
+                'en_cola': len(tickets),
+                'en_espera': len(waitlisted),
+                'fallidos': len(failures),
+            })
+        }
+        
+    except Exception as e:
+        print(f'Error: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'mensaje': 'Error interno del servidor', 'error': str(e)})
+        }
@@ -3,23 +3,24 @@ Lambda function para listar mis inscripciones
 GET /registrations/me (requiere auth estudiante)
 """
 import json
-import os
-from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
-import boto3
+from shared.projection import resolve_fields, metadata_fields, serialize_workshop
+from shared.registrations import student_query, public_registration
+from shared.pagination import encode_cursor, decode_cursor, query_scope
+from shared.catalog import batch_get_workshops
+from shared.compression import compress_response
+from shared.serialization import dumps
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+table = lazy_table()
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Tamaño de página por defecto y máximo
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
 
 def handler(event, context):
     """
-    Lista todos los talleres en los que está inscrito el estudiante
+    Lista los talleres en los que está inscrito el estudiante, paginado por cursor
+    Query params: view (summary|full), fields, limit, cursor
     """
     try:
         # Verificar autorización
@@ -36,56 +37,61 @@ def handler(event, context):
         # Extraer información del estudiante
         student_id = claims.get('sub')
         
-        # Escanear talleres donde el estudiante está inscrito
-        response = table.scan(
-            FilterExpression=Attr('inscripciones').exists() & Attr('SK').eq('METADATA')
-        )
+        # Campos a devolver (view=summary|full o fields=a,b,c), sin la lista de inscritos
+        params = event.get('queryStringParameters') or {}
+        try:
+            fields = metadata_fields(resolve_fields(params))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': str(e)})
+            }
+        
+        # El cursor solo vale para las inscripciones del mismo estudiante
+        scope = query_scope('mine', student_id)
+        try:
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            start_key = decode_cursor(params.get('cursor', '').strip(), scope)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Parámetros de paginación inválidos'})
+            }
         
-        items = response.get('Items', [])
+        # Una página de inscripciones del estudiante por GSI3: el costo depende
+        # del tamaño de página, no del total de inscripciones ni de la tabla
+        query_kwargs = {**student_query(student_id), 'Limit': limit}
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = start_key
+        response = table.query(**query_kwargs)
+        registrations = response.get('Items', [])
         
-        # Filtrar talleres donde el estudiante está inscrito
-        my_workshops = []
-        for item in items:
-            inscripciones = item.get('inscripciones', [])
-            for insc in inscripciones:
-                if insc.get('estudiante_id') == student_id:
-                    # Este taller tiene al estudiante inscrito
-                    workshop_id = item['PK'].replace('WORKSHOP#', '')
-                    cupo = int(item.get('cupo', 0))
-                    cupos_disponibles = max(cupo - len(inscripciones), 0)
-                    
-                    taller = {
-                        '_id': workshop_id,
-                        'nombre': item.get('nombre'),
-                        'descripcion': item.get('descripcion'),
-                        'fecha': item.get('fecha'),
-                        'hora': item.get('hora'),
-                        'lugar': item.get('lugar'),
-                        'categoria': item.get('categoria'),
-                        'tipo': item.get('tipo'),
-                        'instructor': item.get('instructor', ''),
-                        'rating': float(item.get('rating', 0)),
-                        'cupo': cupo,
-                        'cupos_disponibles': cupos_disponibles,
-                        'creado_en': item.get('creado_en'),
-                        'actualizado_en': item.get('actualizado_en'),
-                        'inscripciones': inscripciones,
-                        'mi_inscripcion': insc
-                    }
-                    my_workshops.append(taller)
-                    break
+        # Talleres de esas inscripciones
+        workshop_ids = [registration['PK'].replace('WORKSHOP#', '') for registration in registrations]
+        workshops = batch_get_workshops(table, workshop_ids, fields)
         
-        # Ordenar por fecha de inscripción (más reciente primero)
-        my_workshops.sort(key=lambda x: x.get('mi_inscripcion', {}).get('registrado_en', ''), reverse=True)
+        my_workshops = []
+        for registration in registrations:
+            item = workshops.get(registration['PK'].replace('WORKSHOP#', ''))
+            if item is None:
+                continue
+            taller = serialize_workshop(item, fields)
+            taller['mi_inscripcion'] = public_registration(registration)
+            my_workshops.append(taller)
         
-        return {
+        return compress_response(event, {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
             },
-            'body': json.dumps(my_workshops, cls=DecimalEncoder)
-        }
+            'body': dumps({
+                'talleres': my_workshops,
+                'nextCursor': encode_cursor(response.get('LastEvaluatedKey'), scope)
+            })
+        })
         
     except Exception as e:
         print(f'Error: {str(e)}')
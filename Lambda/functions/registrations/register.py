@@ -3,14 +3,19 @@ Lambda function para inscribirse a un taller
 POST /workshops/{id}/register (requiere auth estudiante)
 """
 import json
-import os
 from datetime import datetime
-import boto3
+from shared.registrations import register_transaction, cancellation_reasons, registration_error, WORKSHOP_FULL, ADMISSION_QUEUED
+from shared.waitlist import join_waitlist
+from shared.admission import issue_ticket, ticket_queue, TICKET_PENDING
+from shared.idempotency import idempotent
+from shared.aws import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-events = boto3.client('events')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+events = lazy_client('events')
+table = lazy_table()
+# Cola de admisión para talleres con cola_inscripcion
+admission_queue = ticket_queue()
 
+@idempotent('registrations.register')
 def handler(event, context):
     """
     Inscribe a un estudiante en un taller
@@ -41,39 +46,6 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'ID de taller requerido'})
             }
         
-        # Obtener taller
-        response = table.get_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'}
-        )
-        
-        if 'Item' not in response:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'mensaje': 'Taller no encontrado'})
-            }
-        
-        item = response['Item']
-        inscripciones = item.get('inscripciones', [])
-        cupo = int(item.get('cupo', 0))
-        
-        # Verificar cupo
-        if cupo >= 0 and len(inscripciones) >= cupo:
-            return {
-                'statusCode': 409,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'mensaje': 'Cupo lleno'})
-            }
-        
-        # Verificar si ya está inscrito
-        for insc in inscripciones:
-            if insc.get('estudiante_id') == student_id:
-                return {
-                    'statusCode': 409,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'mensaje': 'Ya estás inscrito en este taller'})
-                }
-        
         # Crear inscripción
         inscripcion = {
             'estudiante_id': student_id,
@@ -82,17 +54,47 @@ def handler(event, context):
             'registrado_en': datetime.utcnow().isoformat()
         }
         
-        # Actualizar en DynamoDB
-        table.update_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
-            UpdateExpression='SET inscripciones = list_append(if_not_exists(inscripciones, :empty_list), :i)',
-            ExpressionAttributeValues={
-                ':i': [inscripcion],
-                ':empty_list': []
+        # Cupo, duplicados y admisión por turnos se validan en la misma escritura
+        # (sin carreras entre estudiantes ni lecturas previas del taller)
+        client = table.meta.client
+        try:
+            client.transact_write_items(
+                TransactItems=register_transaction(table, workshop_id, inscripcion)
+            )
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = cancellation_reasons(e)
+            error = registration_error(*reasons) if len(reasons) == 2 else None
+            if error is None:
+                raise
+            if error == ADMISSION_QUEUED:
+                # Taller de alta demanda: la inscripción se encola y se responde con un ticket
+                ticket = issue_ticket(table, admission_queue, workshop_id, inscripcion)
+                return {
+                    'statusCode': 202,
+                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    'body': json.dumps({
+                        'mensaje': 'Inscripción en cola',
+                        'ticket': ticket['ticket_id'],
+                        'estado': TICKET_PENDING
+                    })
+                }
+            if error == WORKSHOP_FULL:
+                return {
+                    'statusCode': 202,
+                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    'body': json.dumps({
+                        'mensaje': 'Cupo lleno: quedaste en la lista de espera',
+                        'posicion': join_waitlist(table, workshop_id, inscripcion)
+                    })
+                }
+            status_code, mensaje = error
+            return {
+                'statusCode': status_code,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': mensaje})
             }
-        )
         
-        # Emitir evento a EventBridge
+        # Emitir evento a EventBridge (el procesador resuelve el nombre del taller)
         try:
             events.put_events(
                 Entries=[{
@@ -100,7 +102,6 @@ def handler(event, context):
                     'DetailType': 'STUDENT_REGISTERED',
                     'Detail': json.dumps({
                         'workshopId': workshop_id,
-                        'workshopName': item.get('nombre'),
                         'studentId': student_id,
                         'studentName': student_name,
                         'studentEmail': student_email,
@@ -111,25 +112,16 @@ def handler(event, context):
         except Exception as e:
             print(f'Error emitiendo evento: {e}')
         
-        # Obtener taller actualizado
-        response = table.get_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'}
-        )
-        
-        updated_item = response['Item']
-        inscripciones_updated = updated_item.get('inscripciones', [])
-        cupo_updated = int(updated_item.get('cupo', 0))
-        
-        taller = {
-            '_id': workshop_id,
-            **{k: v for k, v in updated_item.items() if k not in ['PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK']},
-            'cupos_disponibles': max(cupo_updated - len(inscripciones_updated), 0),
-        }
-        
+        # La transacción no devuelve el taller: la respuesta se arma con lo que ya
+        # se tiene, sin releer el item (el cliente descuenta el cupo localmente)
         return {
             'statusCode': 201,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(taller, default=str)
+            'body': json.dumps({
+                'mensaje': 'Inscripción exitosa',
+                '_id': workshop_id,
+                'inscripcion': inscripcion
+            })
         }
         
     except Exception as e:
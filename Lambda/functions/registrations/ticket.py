@@ -0,0 +1,65 @@
+"""
+Lambda function para consultar el estado de un ticket de inscripción
+GET /registrations/tickets/{id} (requiere auth estudiante)
+"""
+import json
+from shared.admission import ticket_key, public_ticket
+from shared.serialization import dumps
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+def handler(event, context):
+    """
+    Devuelve el estado de un ticket del estudiante (pendiente, inscrito, en_espera, rechazado)
+    """
+    try:
+        # Verificar autorización
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+        role = claims.get('custom:role', '')
+        
+        if role != 'student':
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Permisos de estudiante requeridos'})
+            }
+        
+        # Extraer ID del ticket
+        ticket_id = (event.get('pathParameters') or {}).get('id')
+        if not ticket_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'ID de ticket requerido'})
+            }
+        
+        # Lectura consistente: el cliente consulta justo después de que el consumidor escribe
+        response = table.get_item(Key=ticket_key(ticket_id), ConsistentRead=True)
+        item = response.get('Item')
+        
+        # Un ticket ajeno se trata igual que uno inexistente
+        if not item or item.get('estudiante_id') != claims.get('sub'):
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Ticket no encontrado'})
+            }
+        
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Cache-Control': 'no-store',
+            },
+            'body': dumps(public_ticket(item))
+        }
+        
+    except Exception as e:
+        print(f'Error: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'mensaje': 'Error interno del servidor', 'error': str(e)})
+        }
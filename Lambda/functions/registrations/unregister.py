@@ -3,11 +3,32 @@ Lambda function para desinscribirse de un taller
 DELETE /workshops/{id}/register (requiere auth estudiante)
 """
 import json
-import os
-import boto3
+from datetime import datetime
+from shared.projection import registration_count
+from shared.registrations import unregister_transaction, cancellation_reasons, condition_failed
+from shared.waitlist import leave_waitlist_transaction
+from shared.serialization import dumps
+from shared.aws import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+events = lazy_client('events')
+table = lazy_table()
+
+def leave_waitlist(workshop_id, student_id):
+    """
+    Saca al estudiante de la lista de espera del taller.
+    Devuelve False si no estaba esperando.
+    """
+    client = table.meta.client
+    try:
+        client.transact_write_items(
+            TransactItems=leave_waitlist_transaction(table, workshop_id, student_id)
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        reasons = cancellation_reasons(e)
+        if reasons and condition_failed(reasons[0]):
+            return False
+        raise
+    return True
 
 def handler(event, context):
     """
@@ -37,60 +58,73 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'ID de taller requerido'})
             }
         
-        # Obtener taller
-        response = table.get_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'}
-        )
-        
-        if 'Item' not in response:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'mensaje': 'Taller no encontrado'})
-            }
-        
-        item = response['Item']
-        inscripciones = item.get('inscripciones', [])
-        
-        # Buscar inscripción del estudiante
-        index_to_remove = None
-        for i, insc in enumerate(inscripciones):
-            if insc.get('estudiante_id') == student_id:
-                index_to_remove = i
-                break
-        
-        if index_to_remove is None:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({'mensaje': 'No estás inscrito en este taller'})
-            }
+        # Borrado del item REG# y ajuste del contador en una sola escritura atómica
+        client = table.meta.client
+        try:
+            client.transact_write_items(
+                TransactItems=unregister_transaction(table, workshop_id, student_id)
+            )
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = cancellation_reasons(e)
+            if reasons and condition_failed(reasons[0]):
+                # Sin inscripción: puede estar en la lista de espera
+                if leave_waitlist(workshop_id, student_id):
+                    return {
+                        'statusCode': 200,
+                        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                        'body': json.dumps({'mensaje': 'Saliste de la lista de espera'})
+                    }
+                return {
+                    'statusCode': 404,
+                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    'body': json.dumps({'mensaje': 'No estás inscrito en este taller'})
+                }
+            if len(reasons) > 1 and condition_failed(reasons[1]):
+                return {
+                    'statusCode': 404,
+                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    'body': json.dumps({'mensaje': 'Taller no encontrado'})
+                }
+            raise
         
-        # Eliminar inscripción
-        table.update_item(
+        # Taller actualizado para la respuesta (lectura consistente tras la escritura)
+        response = table.get_item(
             Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
-            UpdateExpression=f'REMOVE inscripciones[{index_to_remove}]'
+            ConsistentRead=True
         )
+        updated_item = response['Item']
         
-        # Obtener taller actualizado
-        response = table.get_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'}
-        )
+        # Emitir evento a EventBridge
+        try:
+            events.put_events(
+                Entries=[{
+                    'Source': 'skillsforge.registrations',
+                    'DetailType': 'STUDENT_UNREGISTERED',
+                    'Detail': json.dumps({
+                        'workshopId': workshop_id,
+                        'workshopName': updated_item.get('nombre'),
+                        'studentId': student_id,
+                        'studentName': claims.get('name', ''),
+                        'studentEmail': claims.get('email', ''),
+                        'unregisteredAt': datetime.utcnow().isoformat()
+                    })
+                }]
+            )
+        except Exception as e:
+            print(f'Error emitiendo evento: {e}')
         
-        updated_item = response['Item']
-        inscripciones_updated = updated_item.get('inscripciones', [])
         cupo_updated = int(updated_item.get('cupo', 0))
         
         taller = {
             '_id': workshop_id,
             **{k: v for k, v in updated_item.items() if k not in ['PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK']},
-            'cupos_disponibles': max(cupo_updated - len(inscripciones_updated), 0),
+            'cupos_disponibles': max(cupo_updated - registration_count(updated_item), 0),
         }
         
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(taller, default=str)
+            'body': dumps(taller)
         }
         
     except Exception as e:
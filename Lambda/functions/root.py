@@ -36,7 +36,8 @@ def handler(event, context):
                     'GET /workshops/{id}': 'Obtener taller',
                     'POST /workshops': 'Crear taller (admin)',
                     'PUT /workshops/{id}': 'Actualizar taller (admin)',
-                    'DELETE /workshops/{id}': 'Eliminar taller (admin)'
+                    'DELETE /workshops/{id}': 'Eliminar taller (admin)',
+                    'GET /stats/history': 'Evolución de inscripciones y ocupación (admin)'
                 },
                 'registrations': {
                     'POST /workshops/{id}/register': 'Inscribirse a taller',
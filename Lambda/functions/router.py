@@ -0,0 +1,60 @@
+"""
+Lambda function para enrutar toda la API desde un único contenedor (modo lambdalith)
+ANY /* -> handler del módulo correspondiente
+
+Despacha por resource + httpMethod de API Gateway a los mismos handlers que
+se despliegan por separado. Cada módulo se importa en la primera petición a
+su ruta; el cliente de DynamoDB y la caché del catálogo quedan compartidos
+entre rutas porque viven en shared/.
+"""
+import importlib
+import json
+
+# (resource, método) -> módulo con la función handler
+ROUTES = {
+    ('/api', 'GET'): 'root',
+    ('/auth/login', 'POST'): 'auth.login',
+    ('/auth/estudiantes/registro', 'POST'): 'auth.register',
+    ('/auth/estudiantes/login', 'POST'): 'auth.login',
+    ('/auth/refresh', 'POST'): 'auth.refresh',
+    ('/workshops', 'GET'): 'workshops.list',
+    ('/workshops', 'POST'): 'workshops.create',
+    ('/workshops/{id}', 'GET'): 'workshops.get',
+    ('/workshops/{id}', 'PUT'): 'workshops.update',
+    ('/workshops/{id}', 'DELETE'): 'workshops.delete',
+    ('/workshops/{id}/register', 'POST'): 'registrations.register',
+    ('/workshops/{id}/register', 'DELETE'): 'registrations.unregister',
+    ('/registrations/me', 'GET'): 'registrations.list_mine',
+    ('/registrations/batch', 'POST'): 'registrations.batch',
+    ('/registrations/tickets/{id}', 'GET'): 'registrations.ticket',
+    ('/stats', 'GET'): 'workshops.stats',
+    ('/stats/history', 'GET'): 'workshops.stats_history',
+    ('/categories', 'GET'): 'workshops.categories',
+    ('/ai/assistant', 'POST'): 'ai.assistant',
+    ('/students', 'GET'): 'students.list',
+    ('/students/{id}', 'DELETE'): 'students.delete',
+    ('/students/jobs/{id}', 'GET'): 'students.job',
+}
+
+
+def resolve_handler(resource, method):
+    """Devuelve el handler de la ruta (None si no existe)"""
+    module_name = ROUTES.get((resource, method))
+    if module_name is None:
+        return None
+    # importlib cachea el módulo en sys.modules: solo la primera petición paga el import
+    return importlib.import_module(module_name).handler
+
+
+def handler(event, context):
+    """
+    Punto de entrada único: delega en el handler de la ruta
+    """
+    route_handler = resolve_handler(event.get('resource', ''), event.get('httpMethod', ''))
+    if route_handler is None:
+        return {
+            'statusCode': 404,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'mensaje': 'Ruta no encontrada'})
+        }
+    return route_handler(event, context)
@@ -0,0 +1,112 @@
+"""
+Admisión por turnos para talleres de alta demanda (`cola_inscripcion`)
+
+En vez de escribir todos a la vez sobre WORKSHOP#<id>/METADATA, cada petición
+recibe un ticket (TICKET#<id>) y se encola; un único consumidor
+(registrations/admission_worker.py) lo convierte en inscripción en orden de
+llegada y a ritmo controlado. El cliente consulta el estado del ticket.
+"""
+import json
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from shared.aws import get_client
+from shared.serialization import dumps
+
+TICKET_PREFIX = 'TICKET#'
+# Estados de un ticket
+TICKET_PENDING = 'pendiente'
+TICKET_REGISTERED = 'inscrito'
+TICKET_WAITLISTED = 'en_espera'
+TICKET_REJECTED = 'rechazado'
+# Los tickets se borran solos (TTL de la tabla) pasado este tiempo
+TICKET_TTL_SECONDS = 7 * 24 * 3600
+# Atributos públicos de un ticket
+TICKET_ATTRIBUTES = ('workshop_id', 'estado', 'mensaje', 'posicion', 'creado_en', 'procesado_en')
+
+
+class SqsTicketQueue:
+    """Cola FIFO de SQS: un grupo de mensajes por taller conserva el orden de llegada"""
+
+    def __init__(self, queue_url):
+        self.queue_url = queue_url
+
+    def send(self, ticket):
+        get_client('sqs').send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=dumps(ticket),
+            MessageGroupId=ticket['workshop_id'],
+            MessageDeduplicationId=ticket['ticket_id'],
+        )
+
+
+class LocalTicketQueue:
+    """
+    Sustituto en memoria de la cola para pruebas locales y benchmarks.
+    drain() entrega los mensajes con el mismo formato que el evento SQS de Lambda.
+    """
+
+    def __init__(self):
+        self.messages = deque()
+
+    def send(self, ticket):
+        self.messages.append(dumps(ticket))
+
+    def drain(self, max_messages=10):
+        records = []
+        while self.messages and len(records) < max_messages:
+            records.append({'messageId': str(uuid.uuid4()), 'body': self.messages.popleft()})
+        return {'Records': records}
+
+
+def ticket_queue():
+    """Cola configurada en ADMISSION_QUEUE_URL; sin ella, la cola en memoria (desarrollo local)"""
+    queue_url = os.environ.get('ADMISSION_QUEUE_URL')
+    if queue_url:
+        return SqsTicketQueue(queue_url)
+    print('ADMISSION_QUEUE_URL no configurada: usando cola en memoria')
+    return LocalTicketQueue()
+
+
+def ticket_key(ticket_id):
+    return {'PK': f'{TICKET_PREFIX}{ticket_id}', 'SK': 'METADATA'}
+
+
+def issue_ticket(table, queue, workshop_id, inscripcion):
+    """
+    Crea el ticket (en su propia partición, no en la del taller) y lo encola.
+    Devuelve el ticket tal como se encoló.
+    """
+    ticket = {
+        'ticket_id': str(uuid.uuid4()),
+        'workshop_id': workshop_id,
+        **inscripcion,
+    }
+    table.put_item(Item={
+        **ticket_key(ticket['ticket_id']),
+        **ticket,
+        'estado': TICKET_PENDING,
+        'creado_en': datetime.utcnow().isoformat(),
+        'ttl': int(time.time()) + TICKET_TTL_SECONDS,
+    })
+    try:
+        queue.send(ticket)
+    except Exception:
+        # Sin mensaje en la cola el ticket quedaría pendiente para siempre
+        table.delete_item(Key=ticket_key(ticket['ticket_id']))
+        raise
+    return ticket
+
+
+def parse_ticket(record):
+    """Ticket de un mensaje de la cola (evento SQS)"""
+    return json.loads(record['body'])
+
+
+def public_ticket(item):
+    """Ticket tal como se devuelve al cliente"""
+    ticket = {'ticket': item['PK'].replace(TICKET_PREFIX, '')}
+    ticket.update({attr: item[attr] for attr in TICKET_ATTRIBUTES if attr in item})
+    return ticket
@@ -0,0 +1,53 @@
+"""
+Clientes AWS compartidos y creados en el primer uso
+boto3 se importa recién cuando un handler llama a AWS: las rutas que
+responden 400/403 antes de tocar DynamoDB no pagan ese costo en el cold start.
+Cada cliente se crea una sola vez por contenedor y se comparte entre módulos.
+"""
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_client(service, region_name=None):
+    """Cliente boto3 cacheado por servicio y región"""
+    import boto3
+    return boto3.client(service, region_name=region_name)
+
+
+@lru_cache(maxsize=None)
+def get_resource(service):
+    """Resource boto3 cacheado por servicio"""
+    import boto3
+    return boto3.resource(service)
+
+
+@lru_cache(maxsize=None)
+def get_table(name=None):
+    """Tabla DynamoDB (por defecto la de TABLE_NAME)"""
+    return get_resource('dynamodb').Table(name or os.environ['TABLE_NAME'])
+
+
+class LazyProxy:
+    """Delega en factory() la primera vez que se accede a un atributo"""
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+    
+    def __getattr__(self, name):
+        if self._target is None:
+            self._target = self._factory()
+        return getattr(self._target, name)
+
+
+def lazy_client(service, region_name=None):
+    return LazyProxy(lambda: get_client(service, region_name))
+
+
+def lazy_resource(service):
+    return LazyProxy(lambda: get_resource(service))
+
+
+def lazy_table(name=None):
+    return LazyProxy(lambda: get_table(name))
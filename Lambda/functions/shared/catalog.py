@@ -0,0 +1,133 @@
+"""
+Caché en memoria del catálogo de talleres
+
+Sobrevive entre invocaciones de un contenedor Lambda caliente. Crear, editar o
+borrar un taller incrementa el item CATALOG#VERSION; los lectores solo recargan
+la partición WORKSHOP#ALL cuando esa versión cambia.
+
+Las inscripciones no cambian la versión (invalidarían el catálogo con cada
+inscripción): los contadores de la página devuelta se leen aparte con
+overlay_counters.
+"""
+import time
+from datetime import datetime
+from shared.aws import get_resource
+from shared.projection import projection_kwargs
+
+CATALOG_VERSION_KEY = {'PK': 'CATALOG#VERSION', 'SK': 'METADATA'}
+# Red de seguridad: GSI1 es eventualmente consistente, así que se recarga igual
+# pasado este tiempo aunque la versión no haya cambiado
+CACHE_MAX_AGE_SECONDS = 300
+# Por encima de este tamaño no se cachea y los handlers consultan DynamoDB
+MAX_CACHED_WORKSHOPS = 5000
+# Máximo de llaves por BatchGetItem
+BATCH_GET_SIZE = 100
+# Atributos que cambian con cada inscripción y no invalidan el catálogo
+COUNTER_ATTRIBUTES = ('inscritos',)
+
+_cache = {
+    'version': None,
+    'loaded_at': 0.0,
+    'workshops': None,
+}
+
+
+def bump_catalog_version(table):
+    """
+    Marca el catálogo como modificado. Debe llamarse después de la escritura.
+    Los errores se registran pero no se propagan (el caché expira igual).
+    """
+    try:
+        table.update_item(
+            Key=CATALOG_VERSION_KEY,
+            UpdateExpression='ADD version :one SET actualizado_en = :now',
+            ExpressionAttributeValues={
+                ':one': 1,
+                ':now': datetime.utcnow().isoformat(),
+            }
+        )
+    except Exception as e:
+        print(f'Error actualizando versión del catálogo: {e}')
+
+
+def get_catalog_version(table):
+    """Versión actual del catálogo (0 si nunca se escribió)"""
+    response = table.get_item(Key=CATALOG_VERSION_KEY, ProjectionExpression='version')
+    return int(response.get('Item', {}).get('version', 0))
+
+
+def _read_catalog(table, max_items=MAX_CACHED_WORKSHOPS):
+    """Lee todos los talleres de GSI1 ordenados por fecha, o None si superan max_items"""
+    from boto3.dynamodb.conditions import Key
+    
+    workshops = []
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq('WORKSHOP#ALL'),
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        workshops.extend(response.get('Items', []))
+        if max_items is not None and len(workshops) > max_items:
+            return None
+        if 'LastEvaluatedKey' not in response:
+            return workshops
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def load_catalog(table, version=None):
+    """
+    Devuelve la lista completa de talleres (items de DynamoDB) desde el caché,
+    recargando solo si cambió la versión. Devuelve None si el catálogo es
+    demasiado grande para cachearlo.
+    `version` permite reutilizar una versión ya leída en el mismo request.
+    """
+    if version is None:
+        version = get_catalog_version(table)
+    is_fresh = time.monotonic() - _cache['loaded_at'] < CACHE_MAX_AGE_SECONDS
+    if _cache['version'] == version and is_fresh:
+        return _cache['workshops']
+    
+    workshops = _read_catalog(table)
+    _cache.update(version=version, loaded_at=time.monotonic(), workshops=workshops)
+    return workshops
+
+
+def all_workshops(table, version=None):
+    """Todos los talleres: del caché si es posible, si no leyendo GSI1 completo"""
+    catalog = load_catalog(table, version)
+    if catalog is not None:
+        return catalog
+    return _read_catalog(table, max_items=None)
+
+
+def batch_get_workshops(table, workshop_ids, fields, extra_attributes=()):
+    """Items METADATA de los talleres pedidos (BatchGetItem), como {id: item}"""
+    found = {}
+    for start in range(0, len(workshop_ids), BATCH_GET_SIZE):
+        chunk = workshop_ids[start:start + BATCH_GET_SIZE]
+        request = {table.name: {
+            'Keys': [{'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'} for workshop_id in chunk],
+            **projection_kwargs(fields, extra_attributes=extra_attributes),
+        }}
+        while request:
+            response = get_resource('dynamodb').batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table.name, []):
+                found[item['PK'].replace('WORKSHOP#', '')] = item
+            request = response.get('UnprocessedKeys') or None
+    return found
+
+
+def overlay_counters(table, items):
+    """
+    Copia de los items (del catálogo en memoria) con los contadores de
+    inscritos actuales, leídos con un BatchGetItem de la página
+    """
+    if not items:
+        return items
+    current = batch_get_workshops(table, [item['PK'].replace('WORKSHOP#', '') for item in items], COUNTER_ATTRIBUTES)
+    overlaid = []
+    for item in items:
+        fresh = current.get(item['PK'].replace('WORKSHOP#', ''), {})
+        overlaid.append({**item, **{attr: fresh[attr] for attr in COUNTER_ATTRIBUTES if attr in fresh}})
+    return overlaid
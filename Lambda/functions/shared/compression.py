@@ -0,0 +1,86 @@
+"""
+Compresión negociada de respuestas JSON grandes (Accept-Encoding)
+El cuerpo comprimido se devuelve en base64 con isBase64Encoded=True;
+API Gateway lo decodifica gracias a binaryMediaTypes.
+"""
+import base64
+import gzip
+from shared.http import get_header, with_etag_coding
+
+# brotli es opcional: si no está instalado solo se ofrece gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Por debajo de este tamaño (bytes) comprimir no compensa el costo de CPU
+MIN_COMPRESSION_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def parse_accept_encoding(header):
+    """Devuelve {codificación: q} a partir del header Accept-Encoding"""
+    encodings = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+def choose_encoding(event):
+    """Elige br (si está disponible) o gzip según lo que acepta el cliente"""
+    accepted = parse_accept_encoding(get_header(event, 'Accept-Encoding'))
+    candidates = (['br'] if brotli else []) + ['gzip']
+    best = None
+    best_q = 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding):
+    """Comprime bytes con la codificación indicada"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(event, response):
+    """
+    Comprime el cuerpo de una respuesta 200 si el cliente lo acepta
+    y supera MIN_COMPRESSION_SIZE. Devuelve la misma respuesta modificada.
+    """
+    headers = response.setdefault('headers', {})
+    headers['Vary'] = 'Accept-Encoding'
+    
+    body = response.get('body')
+    if response.get('statusCode') != 200 or not body or response.get('isBase64Encoded'):
+        return response
+    
+    raw = body.encode('utf-8')
+    if len(raw) < MIN_COMPRESSION_SIZE:
+        return response
+    
+    encoding = choose_encoding(event)
+    if not encoding:
+        return response
+    
+    response['body'] = base64.b64encode(compress(raw, encoding)).decode('ascii')
+    response['isBase64Encoded'] = True
+    headers['Content-Encoding'] = encoding
+    if 'ETag' in headers:
+        headers['ETag'] = with_etag_coding(headers['ETag'], encoding)
+    return response
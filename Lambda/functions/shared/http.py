@@ -0,0 +1,75 @@
+"""
+Utilidades HTTP para respuestas condicionales (ETag / If-None-Match)
+"""
+import base64
+import hashlib
+import json
+
+# Catálogo: el cliente puede guardar la respuesta pero debe revalidarla siempre
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+# Datos agregados que toleran unos segundos de retraso
+SHORT_CACHE_CONTROL = 'public, max-age=60'
+
+
+def get_header(event, name):
+    """Lee un header del evento de API Gateway sin distinguir mayúsculas"""
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def parse_json_body(event):
+    """
+    Cuerpo JSON del request. API Gateway lo entrega en base64 cuando el
+    Content-Type coincide con binaryMediaTypes.
+    """
+    body = event.get('body') or '{}'
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+    return json.loads(body)
+
+
+def make_etag(*parts):
+    """ETag fuerte a partir de las partes que determinan el contenido"""
+    raw = '|'.join(str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def etag_matches(event, etag):
+    """Indica si el If-None-Match del cliente coincide con el ETag actual"""
+    header = get_header(event, 'If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match usa comparación débil: se ignora el prefijo W/ y la codificación
+    return any(strip_etag_coding(candidate.strip().removeprefix('W/')) == etag for candidate in header.split(','))
+
+
+def with_etag_coding(etag, encoding):
+    """Variante del ETag para una representación comprimida (gzip, br)"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_etag_coding(etag):
+    """Quita el sufijo de codificación agregado por with_etag_coding"""
+    for encoding in ('gzip', 'br'):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def not_modified_response(etag, cache_control):
+    """Respuesta 304 sin cuerpo"""
+    return {
+        'statusCode': 304,
+        'headers': {
+            'ETag': etag,
+            'Cache-Control': cache_control,
+            'Access-Control-Allow-Origin': '*',
+        },
+        'body': ''
+    }
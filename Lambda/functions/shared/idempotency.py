@@ -0,0 +1,157 @@
+"""
+Claves de idempotencia (header Idempotency-Key) para endpoints que escriben
+
+La primera petición con una clave reserva el item IDEMP#<clave> con un put
+condicional y guarda su respuesta; los reintentos dentro de la ventana reciben
+esa misma respuesta sin repetir el trabajo (Cognito, DynamoDB, EventBridge).
+"""
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from datetime import datetime
+from shared.http import get_header
+from shared.aws import get_table
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+IDEMPOTENCY_PREFIX = 'IDEMP#'
+# Ventana en la que un reintento recibe la respuesta guardada (TTL de la tabla)
+IDEMPOTENCY_TTL_SECONDS = 24 * 3600
+MAX_KEY_LENGTH = 255
+# Estados del item de idempotencia
+IN_PROGRESS = 'en_curso'
+COMPLETED = 'completado'
+
+
+def fingerprint_body(event, secret_fields=()):
+    """Cuerpo que entra en la huella, sin los campos secretos (p. ej. contraseñas)"""
+    body = event.get('body') or ''
+    if not secret_fields:
+        return body
+    try:
+        if event.get('isBase64Encoded'):
+            body = base64.b64decode(body).decode('utf-8')
+        parsed = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(parsed, dict):
+        return body
+    return {k: v for k, v in parsed.items() if k not in secret_fields}
+
+
+def request_fingerprint(scope, event, salt, secret_fields=()):
+    """
+    Huella de la petición: la misma clave con otro usuario, otra ruta u otro
+    cuerpo no es un reintento. Se guarda un HMAC con una sal aleatoria por
+    clave, nunca el cuerpo; los campos secretos no entran en la huella.
+    """
+    claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+    raw = json.dumps([
+        scope,
+        claims.get('sub', ''),
+        event.get('pathParameters') or {},
+        fingerprint_body(event, secret_fields),
+    ], sort_keys=True)
+    return hmac.new(salt.encode('utf-8'), raw.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def error_response(status_code, mensaje, extra_headers=None):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            **(extra_headers or {}),
+        },
+        'body': json.dumps({'mensaje': mensaje})
+    }
+
+
+def replay(table, key, fingerprint):
+    """
+    Respuesta para una clave ya usada: la guardada, o un error si no corresponde.
+    fingerprint(sal) calcula la huella de esta petición con la sal del item.
+    """
+    item = table.get_item(Key=key, ConsistentRead=True).get('Item')
+    if item is None or item.get('estado') == IN_PROGRESS:
+        # La primera petición sigue en curso (o acaba de fallar): el cliente reintenta
+        return error_response(409, 'Hay una petición en curso con esta Idempotency-Key', {'Retry-After': '1'})
+    if not hmac.compare_digest(item.get('huella', ''), fingerprint(item.get('sal', ''))):
+        return error_response(422, 'La Idempotency-Key ya se usó con otra petición')
+    response = json.loads(item['respuesta'])
+    response['headers'] = {**(response.get('headers') or {}), REPLAYED_HEADER: 'true'}
+    return response
+
+
+def idempotent(scope, ttl_seconds=IDEMPOTENCY_TTL_SECONDS, secret_fields=(), stored_response=None):
+    """
+    Decorador para handlers de Lambda. Sin header Idempotency-Key el handler
+    corre igual que siempre. Las respuestas 5xx no se guardan, así el
+    reintento vuelve a ejecutar el trabajo.
+    secret_fields: campos del cuerpo que no entran en la huella.
+    stored_response: función que reduce la respuesta antes de guardarla (p. ej.
+    sin tokens); el reintento recibe esa versión reducida.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            idempotency_key = get_header(event, IDEMPOTENCY_HEADER)
+            if idempotency_key is None:
+                return handler(event, context)
+            idempotency_key = idempotency_key.strip()
+            if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+                return error_response(400, 'Idempotency-Key inválida')
+            
+            table = get_table()
+            key = {'PK': f'{IDEMPOTENCY_PREFIX}{idempotency_key}', 'SK': 'METADATA'}
+            def fingerprint(salt):
+                return request_fingerprint(scope, event, salt, secret_fields)
+            
+            salt = secrets.token_hex(16)
+            now = int(time.time())
+            try:
+                # Reserva la clave; un item vencido que el TTL aún no borró no cuenta
+                table.put_item(
+                    Item={
+                        **key,
+                        'estado': IN_PROGRESS,
+                        'huella': fingerprint(salt),
+                        'sal': salt,
+                        'creado_en': datetime.utcnow().isoformat(),
+                        'ttl': now + ttl_seconds,
+                    },
+                    ConditionExpression='attribute_not_exists(PK) OR #ttl < :now',
+                    ExpressionAttributeNames={'#ttl': 'ttl'},
+                    ExpressionAttributeValues={':now': now}
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                return replay(table, key, fingerprint)
+            
+            try:
+                response = handler(event, context)
+            except Exception:
+                table.delete_item(Key=key)
+                raise
+            
+            try:
+                if response.get('statusCode', 500) >= 500:
+                    table.delete_item(Key=key)
+                else:
+                    table.update_item(
+                        Key=key,
+                        UpdateExpression='SET estado = :completed, respuesta = :respuesta',
+                        ExpressionAttributeValues={
+                            ':completed': COMPLETED,
+                            ':respuesta': json.dumps(stored_response(response) if stored_response else response),
+                        }
+                    )
+            except Exception as e:
+                # La respuesta ya está calculada: no se pierde por no poder guardarla
+                print(f'Error guardando respuesta idempotente: {e}')
+            return response
+        return wrapper
+    return decorator
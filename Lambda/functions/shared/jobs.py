@@ -0,0 +1,137 @@
+"""
+Trabajos en segundo plano (JOB#<id>) con progreso consultable
+
+El endpoint escribe el trabajo (en la misma transacción que lo origina) y lo
+encola después del commit; un worker lo procesa y va actualizando `estado`,
+`total`, `procesados` y `omitidos` en el item.
+"""
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from shared.admission import LocalTicketQueue
+from shared.aws import get_client
+from shared.serialization import dumps
+
+JOB_PREFIX = 'JOB#'
+# Estados de un trabajo
+JOB_PENDING = 'pendiente'
+JOB_RUNNING = 'en_curso'
+JOB_COMPLETED = 'completado'
+JOB_FAILED = 'error'
+# Los trabajos se borran solos (TTL de la tabla) pasado este tiempo
+JOB_TTL_SECONDS = 7 * 24 * 3600
+# Atributos públicos de un trabajo
+JOB_ATTRIBUTES = (
+    'tipo', 'estudiante_id', 'estado', 'total', 'procesados', 'omitidos', 'error',
+    'creado_en', 'iniciado_en', 'terminado_en',
+)
+
+
+class SqsJobQueue:
+    """Cola estándar de SQS: el orden entre trabajos no importa"""
+
+    def __init__(self, queue_url):
+        self.queue_url = queue_url
+
+    def send(self, job):
+        get_client('sqs').send_message(QueueUrl=self.queue_url, MessageBody=dumps(job))
+
+
+def job_queue(env_var):
+    """Cola configurada en la variable `env_var`; sin ella, la cola en memoria (desarrollo local)"""
+    queue_url = os.environ.get(env_var)
+    if queue_url:
+        return SqsJobQueue(queue_url)
+    print(f'{env_var} no configurada: usando cola en memoria')
+    return LocalTicketQueue()
+
+
+def job_key(job_id):
+    return {'PK': f'{JOB_PREFIX}{job_id}', 'SK': 'METADATA'}
+
+
+def new_job(payload):
+    """Mensaje de un trabajo nuevo (payload + job_id)"""
+    return {'job_id': str(uuid.uuid4()), **payload}
+
+
+def job_item(job, tipo):
+    """Item JOB# en estado pendiente, para escribirlo solo o dentro de una transacción"""
+    payload = {k: v for k, v in job.items() if k != 'job_id'}
+    return {
+        **job_key(job['job_id']),
+        **payload,
+        'tipo': tipo,
+        'estado': JOB_PENDING,
+        'creado_en': datetime.utcnow().isoformat(),
+        'ttl': int(time.time()) + JOB_TTL_SECONDS,
+    }
+
+
+def enqueue_job(table, queue, job):
+    """
+    Encola un trabajo cuyo item ya se escribió (p. ej. en una transacción).
+    Si no se puede encolar, el trabajo queda con error en vez de pendiente.
+    """
+    try:
+        queue.send(job)
+    except Exception as e:
+        finish_job(table, job['job_id'], error=f'No se pudo encolar: {e}')
+        raise
+
+
+def parse_job(record):
+    """Trabajo de un mensaje de la cola (evento SQS)"""
+    return json.loads(record['body'])
+
+
+def start_job(table, job_id, total):
+    """Marca el trabajo en curso; un reintento vuelve a contar desde cero"""
+    table.update_item(
+        Key=job_key(job_id),
+        UpdateExpression='SET estado = :running, #total = :total, procesados = :zero, omitidos = :zero, iniciado_en = :now REMOVE #error',
+        ExpressionAttributeNames={'#total': 'total', '#error': 'error'},
+        ExpressionAttributeValues={
+            ':running': JOB_RUNNING,
+            ':total': total,
+            ':zero': 0,
+            ':now': datetime.utcnow().isoformat(),
+        }
+    )
+
+
+def add_job_progress(table, job_id, procesados, omitidos):
+    """Suma progreso al trabajo (ADD atómico, en lotes para no escribir por cada item)"""
+    if not procesados and not omitidos:
+        return
+    table.update_item(
+        Key=job_key(job_id),
+        UpdateExpression='ADD procesados :procesados, omitidos :omitidos',
+        ExpressionAttributeValues={':procesados': procesados, ':omitidos': omitidos}
+    )
+
+
+def finish_job(table, job_id, error=None):
+    """Cierra el trabajo como completado o con error"""
+    update_kwargs = {
+        'Key': job_key(job_id),
+        'UpdateExpression': 'SET estado = :estado, terminado_en = :now',
+        'ExpressionAttributeValues': {
+            ':estado': JOB_FAILED if error else JOB_COMPLETED,
+            ':now': datetime.utcnow().isoformat(),
+        },
+    }
+    if error:
+        update_kwargs['UpdateExpression'] += ', #error = :error'
+        update_kwargs['ExpressionAttributeNames'] = {'#error': 'error'}
+        update_kwargs['ExpressionAttributeValues'][':error'] = error
+    table.update_item(**update_kwargs)
+
+
+def public_job(item):
+    """Trabajo tal como se devuelve al cliente"""
+    job = {'job': item['PK'].replace(JOB_PREFIX, '')}
+    job.update({attr: item[attr] for attr in JOB_ATTRIBUTES if attr in item})
+    return job
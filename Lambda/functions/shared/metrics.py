@@ -0,0 +1,139 @@
+"""
+Series de tiempo de inscripciones para el panel de administración
+
+El stream agrega, por hora (METRIC#<yyyy-mm-dd>#<hh>/HOUR) y por día
+(METRIC#<yyyy-mm-dd>/DAY), las inscripciones y cancelaciones totales y por
+categoría, más la ocupación de cada categoría al cierre del intervalo.
+Los buckets se indexan en GSI1 (METRIC#HOUR / METRIC#DAY, ordenados por
+período): un rango de fechas es una sola Query.
+"""
+from datetime import datetime, timezone
+
+METRIC_PREFIX = 'METRIC#'
+HOURLY = 'hour'
+DAILY = 'day'
+GRANULARITIES = (HOURLY, DAILY)
+# Los buckets por hora se borran solos (TTL de la tabla); los diarios se conservan
+HOURLY_TTL_SECONDS = 90 * 24 * 3600
+# Contadores de flujo de cada bucket (también por categoría: '<contador>#<categoría>')
+FLOW_COUNTERS = ('registros', 'cancelaciones')
+OCCUPANCY = 'ocupacion'
+
+
+def bucket_periods(timestamp):
+    """Períodos (por hora y por día) a los que pertenece un instante epoch"""
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return {
+        HOURLY: moment.strftime('%Y-%m-%d#%H'),
+        DAILY: moment.strftime('%Y-%m-%d'),
+    }
+
+
+def metric_key(granularity, period):
+    return {'PK': f'{METRIC_PREFIX}{period}', 'SK': granularity.upper()}
+
+
+def index_pk(granularity):
+    """GSI1PK de los buckets de una granularidad"""
+    return f'{METRIC_PREFIX}{granularity.upper()}'
+
+
+def registration_flows(old_image, new_image):
+    """
+    Inscripciones y cancelaciones que refleja el cambio de `inscritos` de un
+    taller. Crear o eliminar el taller no cuenta como flujo.
+    """
+    if not old_image or not new_image:
+        return {}
+    delta = int(new_image.get('inscritos', 0)) - int(old_image.get('inscritos', 0))
+    if delta == 0:
+        return {}
+    counter = 'registros' if delta > 0 else 'cancelaciones'
+    category = new_image.get('categoria', 'other')
+    return {counter: abs(delta), f'{counter}#{category}': abs(delta)}
+
+
+def category_occupancy(item):
+    """Ocupación (%) de una categoría según su contador CATEGORY#<id>/COUNT"""
+    cupos = int(item.get('cupos', 0))
+    if cupos <= 0:
+        return None
+    return round((cupos - int(item.get('cupos_disponibles', 0))) / cupos * 100)
+
+
+def bucket_update(granularity, period, counters, snapshot=None, now=None):
+    """
+    Argumentos del Update que suma los contadores al bucket con un único ADD
+    y fija la ocupación observada (SET). Los nombres llevan '#', por eso los
+    placeholders son posicionales.
+    """
+    names = {'#gpk': 'GSI1PK', '#gsk': 'GSI1SK'}
+    values = {':gpk': index_pk(granularity), ':gsk': period}
+    sets = ['#gpk = :gpk', '#gsk = :gsk']
+    adds = []
+    for i, (attribute, value) in enumerate(counters.items()):
+        names[f'#c{i}'] = attribute
+        values[f':c{i}'] = value
+        adds.append(f'#c{i} :c{i}')
+    for i, (attribute, value) in enumerate((snapshot or {}).items()):
+        names[f'#s{i}'] = attribute
+        values[f':s{i}'] = value
+        sets.append(f'#s{i} = :s{i}')
+    if granularity == HOURLY:
+        names['#ttl'] = 'ttl'
+        values[':ttl'] = int(now or datetime.now(timezone.utc).timestamp()) + HOURLY_TTL_SECONDS
+        sets.append('#ttl = :ttl')
+    
+    expression = 'SET ' + ', '.join(sets)
+    if adds:
+        expression += ' ADD ' + ', '.join(adds)
+    return {
+        'Key': metric_key(granularity, period),
+        'UpdateExpression': expression,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+    }
+
+
+def record_bucket(table, granularity, period, counters, snapshot=None, now=None):
+    """Escribe el bucket (ver bucket_update)"""
+    table.update_item(**bucket_update(granularity, period, counters, snapshot, now))
+
+
+def query_buckets(table, granularity, desde, hasta):
+    """Buckets de una granularidad entre dos fechas (yyyy-mm-dd, inclusive), en orden"""
+    from boto3.dynamodb.conditions import Key
+    
+    if granularity == HOURLY:
+        desde, hasta = f'{desde}#00', f'{hasta}#23'
+    items = []
+    query_kwargs = {
+        'IndexName': 'GSI1',
+        'KeyConditionExpression': Key('GSI1PK').eq(index_pk(granularity)) & Key('GSI1SK').between(desde, hasta),
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return items
+
+
+def public_bucket(item):
+    """Bucket tal como se devuelve al panel"""
+    period = item['GSI1SK']
+    bucket = {'periodo': period.replace('#', 'T') + ':00' if '#' in period else period}
+    categories = {}
+    for attribute, value in item.items():
+        counter, _, category = attribute.partition('#')
+        if counter not in FLOW_COUNTERS and counter != OCCUPANCY:
+            continue
+        if category:
+            categories.setdefault(category, {})[counter] = int(value)
+        else:
+            bucket[counter] = int(value)
+    for counter in FLOW_COUNTERS:
+        bucket.setdefault(counter, 0)
+    bucket['categorias'] = categories
+    return bucket
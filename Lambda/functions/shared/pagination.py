@@ -0,0 +1,53 @@
+"""
+Utilidades de paginación por cursor
+El cursor es opaco para el cliente: codifica el LastEvaluatedKey de DynamoDB
+y, opcionalmente, la consulta a la que pertenece (scope)
+"""
+import base64
+import hashlib
+import json
+
+
+def query_scope(mode, *params):
+    """
+    Identifica el modo de paginación y los parámetros que definen la secuencia
+    de resultados: un cursor solo sirve para la misma consulta
+    """
+    raw = json.dumps(params, separators=(',', ':'))
+    return f"{mode}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def encode_cursor(last_key, scope=None):
+    """Codifica un LastEvaluatedKey como cursor opaco (None si no hay más páginas)"""
+    if not last_key:
+        return None
+    payload = last_key if scope is None else {'scope': scope, 'key': last_key}
+    raw = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, scope=None):
+    """
+    Decodifica un cursor recibido del cliente en un ExclusiveStartKey
+    Lanza ValueError si el cursor no es válido o es de otra consulta (scope)
+    """
+    if not cursor:
+        return None
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        key = json.loads(raw)
+    except Exception:
+        raise ValueError('Cursor inválido')
+    if scope is not None:
+        if not isinstance(key, dict) or key.get('scope') != scope:
+            raise ValueError('El cursor pertenece a otra consulta')
+        key = key.get('key')
+    if not isinstance(key, dict) or not all(isinstance(v, str) for v in key.values()):
+        raise ValueError('Cursor inválido')
+    return key
+
+
+def item_key(item, attributes):
+    """Construye la llave de un item (para usar como ExclusiveStartKey)"""
+    return {attr: item[attr] for attr in attributes}
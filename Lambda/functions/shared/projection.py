@@ -0,0 +1,121 @@
+"""
+Proyección de campos para respuestas de talleres
+Traduce view=summary|full y fields=a,b,c en un ProjectionExpression de DynamoDB
+"""
+
+# Campos públicos de un taller (además de _id, que siempre se devuelve)
+WORKSHOP_FIELDS = (
+    'nombre', 'descripcion', 'fecha', 'hora', 'lugar', 'categoria', 'tipo',
+    'instructor', 'rating', 'cupo', 'cupos_disponibles', 'inscritos',
+    'creado_en', 'actualizado_en', 'cola_inscripcion', 'inscripciones',
+)
+# Campos que no viven en el item METADATA: la lista de inscritos son items REG#
+# que solo se leen en el detalle de un taller
+REGISTRATION_FIELDS = ('inscripciones',)
+# Vista resumida: sin la lista de inscritos, solo el conteo y los cupos disponibles
+SUMMARY_FIELDS = tuple(f for f in WORKSHOP_FIELDS if f not in REGISTRATION_FIELDS)
+VIEWS = {
+    'full': WORKSHOP_FIELDS,
+    'summary': SUMMARY_FIELDS,
+}
+
+# Atributos de DynamoDB que necesita cada campo calculado
+DERIVED_ATTRIBUTES = {
+    'cupos_disponibles': ('cupo', 'inscritos'),
+    'inscripciones': (),
+}
+# Campos que dependen del contador de inscritos
+COUNTER_FIELDS = ('inscritos', 'cupos_disponibles')
+# Atributos que identifican la versión del contenido de un taller (ver content_version)
+VERSION_ATTRIBUTES = ('creado_en', 'actualizado_en', 'inscritos')
+# Valores por defecto de campos opcionales
+FIELD_DEFAULTS = {
+    'instructor': '',
+    'cola_inscripcion': False,
+}
+
+
+def resolve_fields(params):
+    """
+    Determina los campos a devolver a partir de los query params.
+    `fields` tiene prioridad sobre `view`. Lanza ValueError si son inválidos.
+    """
+    requested = (params.get('fields') or '').strip()
+    if requested:
+        fields = tuple(dict.fromkeys(f.strip() for f in requested.split(',') if f.strip()))
+        unknown = [f for f in fields if f not in WORKSHOP_FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"Campos no válidos: {', '.join(unknown)}")
+        return fields
+    
+    view = (params.get('view') or 'full').strip().lower()
+    if view not in VIEWS:
+        raise ValueError(f'Vista no válida: {view}')
+    return VIEWS[view]
+
+
+def metadata_fields(fields):
+    """
+    Campos pedidos sin los que requieren leer las inscripciones (para listados).
+    Lanza ValueError si solo se pidieron esos campos.
+    """
+    listed = tuple(f for f in fields if f not in REGISTRATION_FIELDS)
+    if not listed:
+        raise ValueError(f"Campos no disponibles en listados: {', '.join(fields)}")
+    return listed
+
+
+def projection_kwargs(fields, key_attributes=('PK', 'SK'), extra_attributes=()):
+    """
+    Argumentos ProjectionExpression/ExpressionAttributeNames para leer solo lo necesario.
+    Devuelve {} si se piden todos los campos del item (se lee entero).
+    """
+    if set(SUMMARY_FIELDS) <= set(fields):
+        return {}
+    
+    attributes = list(key_attributes) + list(extra_attributes)
+    for field in fields:
+        attributes.extend(DERIVED_ATTRIBUTES.get(field, (field,)))
+    attributes = list(dict.fromkeys(attributes))
+    
+    names = {f'#p{i}': attr for i, attr in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+    }
+
+
+def registration_count(item):
+    """Número de inscritos según el contador del item METADATA"""
+    return int(item.get('inscritos', 0))
+
+
+def content_version(item, fields):
+    """
+    Versión de lo que serialize_workshop devuelve para el item, sin serializarlo:
+    cambia con cada edición (actualizado_en) y, si se piden, con los inscritos.
+    El item debe incluir VERSION_ATTRIBUTES.
+    """
+    parts = [item['PK'], item.get('creado_en') or '', item.get('actualizado_en') or '']
+    if any(field in fields for field in COUNTER_FIELDS):
+        parts.append(registration_count(item))
+    return ':'.join(str(part) for part in parts)
+
+
+def serialize_workshop(item, fields=WORKSHOP_FIELDS):
+    """Convierte un item de DynamoDB en la respuesta pública con los campos pedidos"""
+    taller = {'_id': item['PK'].replace('WORKSHOP#', '')}
+    for field in fields:
+        if field == 'cupo':
+            taller['cupo'] = int(item.get('cupo', 0))
+        elif field == 'rating':
+            taller['rating'] = float(item.get('rating', 0))
+        elif field == 'inscritos':
+            taller['inscritos'] = registration_count(item)
+        elif field == 'cupos_disponibles':
+            taller['cupos_disponibles'] = max(int(item.get('cupo', 0)) - registration_count(item), 0)
+        elif field == 'inscripciones':
+            taller['inscripciones'] = item.get('inscripciones', [])
+        else:
+            taller[field] = item.get(field, FIELD_DEFAULTS.get(field))
+    return taller
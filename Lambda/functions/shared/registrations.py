@@ -0,0 +1,222 @@
+"""
+Inscripciones como items propios dentro de la partición del taller
+PK = WORKSHOP#<id>, SK = REG#<studentId>. El item METADATA solo guarda el
+contador `inscritos`, así su tamaño no crece con cada estudiante.
+Cada item REG# también se indexa por estudiante en GSI3
+(GSI3PK = USER#<studentId>, GSI3SK = REG#<registrado_en>), y el item
+USER#<studentId> guarda el contador `inscritos_count` (lo mantiene el stream).
+"""
+
+REG_PREFIX = 'REG#'
+# Atributos públicos de una inscripción
+REGISTRATION_ATTRIBUTES = ('estudiante_id', 'nombre', 'email', 'registrado_en')
+# Índice de inscripciones por estudiante (mis inscripciones)
+STUDENT_INDEX = 'GSI3'
+# Contador de inscripciones en el item USER# del estudiante
+STUDENT_COUNTER = 'inscritos_count'
+# Marca de las escrituras de maintenance/migrate_registrations: el stream no
+# las cuenta como inscripciones nuevas
+MIGRATION_MARKER = 'migrado_en'
+# Fallo de inscripción que deja al estudiante en la lista de espera
+WORKSHOP_FULL = (409, 'Cupo lleno')
+# Fallo de inscripción directa en un taller con admisión por turnos: va a la cola
+ADMISSION_QUEUED = (202, 'Inscripción en cola')
+
+
+def registration_key(workshop_id, student_id):
+    """Llave del item de inscripción de un estudiante en un taller"""
+    return {'PK': f'WORKSHOP#{workshop_id}', 'SK': f'{REG_PREFIX}{student_id}'}
+
+
+def student_index_keys(student_id, registrado_en, prefix=REG_PREFIX):
+    """
+    Atributos GSI3 de una inscripción (ordenadas por fecha de inscripción);
+    las entradas de lista de espera usan el mismo índice con prefix=WAIT#
+    """
+    return {'GSI3PK': f'USER#{student_id}', 'GSI3SK': f'{prefix}{registrado_en}'}
+
+
+def registration_item(workshop_id, inscripcion):
+    """Item completo a partir de la inscripción (estudiante_id, nombre, email, registrado_en)"""
+    return {
+        **registration_key(workshop_id, inscripcion['estudiante_id']),
+        **student_index_keys(inscripcion['estudiante_id'], inscripcion.get('registrado_en') or ''),
+        'workshop_id': workshop_id,
+        **inscripcion,
+    }
+
+
+def register_transaction(table, workshop_id, inscripcion, admission=False):
+    """
+    TransactItems que inscriben en una sola escritura atómica:
+    [0] suma 1 a `inscritos` solo si el taller existe y queda cupo (cupo < 0 = sin límite, cupo 0 = lleno)
+        y, salvo desde la admisión por turnos (admission=True), si el taller no usa cola_inscripcion
+    [1] crea el item REG# solo si el estudiante no estaba inscrito
+    """
+    condition = 'attribute_exists(PK) AND (cupo < :zero OR (attribute_not_exists(inscritos) AND cupo > :zero) OR inscritos < cupo)'
+    values = {':one': 1, ':zero': 0}
+    if not admission:
+        # La bandera se comprueba en la misma escritura, sin leer antes el taller
+        condition += ' AND (attribute_not_exists(cola_inscripcion) OR cola_inscripcion = :false)'
+        values[':false'] = False
+    return [
+        {'Update': {
+            'TableName': table.name,
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': 'ADD inscritos :one',
+            'ConditionExpression': condition,
+            'ExpressionAttributeValues': values,
+            # Con el item anterior se distingue "taller no existe", "en cola" y "cupo lleno"
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
+        }},
+        {'Put': {
+            'TableName': table.name,
+            'Item': registration_item(workshop_id, inscripcion),
+            'ConditionExpression': 'attribute_not_exists(SK)',
+        }},
+    ]
+
+
+def unregister_transaction(table, workshop_id, student_id):
+    """
+    TransactItems que anulan una inscripción en una sola escritura atómica:
+    [0] borra el item REG# solo si existe (nunca afecta a otro estudiante)
+    [1] resta 1 a `inscritos` solo si el taller existe
+    """
+    return [
+        {'Delete': {
+            'TableName': table.name,
+            'Key': registration_key(workshop_id, student_id),
+            'ConditionExpression': 'attribute_exists(SK)',
+        }},
+        {'Update': {
+            'TableName': table.name,
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': 'ADD inscritos :minus_one',
+            'ConditionExpression': 'attribute_exists(PK)',
+            'ExpressionAttributeValues': {':minus_one': -1},
+        }},
+    ]
+
+
+def cancellation_reasons(error):
+    """CancellationReasons de un TransactionCanceledException (una por TransactItem)"""
+    return error.response.get('CancellationReasons', [])
+
+
+def condition_failed(reason):
+    return reason.get('Code') == 'ConditionalCheckFailed'
+
+
+def registration_error(update_reason, put_reason):
+    """
+    (statusCode, mensaje) por el que falló la inscripción de register_transaction,
+    o None si ninguna de sus condiciones falló
+    """
+    if condition_failed(put_reason):
+        return 409, 'Ya estás inscrito en este taller'
+    if condition_failed(update_reason):
+        if 'Item' not in update_reason:
+            return 404, 'Taller no encontrado'
+        # El item viene en formato DynamoDB ({'BOOL': true})
+        if update_reason['Item'].get('cola_inscripcion', {}).get('BOOL'):
+            return ADMISSION_QUEUED
+        return WORKSHOP_FULL
+    return None
+
+
+def public_registration(item):
+    """Inscripción tal como se devuelve en las respuestas"""
+    return {attr: item.get(attr) for attr in REGISTRATION_ATTRIBUTES}
+
+
+def registration_items(table, workshop_id):
+    """Items REG# de un taller (todas las páginas), en orden de SK"""
+    from boto3.dynamodb.conditions import Key
+    
+    query_kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'WORKSHOP#{workshop_id}') & Key('SK').begins_with(REG_PREFIX),
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def migration_write(old_image, new_image):
+    """True si el cambio lo hizo la migración (fijó un migrado_en nuevo)"""
+    return bool(new_image) and new_image.get(MIGRATION_MARKER) != (old_image or {}).get(MIGRATION_MARKER)
+
+
+def count_registrations(table, workshop_id):
+    """Items REG# de un taller contados con Select=COUNT (sin leerlos)"""
+    from boto3.dynamodb.conditions import Key
+    
+    count = 0
+    query_kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'WORKSHOP#{workshop_id}') & Key('SK').begins_with(REG_PREFIX),
+        'Select': 'COUNT',
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        count += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return count
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def student_query(student_id, prefix=REG_PREFIX):
+    """Argumentos de la Query de GSI3 por los items de un estudiante, más recientes primero"""
+    from boto3.dynamodb.conditions import Key
+    
+    return {
+        'IndexName': STUDENT_INDEX,
+        'KeyConditionExpression': Key('GSI3PK').eq(f'USER#{student_id}') & Key('GSI3SK').begins_with(prefix),
+        'ScanIndexForward': False,
+    }
+
+
+def student_registrations(table, student_id, prefix=REG_PREFIX):
+    """
+    Items REG# de un estudiante vía GSI3 (todas las páginas), más recientes
+    primero; con prefix=WAIT#, sus entradas en listas de espera
+    """
+    query_kwargs = student_query(student_id, prefix)
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def student_count_update(student_id, delta):
+    """
+    Argumentos del Update que suma `delta` al contador de inscripciones del
+    estudiante. La condición falla si el estudiante ya no existe: no se
+    recrea su item.
+    """
+    return {
+        'Key': {'PK': f'USER#{student_id}', 'SK': 'METADATA'},
+        'UpdateExpression': 'ADD #count :delta',
+        'ConditionExpression': 'attribute_exists(PK)',
+        'ExpressionAttributeNames': {'#count': STUDENT_COUNTER},
+        'ExpressionAttributeValues': {':delta': delta},
+    }
+
+
+def list_registrations(table, workshop_id):
+    """Inscripciones públicas de un taller"""
+    return [public_registration(item) for item in registration_items(table, workshop_id)]
+
+
+def delete_workshop_registrations(table, workshop_id):
+    """Elimina todas las inscripciones de un taller; devuelve cuántas había"""
+    deleted = 0
+    with table.batch_writer() as batch:
+        for item in registration_items(table, workshop_id):
+            batch.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+            deleted += 1
+    return deleted
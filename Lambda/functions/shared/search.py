@@ -0,0 +1,163 @@
+"""
+Índice invertido para la búsqueda de talleres (parámetro q)
+
+Cada término se guarda como un item PK=TERM#<token>, SK=WORKSHOP#<id> con su
+puntaje, de modo que buscar cuesta lo mismo que el número de talleres que
+coinciden y no el tamaño del catálogo.
+"""
+import re
+import unicodedata
+
+# Peso de cada campo en el puntaje de relevancia
+FIELD_WEIGHTS = {
+    'nombre': 3,
+    'lugar': 1,
+    'descripcion': 1,
+}
+# Campos que además indexan prefijos (búsqueda mientras se escribe)
+PREFIX_FIELDS = ('nombre', 'lugar')
+# Multiplicador para coincidencias de palabra completa frente a prefijos
+FULL_TOKEN_MULTIPLIER = 2
+MIN_TOKEN_LENGTH = 2
+MIN_PREFIX_LENGTH = 2
+
+STOPWORDS = {
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'que', 'se', 'su', 'un', 'una', 'y',
+    'and', 'of', 'the', 'to',
+}
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """Pasa a minúsculas y elimina acentos (programación -> programacion)"""
+    decomposed = unicodedata.normalize('NFKD', str(text or '').lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Divide un texto en tokens normalizados, sin stopwords"""
+    return [
+        token for token in TOKEN_RE.findall(normalize(text))
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS
+    ]
+
+
+def matches_text(workshop, q):
+    """
+    True si q aparece como subcadena (sin acentos ni mayúsculas) en algún campo
+    buscable. Respaldo para q sin términos que el índice pueda resolver.
+    """
+    needle = normalize(q).strip()
+    return any(needle in normalize(workshop.get(field, '')) for field in FIELD_WEIGHTS)
+
+
+def build_terms(workshop):
+    """Calcula {término: puntaje} para un item de taller"""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(workshop.get(field, '')):
+            terms[token] = terms.get(token, 0) + weight * FULL_TOKEN_MULTIPLIER
+            if field in PREFIX_FIELDS:
+                for size in range(MIN_PREFIX_LENGTH, len(token)):
+                    prefix = token[:size]
+                    terms[prefix] = terms.get(prefix, 0) + weight
+    return terms
+
+
+def term_item(workshop_id, term, score, workshop):
+    """Item del índice para un término de un taller"""
+    return {
+        'PK': f'TERM#{term}',
+        'SK': f'WORKSHOP#{workshop_id}',
+        'workshop_id': workshop_id,
+        'score': score,
+        'categoria': workshop.get('categoria', ''),
+        'fecha': workshop.get('fecha', ''),
+        'hora': workshop.get('hora', ''),
+    }
+
+
+def sync_workshop_terms(table, workshop_id, old_workshop, new_workshop):
+    """
+    Actualiza el índice a partir de la imagen anterior y nueva de un taller.
+    Solo escribe los términos que cambiaron; con new_workshop vacío borra todo.
+    Devuelve el número de escrituras realizadas.
+    """
+    old_terms = build_terms(old_workshop) if old_workshop else {}
+    new_terms = build_terms(new_workshop) if new_workshop else {}
+    
+    # Si cambian los atributos usados para filtrar, hay que reescribir todos los términos
+    filter_fields = ('categoria', 'fecha', 'hora')
+    metadata_changed = any(
+        (old_workshop or {}).get(f) != (new_workshop or {}).get(f) for f in filter_fields
+    )
+    
+    writes = 0
+    with table.batch_writer() as batch:
+        for term in old_terms.keys() - new_terms.keys():
+            batch.delete_item(Key={'PK': f'TERM#{term}', 'SK': f'WORKSHOP#{workshop_id}'})
+            writes += 1
+        for term, score in new_terms.items():
+            if metadata_changed or old_terms.get(term) != score:
+                batch.put_item(Item=term_item(workshop_id, term, score, new_workshop))
+                writes += 1
+    return writes
+
+
+def query_term(table, term):
+    """Lee todas las entradas del índice para un término"""
+    from boto3.dynamodb.conditions import Key
+    
+    entries = []
+    query_kwargs = {'KeyConditionExpression': Key('PK').eq(f'TERM#{term}')}
+    while True:
+        response = table.query(**query_kwargs)
+        entries.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return entries
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def search_workshops(table, q, categoria='', fecha_desde='', fecha_hasta=''):
+    """
+    Busca talleres que contengan todos los términos de q.
+    Devuelve los IDs ordenados por relevancia (y luego por fecha),
+    o None si q no tiene términos buscables.
+    """
+    query_terms = list(dict.fromkeys(tokenize(q)))
+    if not query_terms:
+        return None
+    
+    scores = None
+    entries_by_id = {}
+    for term in query_terms:
+        term_scores = {}
+        for entry in query_term(table, term):
+            if categoria and entry.get('categoria') != categoria:
+                continue
+            if fecha_desde and entry.get('fecha', '') < fecha_desde:
+                continue
+            if fecha_hasta and entry.get('fecha', '') > fecha_hasta:
+                continue
+            term_scores[entry['workshop_id']] = int(entry.get('score', 0))
+            entries_by_id[entry['workshop_id']] = entry
+        
+        # Todos los términos deben aparecer (AND)
+        if scores is None:
+            scores = term_scores
+        else:
+            scores = {
+                workshop_id: score + term_scores[workshop_id]
+                for workshop_id, score in scores.items()
+                if workshop_id in term_scores
+            }
+        if not scores:
+            return []
+    
+    def sort_key(workshop_id):
+        entry = entries_by_id[workshop_id]
+        return (-scores[workshop_id], f"{entry.get('fecha', '')}#{entry.get('hora', '')}")
+    
+    return sorted(scores, key=sort_key)
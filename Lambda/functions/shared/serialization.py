@@ -0,0 +1,36 @@
+"""
+Serialización JSON de items de DynamoDB
+Usa orjson si está instalado y json estándar como respaldo; ambos producen
+la misma salida compacta, de modo que los ETag calculados sobre el cuerpo
+no dependen del backend.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+# orjson es opcional: si no está en el paquete se usa json estándar
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def wire_value(obj):
+    """
+    Convierte los tipos de DynamoDB que JSON no soporta
+    Decimal enteros quedan como int (cupo: 30, no 30.0) y el resto como float
+    """
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f'Tipo no serializable: {type(obj).__name__}')
+
+
+def dumps(obj):
+    """Serializa a JSON (str) convirtiendo Decimal/set en la misma pasada"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=wire_value).decode('utf-8')
+    return json.dumps(obj, default=wire_value, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,124 @@
+"""
+Estadísticas materializadas: el item STATS#GLOBAL y un contador
+CATEGORY#<id>/COUNT por categoría
+
+El stream de DynamoDB suma deltas (ADD, dentro de sus transacciones) a partir
+de las imágenes vieja y nueva de cada taller y estudiante; GET /stats y
+GET /categories solo leen estos items. maintenance/reconcile_stats.py los recalcula desde cero si
+se desvían.
+"""
+from shared.aws import get_resource
+
+STATS_KEY = {'PK': 'STATS#GLOBAL', 'SK': 'METADATA'}
+# Contadores del item
+STATS_COUNTERS = ('talleres', 'estudiantes', 'registros', 'cupos')
+# Contadores de cada categoría
+CATEGORY_COUNTERS = ('cantidad', 'cupos', 'cupos_disponibles')
+# Límite de llaves por BatchGetItem
+BATCH_GET_MAX_KEYS = 100
+
+
+def category_key(category_id):
+    return {'PK': f'CATEGORY#{category_id}', 'SK': 'COUNT'}
+
+
+def workshop_totals(item):
+    """Aporte de un item METADATA de taller a los contadores (vacío si no existe)"""
+    if not item:
+        return {}
+    cupo = int(item.get('cupo', 0))
+    return {
+        'talleres': 1,
+        'registros': int(item.get('inscritos', 0)),
+        # cupo < 0 = sin límite: no suma a los cupos ofrecidos
+        'cupos': max(cupo, 0),
+    }
+
+
+def student_totals(item):
+    """Aporte de un item METADATA de usuario (solo cuentan los estudiantes)"""
+    if not item or item.get('role') != 'student':
+        return {}
+    return {'estudiantes': 1}
+
+
+def category_totals(item):
+    """
+    Aporte de un taller al contador de su categoría, como {categoría: totales}.
+    Los talleres sin límite (cupo < 0) no suman cupos ni cupos disponibles.
+    """
+    if not item:
+        return {}
+    cupo = int(item.get('cupo', 0))
+    return {item.get('categoria', 'other'): {
+        'cantidad': 1,
+        'cupos': max(cupo, 0),
+        'cupos_disponibles': max(cupo - int(item.get('inscritos', 0)), 0) if cupo >= 0 else 0,
+    }}
+
+
+def diff_totals(old_totals, new_totals, counters=STATS_COUNTERS):
+    """Delta entre el aporte anterior y el nuevo de un item"""
+    return {
+        counter: new_totals.get(counter, 0) - old_totals.get(counter, 0)
+        for counter in counters
+    }
+
+
+def diff_category_totals(old_image, new_image):
+    """
+    Deltas por categoría entre dos imágenes de un taller; un cambio de
+    categoría resta en la anterior y suma en la nueva
+    """
+    old_totals = category_totals(old_image)
+    new_totals = category_totals(new_image)
+    return {
+        category: diff_totals(old_totals.get(category, {}), new_totals.get(category, {}), CATEGORY_COUNTERS)
+        for category in {**old_totals, **new_totals}
+    }
+
+
+def merge_deltas(total, delta):
+    """Acumula un delta en otro (para escribir una sola vez por lote del stream)"""
+    for counter, value in delta.items():
+        total[counter] = total.get(counter, 0) + value
+    return total
+
+
+def delta_update(deltas, key=STATS_KEY):
+    """
+    Argumentos del Update que suma los deltas al item (por defecto
+    STATS#GLOBAL) con un único ADD, o None si no hay nada que sumar
+    """
+    deltas = {counter: value for counter, value in deltas.items() if value}
+    if not deltas:
+        return None
+    return {
+        'Key': key,
+        'UpdateExpression': 'ADD ' + ', '.join(f'#{c} :{c}' for c in deltas),
+        'ExpressionAttributeNames': {f'#{c}': c for c in deltas},
+        'ExpressionAttributeValues': {f':{c}': v for c, v in deltas.items()},
+    }
+
+
+def public_stats(item):
+    """Respuesta de GET /stats a partir del item (ceros si aún no existe)"""
+    item = item or {}
+    totals = {counter: max(int(item.get(counter, 0)), 0) for counter in STATS_COUNTERS}
+    totals['ocupacion'] = round(totals['registros'] / totals['cupos'] * 100) if totals['cupos'] > 0 else 0
+    return totals
+
+
+def category_counts(table, category_ids):
+    """Contadores de las categorías pedidas (BatchGetItem), como {id: item}"""
+    found = {}
+    for start in range(0, len(category_ids), BATCH_GET_MAX_KEYS):
+        request = {table.name: {
+            'Keys': [category_key(category_id) for category_id in category_ids[start:start + BATCH_GET_MAX_KEYS]],
+        }}
+        while request:
+            response = get_resource('dynamodb').batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table.name, []):
+                found[item['PK'].replace('CATEGORY#', '')] = item
+            request = response.get('UnprocessedKeys') or None
+    return found
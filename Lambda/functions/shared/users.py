@@ -0,0 +1,69 @@
+"""
+Usuarios (USER#<sub>/METADATA) y su item de unicidad de email
+EMAIL#<email>/METADATA guarda el sub del usuario: se escribe y se borra en la
+misma transacción que el item USER#, así la condición attribute_not_exists
+garantiza que un email no quede registrado dos veces y buscar por email es
+un solo GetItem.
+"""
+
+EMAIL_PREFIX = 'EMAIL#'
+
+
+def user_key(user_id):
+    return {'PK': f'USER#{user_id}', 'SK': 'METADATA'}
+
+
+def email_key(email):
+    """Llave del item de unicidad (el email se normaliza en minúsculas)"""
+    return {'PK': f'{EMAIL_PREFIX}{email.strip().lower()}', 'SK': 'METADATA'}
+
+
+def email_item(email, user_id, creado_en):
+    return {
+        **email_key(email),
+        'email': email.strip().lower(),
+        'user_id': user_id,
+        'creado_en': creado_en,
+    }
+
+
+def create_user_transaction(table, item):
+    """
+    TransactItems que crean un usuario:
+    [0] el item USER# solo si no existía
+    [1] el item EMAIL# solo si el email no está tomado
+    """
+    return [
+        {'Put': {
+            'TableName': table.name,
+            'Item': item,
+            'ConditionExpression': 'attribute_not_exists(PK)',
+        }},
+        {'Put': {
+            'TableName': table.name,
+            'Item': email_item(item['email'], item['PK'].replace('USER#', ''), item.get('creado_en', '')),
+            'ConditionExpression': 'attribute_not_exists(PK)',
+        }},
+    ]
+
+
+def delete_user_transaction(table, user_id, email):
+    """TransactItems que borran el usuario y liberan su email"""
+    transact_items = [{'Delete': {'TableName': table.name, 'Key': user_key(user_id)}}]
+    if email:
+        transact_items.append({'Delete': {'TableName': table.name, 'Key': email_key(email)}})
+    return transact_items
+
+
+def email_taken(table, email):
+    """True si el email ya pertenece a un usuario (lectura consistente)"""
+    response = table.get_item(Key=email_key(email), ConsistentRead=True, ProjectionExpression='PK')
+    return 'Item' in response
+
+
+def find_user_by_email(table, email):
+    """(sub, email) del usuario con ese email, o None si no existe"""
+    item = table.get_item(Key=email_key(email)).get('Item')
+    if not item:
+        return None
+    return item['user_id'], item['email']
@@ -0,0 +1,165 @@
+"""
+Lista de espera por taller (FIFO) como items propios en la partición del taller
+PK = WORKSHOP#<id>, SK = WAIT#<studentId>. El orden de llegada lo da
+`en_espera_desde`; el item METADATA lleva el contador `en_espera` para que el
+stream sepa si hay alguien esperando sin consultar la partición.
+Cada entrada también se indexa por estudiante en GSI3
+(GSI3PK = USER#<studentId>, GSI3SK = WAIT#<en_espera_desde>).
+"""
+from shared.registrations import registration_item, student_index_keys, cancellation_reasons, condition_failed
+
+WAIT_PREFIX = 'WAIT#'
+
+
+def waitlist_key(workshop_id, student_id):
+    """Llave del item de espera de un estudiante en un taller"""
+    return {'PK': f'WORKSHOP#{workshop_id}', 'SK': f'{WAIT_PREFIX}{student_id}'}
+
+
+def has_free_seat(item):
+    """True si el taller admite otro inscrito (cupo < 0 = sin límite)"""
+    cupo = int(item.get('cupo', 0))
+    return cupo < 0 or int(item.get('inscritos', 0)) < cupo
+
+
+def join_waitlist_transaction(table, workshop_id, entry):
+    """
+    TransactItems que agregan al estudiante a la lista de espera:
+    [0] crea el item WAIT# solo si no estaba esperando
+    [1] suma 1 a `en_espera` solo si el taller existe
+    """
+    return [
+        {'Put': {
+            'TableName': table.name,
+            'Item': {
+                **waitlist_key(workshop_id, entry['estudiante_id']),
+                **student_index_keys(entry['estudiante_id'], entry.get('en_espera_desde') or '', WAIT_PREFIX),
+                'workshop_id': workshop_id,
+                **entry,
+            },
+            'ConditionExpression': 'attribute_not_exists(SK)',
+        }},
+        {'Update': {
+            'TableName': table.name,
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': 'ADD en_espera :one',
+            'ConditionExpression': 'attribute_exists(PK)',
+            'ExpressionAttributeValues': {':one': 1},
+        }},
+    ]
+
+
+def join_waitlist(table, workshop_id, inscripcion):
+    """
+    Deja al estudiante en la lista de espera del taller lleno (idempotente) y
+    devuelve su posición. Cuando se libere un cupo, el stream lo inscribe.
+    """
+    entry = {
+        'estudiante_id': inscripcion['estudiante_id'],
+        'nombre': inscripcion['nombre'],
+        'email': inscripcion['email'],
+        'en_espera_desde': inscripcion['registrado_en'],
+    }
+    client = table.meta.client
+    try:
+        client.transact_write_items(
+            TransactItems=join_waitlist_transaction(table, workshop_id, entry)
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        reasons = cancellation_reasons(e)
+        # Si ya estaba esperando se devuelve su posición actual
+        if not reasons or not condition_failed(reasons[0]):
+            raise
+    return waitlist_position(table, workshop_id, inscripcion['estudiante_id'])
+
+
+def leave_waitlist_transaction(table, workshop_id, student_id):
+    """
+    TransactItems que sacan al estudiante de la lista de espera:
+    [0] borra el item WAIT# solo si existe
+    [1] resta 1 a `en_espera` solo si el taller existe
+    """
+    return [
+        {'Delete': {
+            'TableName': table.name,
+            'Key': waitlist_key(workshop_id, student_id),
+            'ConditionExpression': 'attribute_exists(SK)',
+        }},
+        {'Update': {
+            'TableName': table.name,
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': 'ADD en_espera :minus_one',
+            'ConditionExpression': 'attribute_exists(PK)',
+            'ExpressionAttributeValues': {':minus_one': -1},
+        }},
+    ]
+
+
+def promote_transaction(table, workshop_id, entry, registrado_en):
+    """
+    TransactItems que pasan la primera entrada de la lista de espera a inscrito:
+    [0] suma 1 a `inscritos` y resta 1 a `en_espera` solo si queda cupo
+    [1] borra el item WAIT# solo si sigue esperando
+    [2] crea el item REG# solo si no estaba inscrito
+    """
+    inscripcion = {
+        'estudiante_id': entry['estudiante_id'],
+        'nombre': entry.get('nombre', ''),
+        'email': entry.get('email', ''),
+        'registrado_en': registrado_en,
+    }
+    return [
+        {'Update': {
+            'TableName': table.name,
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': 'ADD inscritos :one, en_espera :minus_one',
+            'ConditionExpression': 'attribute_exists(PK) AND (cupo < :zero OR (attribute_not_exists(inscritos) AND cupo > :zero) OR inscritos < cupo)',
+            'ExpressionAttributeValues': {':one': 1, ':minus_one': -1, ':zero': 0},
+        }},
+        {'Delete': {
+            'TableName': table.name,
+            'Key': waitlist_key(workshop_id, entry['estudiante_id']),
+            'ConditionExpression': 'attribute_exists(SK)',
+        }},
+        {'Put': {
+            'TableName': table.name,
+            'Item': registration_item(workshop_id, inscripcion),
+            'ConditionExpression': 'attribute_not_exists(SK)',
+        }},
+    ]
+
+
+def waitlist_items(table, workshop_id):
+    """Items WAIT# de un taller en orden de llegada (FIFO)"""
+    from boto3.dynamodb.conditions import Key
+    
+    items = []
+    query_kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'WORKSHOP#{workshop_id}') & Key('SK').begins_with(WAIT_PREFIX),
+    }
+    while True:
+        response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    items.sort(key=lambda item: (item.get('en_espera_desde', ''), item.get('estudiante_id', '')))
+    return items
+
+
+def waitlist_position(table, workshop_id, student_id):
+    """Posición (desde 1) del estudiante en la lista de espera, o None si no está"""
+    for position, item in enumerate(waitlist_items(table, workshop_id), start=1):
+        if item.get('estudiante_id') == student_id:
+            return position
+    return None
+
+
+def delete_workshop_waitlist(table, workshop_id):
+    """Elimina la lista de espera de un taller; devuelve cuántas entradas había"""
+    deleted = 0
+    with table.batch_writer() as batch:
+        for item in waitlist_items(table, workshop_id):
+            batch.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+            deleted += 1
+    return deleted
@@ -4,17 +4,21 @@ DELETE /students/{id} (requiere auth admin)
 """
 import json
 import os
-import boto3
+from shared.jobs import job_queue, new_job, job_item, enqueue_job, JOB_PENDING, JOB_FAILED
+from shared.users import user_key, find_user_by_email, delete_user_transaction
+from shared.aws import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-cognito = boto3.client('cognito-idp')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+cognito = lazy_client('cognito-idp')
+table = lazy_table()
 
 USER_POOL_ID = os.environ.get('USER_POOL_ID')
+# Cola de trabajos de la cascada (students/delete_worker.py)
+cascade_queue = job_queue('STUDENT_CASCADE_QUEUE_URL')
 
 def handler(event, context):
     """
-    Elimina un estudiante de DynamoDB y Cognito
+    Elimina un estudiante de DynamoDB y Cognito. Sus inscripciones y esperas
+    se anulan en segundo plano: la respuesta trae el ID del trabajo.
     """
     try:
         # Verificar autorización
@@ -45,21 +49,14 @@ def handler(event, context):
         
         # Buscar el estudiante en DynamoDB para obtener su email
         # El ID puede ser el email o el sub de Cognito
-        response = table.get_item(
-            Key={'PK': f'USER#{student_id}', 'SK': 'METADATA'}
-        )
+        response = table.get_item(Key=user_key(student_id))
         
-        if 'Item' not in response:
-            # Intentar buscar por email si no se encontró por ID
-            scan_response = table.scan(
-                FilterExpression='email = :email AND SK = :sk',
-                ExpressionAttributeValues={
-                    ':email': student_id,
-                    ':sk': 'METADATA'
-                }
-            )
-            items = scan_response.get('Items', [])
-            if not items:
+        if 'Item' in response:
+            item = response['Item']
+        else:
+            # Intentar por email: un GetItem al item de unicidad EMAIL#
+            found = find_user_by_email(table, student_id)
+            if not found:
                 return {
                     'statusCode': 404,
                     'headers': {
@@ -68,19 +65,14 @@ def handler(event, context):
                     },
                     'body': json.dumps({'mensaje': 'Estudiante no encontrado'})
                 }
-            item = items[0]
-        else:
-            item = response['Item']
+            user_id, found_email = found
+            item = {**user_key(user_id), 'email': found_email}
         
         email = item.get('email')
-        pk = item.get('PK')
+        user_id = item.get('PK').replace('USER#', '')
         
-        # Eliminar de DynamoDB
-        table.delete_item(
-            Key={'PK': pk, 'SK': 'METADATA'}
-        )
-        
-        # Intentar eliminar de Cognito
+        # Primero se elimina de Cognito: si falla, el estudiante sigue intacto
+        # (puede iniciar sesión y conserva sus inscripciones) y el admin reintenta
         if email and USER_POOL_ID:
             try:
                 cognito.admin_delete_user(
@@ -88,39 +80,32 @@ def handler(event, context):
                     Username=email
                 )
             except cognito.exceptions.UserNotFoundException:
-                # Si el usuario no existe en Cognito, continuar
+                # Si el usuario no existe en Cognito (o es un reintento), continuar
                 pass
-            except Exception as e:
-                print(f'Error eliminando de Cognito: {e}')
         
-        # También eliminar las inscripciones del estudiante de los talleres
-        # Buscar talleres donde el estudiante está inscrito
-        student_sub = pk.replace('USER#', '')
-        workshops_response = table.scan(
-            FilterExpression='begins_with(PK, :pk) AND SK = :sk',
-            ExpressionAttributeValues={
-                ':pk': 'WORKSHOP#',
-                ':sk': 'METADATA'
-            }
+        # Eliminar de DynamoDB el usuario y su item EMAIL# (que libera el email)
+        # y crear el trabajo de la cascada en la misma transacción: no hay
+        # trabajo sin borrado ni borrado sin trabajo
+        job = new_job({'estudiante_id': user_id, 'email': email or ''})
+        table.meta.client.transact_write_items(
+            TransactItems=delete_user_transaction(table, user_id, email) + [
+                {'Put': {'TableName': table.name, 'Item': job_item(job, 'eliminar_estudiante')}},
+            ]
         )
         
-        for workshop in workshops_response.get('Items', []):
-            inscripciones = workshop.get('inscripciones', [])
-            nuevas_inscripciones = [
-                i for i in inscripciones 
-                if i.get('estudiante_id') != student_sub and i.get('email') != email
-            ]
-            
-            if len(nuevas_inscripciones) != len(inscripciones):
-                # Actualizar el taller sin la inscripción del estudiante
-                table.update_item(
-                    Key={'PK': workshop['PK'], 'SK': 'METADATA'},
-                    UpdateExpression='SET inscripciones = :i',
-                    ExpressionAttributeValues={':i': nuevas_inscripciones}
-                )
+        # Se encola solo después del commit, así el worker lee GSI3 con el
+        # estudiante ya eliminado
+        estado = JOB_PENDING
+        mensaje = 'Estudiante eliminado; sus inscripciones se anulan en segundo plano'
+        try:
+            enqueue_job(table, cascade_queue, job)
+        except Exception as e:
+            print(f'Error encolando la cascada: {e}')
+            estado = JOB_FAILED
+            mensaje = 'Estudiante eliminado, pero no se pudo encolar la anulación de sus inscripciones'
         
         return {
-            'statusCode': 200,
+            'statusCode': 202,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
@@ -128,8 +113,10 @@ def handler(event, context):
                 'Access-Control-Allow-Methods': 'DELETE,OPTIONS'
             },
             'body': json.dumps({
-                'mensaje': 'Estudiante eliminado correctamente',
-                'email': email
+                'mensaje': mensaje,
+                'email': email,
+                'job': job['job_id'],
+                'estado': estado
             })
         }
         
@@ -0,0 +1,108 @@
+"""
+Lambda function para la cascada al eliminar un estudiante
+Triggered by: SQS (trabajos creados por DELETE /students/{id})
+
+Anula las inscripciones y las entradas en listas de espera del estudiante
+encontrándolas en GSI3 (índice estudiante -> talleres), sin recorrer la tabla.
+Cada anulación es una transacción condicionada, así que un reintento del
+trabajo no descuenta dos veces; se ejecutan en paralelo y el progreso se
+escribe en lotes.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from shared.registrations import REG_PREFIX, student_registrations, unregister_transaction, cancellation_reasons, condition_failed
+from shared.waitlist import WAIT_PREFIX, leave_waitlist_transaction
+from shared.jobs import parse_job, start_job, add_job_progress, finish_job
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+# Transacciones simultáneas por trabajo
+CASCADE_WORKERS = 8
+# Cada cuántos items se escribe el progreso del trabajo
+PROGRESS_EVERY = 25
+
+
+def student_entries(job):
+    """
+    Inscripciones (REG#) y esperas (WAIT#) del estudiante. Las inscripciones
+    antiguas pueden estar a nombre del email en vez del sub de Cognito.
+    """
+    entries = []
+    for student_id in dict.fromkeys(filter(None, (job['estudiante_id'], job.get('email')))):
+        entries.extend(student_registrations(table, student_id))
+        entries.extend(student_registrations(table, student_id, WAIT_PREFIX))
+    return entries
+
+
+def remove_entry(entry):
+    """
+    Anula una inscripción o saca de la lista de espera.
+    Devuelve True si escribió algo, False si ya no había nada que anular.
+    """
+    client = table.meta.client
+    workshop_id = entry['PK'].replace('WORKSHOP#', '')
+    if entry['SK'].startswith(WAIT_PREFIX):
+        transact_items = leave_waitlist_transaction(table, workshop_id, entry['SK'][len(WAIT_PREFIX):])
+    else:
+        transact_items = unregister_transaction(table, workshop_id, entry['SK'][len(REG_PREFIX):])
+    try:
+        client.transact_write_items(TransactItems=transact_items)
+    except client.exceptions.TransactionCanceledException as e:
+        reasons = cancellation_reasons(e)
+        if len(reasons) != 2:
+            raise
+        if condition_failed(reasons[0]):
+            # Ya se había anulado
+            return False
+        if condition_failed(reasons[1]):
+            # El taller ya no existe: solo queda el item huérfano
+            table.delete_item(Key={'PK': entry['PK'], 'SK': entry['SK']})
+            return True
+        raise
+    return True
+
+
+def run_cascade(job):
+    """Procesa un trabajo de eliminación; devuelve cuántos items anuló"""
+    entries = student_entries(job)
+    start_job(table, job['job_id'], len(entries))
+    
+    removed = 0
+    pending = {'procesados': 0, 'omitidos': 0}
+    with ThreadPoolExecutor(max_workers=CASCADE_WORKERS) as pool:
+        for position, written in enumerate(pool.map(remove_entry, entries), start=1):
+            if written:
+                removed += 1
+                pending['procesados'] += 1
+            else:
+                pending['omitidos'] += 1
+            if position % PROGRESS_EVERY == 0:
+                add_job_progress(table, job['job_id'], pending['procesados'], pending['omitidos'])
+                pending = {'procesados': 0, 'omitidos': 0}
+    add_job_progress(table, job['job_id'], pending['procesados'], pending['omitidos'])
+    
+    # Los cupos liberados se asignan desde el stream a quien esté esperando
+    finish_job(table, job['job_id'])
+    return removed
+
+
+def handler(event, context):
+    """
+    Procesa los trabajos del lote. Un trabajo que falla vuelve a la cola
+    (batchItemFailures) y se reintenta entero: lo ya anulado se omite.
+    """
+    failures = []
+    for record in event.get('Records', []):
+        job = parse_job(record)
+        try:
+            removed = run_cascade(job)
+            print(f"Trabajo {job['job_id']}: {removed} items anulados del estudiante {job['estudiante_id']}")
+        except Exception as e:
+            print(f"Error en el trabajo {job['job_id']}: {e}")
+            try:
+                finish_job(table, job['job_id'], error=str(e))
+            except Exception as finish_error:
+                print(f'Error marcando el trabajo: {finish_error}')
+            failures.append({'itemIdentifier': record['messageId']})
+    
+    return {'batchItemFailures': failures}
@@ -0,0 +1,63 @@
+"""
+Lambda function para consultar el progreso de un trabajo de estudiantes
+GET /students/jobs/{id} (requiere auth admin)
+"""
+import json
+from shared.jobs import job_key, public_job
+from shared.serialization import dumps
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+def handler(event, context):
+    """
+    Devuelve el estado de un trabajo (pendiente, en_curso, completado, error) y su avance
+    """
+    try:
+        # Verificar autorización
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+        role = claims.get('custom:role', '')
+        
+        if role != 'admin':
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Permisos de administrador requeridos'})
+            }
+        
+        # Extraer ID del trabajo
+        job_id = (event.get('pathParameters') or {}).get('id')
+        if not job_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'ID de trabajo requerido'})
+            }
+        
+        # Lectura consistente: el worker escribe el progreso mientras se consulta
+        response = table.get_item(Key=job_key(job_id), ConsistentRead=True)
+        item = response.get('Item')
+        if not item:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Trabajo no encontrado'})
+            }
+        
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Cache-Control': 'no-store',
+            },
+            'body': dumps(public_job(item))
+        }
+        
+    except Exception as e:
+        print(f'Error: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'mensaje': 'Error interno del servidor', 'error': str(e)})
+        }
@@ -3,16 +3,40 @@ Lambda function para listar estudiantes
 GET /students (requiere auth admin)
 """
 import json
-import os
-import boto3
-from boto3.dynamodb.conditions import Key
+from shared.pagination import encode_cursor, decode_cursor
+from shared.registrations import STUDENT_COUNTER
+from shared.compression import compress_response
+from shared.serialization import dumps
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+# Tamaño de página por defecto y máximo
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+
+def serialize_student(item):
+    """Convierte un item USER# en la respuesta pública del listado"""
+    # Usar el UUID del PK como _id para evitar problemas con @ en URLs
+    return {
+        '_id': item['PK'].replace('USER#', ''),
+        'email': item.get('email', ''),
+        'nombre': item.get('nombre', ''),
+        'apellido': item.get('apellido', ''),
+        'carnet': item.get('carnet', ''),
+        'carrera': item.get('carrera', ''),
+        'fecha_registro': item.get('creado_en', ''),
+        # Contador que mantiene el stream: sin lecturas extra por estudiante
+        'talleres_inscritos': max(int(item.get(STUDENT_COUNTER, 0)), 0),
+        'estado': item.get('estado', 'activo')
+    }
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
 
 def handler(event, context):
     """
-    Lista todos los estudiantes registrados (solo administradores)
+    Lista los estudiantes registrados (solo administradores), paginado por cursor
+    Query params: limit, cursor, order (desc = más recientes primero, por defecto; asc)
     """
     try:
         # Verificar autorización
@@ -29,67 +53,39 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'Permisos de administrador requeridos'})
             }
         
-        # Query para obtener todos los estudiantes
-        # Los estudiantes tienen PK=USER#{id} y SK=METADATA
-        response = table.scan(
-            FilterExpression='begins_with(PK, :pk) AND SK = :sk AND #role = :role',
-            ExpressionAttributeNames={
-                '#role': 'role'
-            },
-            ExpressionAttributeValues={
-                ':pk': 'USER#',
-                ':sk': 'METADATA',
-                ':role': 'student'
+        params = event.get('queryStringParameters') or {}
+        order = params.get('order', 'desc')
+        try:
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            start_key = decode_cursor(params.get('cursor', '').strip())
+            if order not in ('asc', 'desc'):
+                raise ValueError(order)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'mensaje': 'Parámetros de paginación inválidos'})
             }
-        )
         
-        students = []
-        for item in response.get('Items', []):
-            # Usar el UUID del PK como _id para evitar problemas con @ en URLs
-            user_id = item['PK'].replace('USER#', '')
-            student = {
-                '_id': user_id,
-                'email': item.get('email', ''),
-                'nombre': item.get('nombre', ''),
-                'apellido': item.get('apellido', ''),
-                'carnet': item.get('carnet', ''),
-                'carrera': item.get('carrera', ''),
-                'fecha_registro': item.get('creado_en', ''),
-                'talleres_inscritos': len(item.get('talleres', [])),
-                'estado': item.get('estado', 'activo')
-            }
-            students.append(student)
+        # Los estudiantes están en GSI1 (GSI1PK=USER#STUDENTS, GSI1SK=creado_en):
+        # una página es una Query ordenada por fecha de registro
+        from boto3.dynamodb.conditions import Key
+        query_kwargs = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': Key('GSI1PK').eq('USER#STUDENTS'),
+            'ScanIndexForward': order == 'asc',
+            'Limit': limit,
+        }
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = start_key
+        response = table.query(**query_kwargs)
         
-        # Paginar si hay más resultados
-        while 'LastEvaluatedKey' in response:
-            response = table.scan(
-                FilterExpression='begins_with(PK, :pk) AND SK = :sk AND #role = :role',
-                ExpressionAttributeNames={
-                    '#role': 'role'
-                },
-                ExpressionAttributeValues={
-                    ':pk': 'USER#',
-                    ':sk': 'METADATA',
-                    ':role': 'student'
-                },
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            for item in response.get('Items', []):
-                user_id = item['PK'].replace('USER#', '')
-                student = {
-                    '_id': user_id,
-                    'email': item.get('email', ''),
-                    'nombre': item.get('nombre', ''),
-                    'apellido': item.get('apellido', ''),
-                    'carnet': item.get('carnet', ''),
-                    'carrera': item.get('carrera', ''),
-                    'fecha_registro': item.get('creado_en', ''),
-                    'talleres_inscritos': len(item.get('talleres', [])),
-                    'estado': item.get('estado', 'activo')
-                }
-                students.append(student)
+        students = [serialize_student(item) for item in response.get('Items', [])]
         
-        return {
+        return compress_response(event, {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
@@ -97,11 +93,11 @@ def handler(event, context):
                 'Access-Control-Allow-Headers': 'Content-Type,Authorization',
                 'Access-Control-Allow-Methods': 'GET,OPTIONS'
             },
-            'body': json.dumps({
+            'body': dumps({
                 'students': students,
-                'total': len(students)
-            }, default=str)
-        }
+                'nextCursor': encode_cursor(response.get('LastEvaluatedKey'))
+            })
+        })
         
     except Exception as e:
         print(f'Error: {str(e)}')
@@ -3,11 +3,11 @@ Lambda function para obtener categorías de talleres
 GET /categories
 """
 import json
-import os
-import boto3
+from shared.stats import category_counts
+from shared.http import make_etag, etag_matches, not_modified_response, SHORT_CACHE_CONTROL
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+table = lazy_table()
 
 # Categorías predefinidas con sus metadatos
 CATEGORIES = [
@@ -67,37 +67,36 @@ def handler(event, context):
     Devuelve la lista de categorías disponibles
     """
     try:
-        # Obtener conteo de talleres por categoría
-        workshops_response = table.query(
-            IndexName='GSI1',
-            KeyConditionExpression='GSI1PK = :pk',
-            ExpressionAttributeValues={':pk': 'WORKSHOP#ALL'}
-        )
-        
-        workshops = workshops_response.get('Items', [])
-        
-        # Contar talleres por categoría
-        category_counts = {}
-        for workshop in workshops:
-            cat = workshop.get('categoria', 'other')
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        # Contadores por categoría que mantiene el stream (events/stream.py)
+        counts = category_counts(table, [cat['id'] for cat in CATEGORIES])
         
         # Agregar conteo a las categorías
         categories_with_count = []
         for cat in CATEGORIES:
             cat_copy = cat.copy()
-            cat_copy['cantidad'] = category_counts.get(cat['id'], 0)
+            item = counts.get(cat['id'], {})
+            cat_copy['cantidad'] = max(int(item.get('cantidad', 0)), 0)
+            cat_copy['cupos_disponibles'] = max(int(item.get('cupos_disponibles', 0)), 0)
             categories_with_count.append(cat_copy)
         
+        body = json.dumps(categories_with_count)
+        # Los contadores se actualizan después de la escritura (stream): el ETag
+        # se calcula sobre el cuerpo y no sobre la versión del catálogo
+        etag = make_etag(body)
+        if etag_matches(event, etag):
+            return not_modified_response(etag, SHORT_CACHE_CONTROL)
+        
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'GET,OPTIONS'
+                'Access-Control-Allow-Methods': 'GET,OPTIONS',
+                'ETag': etag,
+                'Cache-Control': SHORT_CACHE_CONTROL,
             },
-            'body': json.dumps(categories_with_count)
+            'body': body
         }
 
     except Exception as e:
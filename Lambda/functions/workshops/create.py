@@ -3,16 +3,19 @@ Lambda function para crear talleres
 POST /workshops (requiere auth admin)
 """
 import json
-import os
 import uuid
 from datetime import datetime
 from decimal import Decimal
-import boto3
+from shared.catalog import bump_catalog_version
+from shared.http import parse_json_body
+from shared.idempotency import idempotent
+from shared.serialization import dumps
+from shared.aws import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
-events = boto3.client('events')
+table = lazy_table()
+events = lazy_client('events')
 
+@idempotent('workshops.create')
 def handler(event, context):
     """
     Crea un nuevo taller (solo administradores)
@@ -30,7 +33,7 @@ def handler(event, context):
             }
         
         # Parsear body
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         
         # Validar campos requeridos
         required = ['nombre', 'descripcion', 'fecha', 'hora', 'lugar', 'categoria', 'tipo', 'cupo']
@@ -64,13 +67,16 @@ def handler(event, context):
             'instructor': body.get('instructor', ''),
             'rating': Decimal(str(body.get('rating', 0))),
             'cupo': int(body['cupo']),
+            # Admisión por turnos (ticket + cola) para talleres de alta demanda
+            'cola_inscripcion': bool(body.get('cola_inscripcion', False)),
             'creado_en': now,
             'actualizado_en': None,
-            'inscripciones': [],
+            'inscritos': 0,
         }
         
         # Guardar en DynamoDB
         table.put_item(Item=item)
+        bump_catalog_version(table)
         
         # Emitir evento a EventBridge
         try:
@@ -99,7 +105,7 @@ def handler(event, context):
         return {
             'statusCode': 201,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(taller, default=str)
+            'body': dumps(taller)
         }
         
     except Exception as e:
@@ -3,11 +3,12 @@ Lambda function para eliminar un taller
 DELETE /workshops/{id} (requiere auth admin)
 """
 import json
-import os
-import boto3
+from shared.catalog import bump_catalog_version
+from shared.registrations import delete_workshop_registrations
+from shared.waitlist import delete_workshop_waitlist
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+table = lazy_table()
 
 def handler(event, context):
     """
@@ -50,6 +51,15 @@ def handler(event, context):
         table.delete_item(
             Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'}
         )
+        bump_catalog_version(table)
+        
+        # Eliminar las inscripciones del taller (items REG#)
+        deleted = delete_workshop_registrations(table, workshop_id)
+        if deleted:
+            print(f'Inscripciones eliminadas del taller {workshop_id}: {deleted}')
+        waiting = delete_workshop_waitlist(table, workshop_id)
+        if waiting:
+            print(f'Lista de espera eliminada del taller {workshop_id}: {waiting}')
         
         return {
             'statusCode': 200,
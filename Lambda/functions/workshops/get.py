@@ -3,23 +3,18 @@ Lambda function para obtener un taller específico
 GET /workshops/{id}
 """
 import json
-import os
-from decimal import Decimal
-from boto3.dynamodb.conditions import Key
-import boto3
+from shared.projection import resolve_fields, projection_kwargs, serialize_workshop, content_version, VERSION_ATTRIBUTES
+from shared.registrations import list_registrations
+from shared.http import make_etag, etag_matches, not_modified_response, REVALIDATE_CACHE_CONTROL
+from shared.serialization import dumps
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
-
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+table = lazy_table()
 
 def handler(event, context):
     """
     Obtiene los detalles de un taller específico
+    Query params: view (summary|full), fields
     """
     try:
         # Extraer ID del path
@@ -35,12 +30,27 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'ID de taller requerido'})
             }
         
+        # Campos a devolver (view=summary|full o fields=a,b,c)
+        params = event.get('queryStringParameters') or {}
+        try:
+            fields = resolve_fields(params)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                },
+                'body': json.dumps({'mensaje': str(e)})
+            }
+        
         # Consultar DynamoDB
         response = table.get_item(
             Key={
                 'PK': f'WORKSHOP#{workshop_id}',
                 'SK': 'METADATA'
-            }
+            },
+            **projection_kwargs(fields, extra_attributes=VERSION_ATTRIBUTES)
         )
         
         item = response.get('Item')
@@ -55,36 +65,31 @@ def handler(event, context):
                 'body': json.dumps({'mensaje': 'Taller no encontrado'})
             }
         
-        # Serializar taller
-        inscripciones = item.get('inscripciones', [])
-        cupo = int(item.get('cupo', 0))
-        cupos_disponibles = max(cupo - len(inscripciones), 0)
+        # El ETag sale de la versión del item leído (actualizado_en e inscritos),
+        # así un 304 no serializa nada y una lectura atrasada lleva su propia versión
+        etag_parts = [content_version(item, fields)]
         
-        taller = {
-            '_id': workshop_id,
-            'nombre': item.get('nombre'),
-            'descripcion': item.get('descripcion'),
-            'fecha': item.get('fecha'),
-            'hora': item.get('hora'),
-            'lugar': item.get('lugar'),
-            'categoria': item.get('categoria'),
-            'tipo': item.get('tipo'),
-            'instructor': item.get('instructor', ''),
-            'rating': float(item.get('rating', 0)),
-            'cupo': cupo,
-            'cupos_disponibles': cupos_disponibles,
-            'creado_en': item.get('creado_en'),
-            'actualizado_en': item.get('actualizado_en'),
-            'inscripciones': inscripciones,
-        }
+        # La lista de inscritos vive en los items REG# del taller; cada uno
+        # se crea y se borra entero, así que su llave y fecha lo identifican
+        if 'inscripciones' in fields:
+            item['inscripciones'] = list_registrations(table, workshop_id)
+            etag_parts.extend(f"{r['estudiante_id']}@{r['registrado_en']}" for r in item['inscripciones'])
+        
+        etag = make_etag(','.join(fields), *etag_parts)
+        if etag_matches(event, etag):
+            return not_modified_response(etag, REVALIDATE_CACHE_CONTROL)
+        
+        body = dumps(serialize_workshop(item, fields))
         
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
+                'ETag': etag,
+                'Cache-Control': REVALIDATE_CACHE_CONTROL,
             },
-            'body': json.dumps(taller, cls=DecimalEncoder)
+            'body': body
         }
         
     except Exception as e:
@@ -4,24 +4,172 @@ GET /workshops
 # Force rebuild: 2024-12-14T19:00:00Z
 """
 import json
-import os
-from decimal import Decimal
-from boto3.dynamodb.conditions import Key, Attr
-import boto3
+from shared.pagination import encode_cursor, decode_cursor, item_key, query_scope
+from shared.search import FIELD_WEIGHTS, tokenize, search_workshops, matches_text
+from shared.projection import (
+    resolve_fields, metadata_fields, projection_kwargs, serialize_workshop, content_version,
+    COUNTER_FIELDS, VERSION_ATTRIBUTES,
+)
+from shared.catalog import load_catalog, batch_get_workshops, overlay_counters
+from shared.http import make_etag, etag_matches, not_modified_response, REVALIDATE_CACHE_CONTROL
+from shared.compression import compress_response
+from shared.serialization import dumps
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+table = lazy_table()
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# Límites de paginación
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+# Presupuesto de lectura: máximo de páginas del índice por request
+MAX_QUERY_PAGES = 10
+# Sufijo para incluir todas las horas del día en el límite superior (SK = fecha#hora)
+END_OF_DAY_SUFFIX = '#\uffff'
+
+def plan_query(categoria, fecha_desde, fecha_hasta, text=''):
+    """
+    Elige el índice y el rango de llave más ajustado según los filtros:
+    - categoria -> GSI2 (GSI2PK = CATEGORY#<cat>)
+    - sin categoria -> GSI1 (GSI1PK = WORKSHOP#ALL)
+    - fechaDesde/fechaHasta -> condición sobre el SK (fecha#hora ordena lexicográficamente)
+    - text -> filtro por subcadena sobre los items leídos (q sin términos indexados)
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    if categoria:
+        index_name, pk_attr, sk_attr = 'GSI2', 'GSI2PK', 'GSI2SK'
+        pk_value = f'CATEGORY#{categoria}'
+    else:
+        index_name, pk_attr, sk_attr = 'GSI1', 'GSI1PK', 'GSI1SK'
+        pk_value = 'WORKSHOP#ALL'
+    
+    sk_low = fecha_desde or None
+    sk_high = fecha_hasta + END_OF_DAY_SUFFIX if fecha_hasta else None
+    
+    key_condition = Key(pk_attr).eq(pk_value)
+    if sk_low and sk_high:
+        key_condition &= Key(sk_attr).between(sk_low, sk_high)
+    elif sk_low:
+        key_condition &= Key(sk_attr).gte(sk_low)
+    elif sk_high:
+        key_condition &= Key(sk_attr).lte(sk_high)
+    
+    return {
+        'IndexName': index_name,
+        'KeyConditionExpression': key_condition,
+        'key_attributes': ('PK', 'SK', pk_attr, sk_attr),
+        'pk_attr': pk_attr,
+        'pk_value': pk_value,
+        'sk_attr': sk_attr,
+        'sk_low': sk_low,
+        'sk_high': sk_high,
+        'text': text,
+    }
+
+
+def cached_page(catalog, plan, limit, start_key):
+    """
+    Resuelve el plan sobre el catálogo en memoria, con el mismo orden
+    (SK del índice) y el mismo formato de cursor que la consulta a DynamoDB
+    """
+    sk_attr = plan['sk_attr']
+    
+    def sort_key(item):
+        return (item.get(sk_attr, ''), item['PK'])
+    
+    candidates = sorted(
+        (
+            item for item in catalog
+            if item.get(plan['pk_attr']) == plan['pk_value']
+            and (not plan['sk_low'] or item.get(sk_attr, '') >= plan['sk_low'])
+            and (not plan['sk_high'] or item.get(sk_attr, '') <= plan['sk_high'])
+            and (not plan['text'] or matches_text(item, plan['text']))
+        ),
+        key=sort_key
+    )
+    if start_key:
+        after = (start_key.get(sk_attr, ''), start_key.get('PK', ''))
+        candidates = [item for item in candidates if sort_key(item) > after]
+    
+    page = candidates[:limit]
+    next_key = item_key(page[-1], plan['key_attributes']) if len(candidates) > limit else None
+    return page, next_key
+
+
+def query_workshops(plan, limit, start_key, fields):
+    """
+    Lee páginas del índice elegido por el planner hasta juntar `limit` talleres
+    o agotar el presupuesto de lectura.
+    Devuelve (items, next_key); next_key es None si no hay más resultados.
+    """
+    matched = []
+    next_key = start_key
+    for _ in range(MAX_QUERY_PAGES):
+        query_kwargs = {
+            'IndexName': plan['IndexName'],
+            'KeyConditionExpression': plan['KeyConditionExpression'],
+            'Limit': limit,
+            **projection_kwargs(fields, plan['key_attributes'], VERSION_ATTRIBUTES + (tuple(FIELD_WEIGHTS) if plan['text'] else ())),
+        }
+        if next_key:
+            query_kwargs['ExclusiveStartKey'] = next_key
+        response = table.query(**query_kwargs)
+        
+        items = response.get('Items', [])
+        last_key = response.get('LastEvaluatedKey')
+        
+        for index, item in enumerate(items):
+            if plan['text'] and not matches_text(item, plan['text']):
+                continue
+            matched.append(item)
+            if len(matched) >= limit:
+                # Si quedan items sin revisar, el cursor apunta al último devuelto
+                if index < len(items) - 1 or last_key:
+                    return matched, item_key(item, plan['key_attributes'])
+                return matched, None
+        
+        if not last_key:
+            return matched, None
+        next_key = last_key
+    
+    # Presupuesto agotado: el cliente puede continuar con el cursor
+    return matched, next_key
+
+
+def get_workshops_by_id(workshop_ids, fields, catalog=None):
+    """
+    Obtiene talleres respetando el orden recibido: del catálogo en memoria
+    si está disponible, si no con BatchGetItem
+    """
+    if catalog is not None:
+        wanted = set(workshop_ids)
+        found = {
+            item['PK'].replace('WORKSHOP#', ''): item for item in catalog
+            if item['PK'].replace('WORKSHOP#', '') in wanted
+        }
+        return [found[workshop_id] for workshop_id in workshop_ids if workshop_id in found]
+    
+    found = batch_get_workshops(table, workshop_ids, fields, VERSION_ATTRIBUTES)
+    return [found[workshop_id] for workshop_id in workshop_ids if workshop_id in found]
+
+
+def search_page(q, limit, start_key, fields, catalog, categoria, fecha_desde, fecha_hasta):
+    """
+    Resuelve q (con términos buscables) con el índice invertido; el cursor
+    guarda el offset en el ranking
+    """
+    ranked = search_workshops(table, q, categoria, fecha_desde, fecha_hasta)
+    
+    offset_value = (start_key or {}).get('offset', '0')
+    offset = int(offset_value) if offset_value.isdigit() else 0
+    page_ids = ranked[offset:offset + limit]
+    next_key = {'offset': str(offset + limit)} if offset + limit < len(ranked) else None
+    return get_workshops_by_id(page_ids, fields, catalog), next_key
 
 def handler(event, context):
     """
     Lista talleres con filtros opcionales
-    Query params: q, categoria, fechaDesde, fechaHasta, limit
+    Query params: q, categoria, fechaDesde, fechaHasta, limit, cursor, view, fields
     """
     try:
         # Extraer parámetros de query
@@ -30,71 +178,86 @@ def handler(event, context):
         categoria = params.get('categoria', '').strip()
         fecha_desde = params.get('fechaDesde', '').strip()
         fecha_hasta = params.get('fechaHasta', '').strip()
-        limit = int(params.get('limit', 50))
+        cursor = params.get('cursor', '').strip()
         
-        # Consulta base: todos los talleres
-        # Usando GSI1 para obtener todos los talleres ordenados por fecha
-        response = table.query(
-            IndexName='GSI1',
-            KeyConditionExpression=Key('GSI1PK').eq('WORKSHOP#ALL'),
-            Limit=limit
-        )
+        # Con q buscable se pagina sobre el ranking (offset); si no, sobre el
+        # índice (LastEvaluatedKey). El cursor lleva el modo y la consulta:
+        # el de otra búsqueda o filtro se rechaza en vez de llegar a DynamoDB
+        mode = 'search' if tokenize(q) else 'index'
+        scope = query_scope(mode, q, categoria, fecha_desde, fecha_hasta)
         
-        items = response.get('Items', [])
+        try:
+            limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            start_key = decode_cursor(cursor, scope)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                },
+                'body': json.dumps({'mensaje': 'Parámetros de paginación inválidos'})
+            }
+        
+        # Campos a devolver (view=summary|full o fields=a,b,c); los listados
+        # no incluyen la lista de inscritos, solo GET /workshops/{id}
+        try:
+            fields = metadata_fields(resolve_fields(params))
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                },
+                'body': json.dumps({'mensaje': str(e)})
+            }
         
-        # Filtros adicionales (en memoria)
-        if categoria:
-            items = [item for item in items if item.get('categoria') == categoria]
+        # Catálogo cacheado en el contenedor (None si es demasiado grande para cachear)
+        catalog = load_catalog(table)
         
-        if fecha_desde:
-            items = [item for item in items if item.get('fecha', '') >= fecha_desde]
+        # Con q se usa el índice de búsqueda; sin q, categoría y fechas van en la condición de llave
+        if mode == 'search':
+            page = search_page(q, limit, start_key, fields, catalog, categoria, fecha_desde, fecha_hasta)
+        else:
+            # Un q sin términos buscables (solo stopwords o una letra) se filtra por subcadena
+            plan = plan_query(categoria, fecha_desde, fecha_hasta, q)
+            if catalog is not None:
+                page = cached_page(catalog, plan, limit, start_key)
+            else:
+                page = query_workshops(plan, limit, start_key, fields)
+        items, next_key = page
         
-        if fecha_hasta:
-            items = [item for item in items if item.get('fecha', '') <= fecha_hasta]
+        # El catálogo en memoria no se recarga con cada inscripción: los
+        # contadores de la página se leen del item METADATA
+        if catalog is not None and any(field in fields for field in COUNTER_FIELDS):
+            items = overlay_counters(table, items)
         
-        if q:
-            q_lower = q.lower()
-            items = [
-                item for item in items
-                if q_lower in item.get('nombre', '').lower()
-                or q_lower in item.get('descripcion', '').lower()
-                or q_lower in item.get('lugar', '').lower()
-            ]
+        # El ETag sale de la versión de cada taller devuelto (no de la versión del
+        # catálogo): una lectura atrasada de GSI1 queda etiquetada con sus propias
+        # versiones, y un 304 se responde sin serializar ni comprimir
+        next_cursor = encode_cursor(next_key, scope)
+        etag = make_etag(','.join(fields), next_cursor, *(content_version(item, fields) for item in items))
+        if etag_matches(event, etag):
+            return not_modified_response(etag, REVALIDATE_CACHE_CONTROL)
         
         # Serializar talleres
-        talleres = []
-        for item in items:
-            inscripciones = item.get('inscripciones', [])
-            cupo = int(item.get('cupo', 0))
-            cupos_disponibles = max(cupo - len(inscripciones), 0)
-            
-            taller = {
-                '_id': item['PK'].replace('WORKSHOP#', ''),
-                'nombre': item.get('nombre'),
-                'descripcion': item.get('descripcion'),
-                'fecha': item.get('fecha'),
-                'hora': item.get('hora'),
-                'lugar': item.get('lugar'),
-                'categoria': item.get('categoria'),
-                'tipo': item.get('tipo'),
-                'instructor': item.get('instructor', ''),
-                'rating': float(item.get('rating', 0)),
-                'cupo': cupo,
-                'cupos_disponibles': cupos_disponibles,
-                'creado_en': item.get('creado_en'),
-                'actualizado_en': item.get('actualizado_en'),
-                'inscripciones': inscripciones,
-            }
-            talleres.append(taller)
+        talleres = [serialize_workshop(item, fields) for item in items]
+        body = dumps({
+            'workshops': talleres,
+            'nextCursor': next_cursor,
+        })
         
-        return {
+        return compress_response(event, {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
+                'ETag': etag,
+                'Cache-Control': REVALIDATE_CACHE_CONTROL,
             },
-            'body': json.dumps(talleres, cls=DecimalEncoder)
-        }
+            'body': body
+        })
         
     except Exception as e:
         print(f'Error: {str(e)}')
@@ -0,0 +1,96 @@
+"""
+Lambda function para la evolución de inscripciones y ocupación
+GET /stats/history?from=&to=&granularity= (requiere auth admin)
+"""
+import json
+from datetime import datetime, timedelta
+from shared.metrics import HOURLY, DAILY, GRANULARITIES, query_buckets, public_bucket
+from shared.serialization import dumps
+from shared.aws import lazy_table
+
+table = lazy_table()
+
+# Rango máximo por granularidad (días)
+MAX_RANGE_DAYS = {HOURLY: 31, DAILY: 366}
+# Rango por defecto si no se indica `from` (días)
+DEFAULT_RANGE_DAYS = {HOURLY: 1, DAILY: 30}
+
+
+def parse_date(value):
+    """Fecha yyyy-mm-dd o None si no es válida"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def handler(event, context):
+    """
+    Devuelve los buckets por hora o por día del rango pedido (solo administradores).
+    Los períodos sin actividad no aparecen.
+    """
+    try:
+        # Verificar autorización
+        claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+        role = claims.get('custom:role', '')
+        
+        if role != 'admin':
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'Permisos de administrador requeridos'})
+            }
+        
+        params = event.get('queryStringParameters') or {}
+        granularity = params.get('granularity') or DAILY
+        if granularity not in GRANULARITIES:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': f'granularity debe ser uno de: {", ".join(GRANULARITIES)}'})
+            }
+        
+        # Fechas en UTC, igual que los buckets
+        hasta = parse_date(params['to']) if params.get('to') else datetime.utcnow().date()
+        desde = parse_date(params['from']) if params.get('from') else None
+        if hasta is not None and not params.get('from'):
+            desde = hasta - timedelta(days=DEFAULT_RANGE_DAYS[granularity] - 1)
+        if desde is None or hasta is None or desde > hasta:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': 'from y to deben ser fechas yyyy-mm-dd con from <= to'})
+            }
+        if (hasta - desde).days + 1 > MAX_RANGE_DAYS[granularity]:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'mensaje': f'El rango máximo para granularity={granularity} es de {MAX_RANGE_DAYS[granularity]} días'})
+            }
+        
+        # Una sola Query sobre GSI1 (paginada si supera 1 MB)
+        items = query_buckets(table, granularity, desde.isoformat(), hasta.isoformat())
+        
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+                'Access-Control-Allow-Methods': 'GET,OPTIONS'
+            },
+            'body': dumps({
+                'granularity': granularity,
+                'from': desde.isoformat(),
+                'to': hasta.isoformat(),
+                'buckets': [public_bucket(item) for item in items]
+            })
+        }
+        
+    except Exception as e:
+        print(f'Error: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'mensaje': 'Error interno del servidor', 'error': str(e)})
+        }
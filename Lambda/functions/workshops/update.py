@@ -3,13 +3,33 @@ Lambda function para actualizar un taller
 PUT /workshops/{id} (requiere auth admin)
 """
 import json
-import os
 from datetime import datetime
 from decimal import Decimal
-import boto3
+from shared.catalog import bump_catalog_version
+from shared.projection import registration_count
+from shared.http import parse_json_body
+from shared.serialization import dumps
+from shared.aws import lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['TABLE_NAME'])
+table = lazy_table()
+
+
+def deserialize(image):
+    """Convierte un item en formato DynamoDB (ALL_OLD de un fallo) a dict"""
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    return {k: deserializer.deserialize(v) for k, v in (image or {}).items()}
+
+
+def cupo_error(inscritos):
+    """Respuesta 400 para un cupo menor a los inscritos actuales"""
+    return {
+        'statusCode': 400,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps({
+            'mensaje': f'El cupo no puede ser menor a los inscritos actuales ({inscritos})'
+        })
+    }
 
 def handler(event, context):
     """
@@ -37,7 +57,7 @@ def handler(event, context):
             }
         
         # Parsear body
-        body = json.loads(event.get('body', '{}'))
+        body = parse_json_body(event)
         
         # Obtener taller actual
         response = table.get_item(
@@ -59,25 +79,20 @@ def handler(event, context):
         expr_names = {}
         
         # Campos permitidos
-        allowed_fields = ['nombre', 'descripcion', 'fecha', 'hora', 'lugar', 'categoria', 'tipo', 'instructor', 'rating', 'cupo']
+        allowed_fields = ['nombre', 'descripcion', 'fecha', 'hora', 'lugar', 'categoria', 'tipo', 'instructor', 'rating', 'cupo', 'cola_inscripcion']
         
         # Primero, procesar campos normales
         for field in allowed_fields:
             if field in body:
                 if field == 'cupo':
                     new_cupo = int(body[field])
-                    inscripciones_count = len(item.get('inscripciones', []))
-                    if new_cupo < inscripciones_count:
-                        return {
-                            'statusCode': 400,
-                            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                            'body': json.dumps({
-                                'mensaje': f'El cupo no puede ser menor a los inscritos actuales ({inscripciones_count})'
-                            })
-                        }
+                    if new_cupo < registration_count(item):
+                        return cupo_error(registration_count(item))
                     expr_values[f':{field}'] = new_cupo
                 elif field == 'rating':
                     expr_values[f':{field}'] = Decimal(str(body[field]))
+                elif field == 'cola_inscripcion':
+                    expr_values[f':{field}'] = bool(body[field])
                 else:
                     expr_values[f':{field}'] = body[field]
                 
@@ -100,12 +115,24 @@ def handler(event, context):
             update_expr += ', GSI2PK = :gsi2pk'
         
         # Actualizar en DynamoDB
-        table.update_item(
-            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
-            UpdateExpression=update_expr,
-            ExpressionAttributeValues=expr_values,
-            ExpressionAttributeNames=expr_names if expr_names else None
-        )
+        update_kwargs = {
+            'Key': {'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            'UpdateExpression': update_expr,
+            'ExpressionAttributeValues': expr_values,
+        }
+        if expr_names:
+            update_kwargs['ExpressionAttributeNames'] = expr_names
+        if 'cupo' in body:
+            # Una inscripción puede entrar entre la lectura y la escritura:
+            # el contador se vuelve a comprobar en la misma escritura
+            update_kwargs['ConditionExpression'] = 'attribute_not_exists(inscritos) OR inscritos <= :cupo'
+            update_kwargs['ReturnValuesOnConditionCheckFailure'] = 'ALL_OLD'
+        try:
+            table.update_item(**update_kwargs)
+        except table.meta.client.exceptions.ConditionalCheckFailedException as e:
+            current = deserialize(e.response.get('Item')) or item
+            return cupo_error(registration_count(current))
+        bump_catalog_version(table)
         
         # Obtener taller actualizado
         response = table.get_item(
@@ -113,19 +140,18 @@ def handler(event, context):
         )
         
         updated_item = response['Item']
-        inscripciones = updated_item.get('inscripciones', [])
         cupo = int(updated_item.get('cupo', 0))
         
         taller = {
             '_id': workshop_id,
             **{k: v for k, v in updated_item.items() if k not in ['PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK']},
-            'cupos_disponibles': max(cupo - len(inscripciones), 0),
+            'cupos_disponibles': max(cupo - registration_count(updated_item), 0),
         }
         
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps(taller, default=str)
+            'body': dumps(taller)
         }
         
     except Exception as e:
@@ -39,6 +39,7 @@ export default function GestionEstudiantes() {
   const [lista, setLista] = useState<Estudiante[]>([]) //lista de estudiantes obtenidos de la API (inicia vacía).
   const [q, setQ] = useState('') //cadena de búsqueda query (inicia vacía).
   const [cargando, setCargando] = useState(true) //bandera de estado para mostrar “Cargando…”. 
+  const [siguiente, setSiguiente] = useState<string | null>(null) //cursor de la página siguiente (null si no hay más).
   const [verificado, setVerificado] = useState(false) //verificación de permisos de admin
   const token = obtenerTokenAdmin() //revisa si el admin está logueado.
   const router = useRouter() //navegación redigirida /cambiar de página (ej: redirigir al login)..
@@ -69,19 +70,24 @@ export default function GestionEstudiantes() {
   Muestra estado de cargando.
   Llama a la API /students con un parámetro de búsqueda opcional.
   Actualiza el estado lista con los estudiantes obtenidos.
+  Con cursor agrega la página siguiente a la lista en vez de reemplazarla.
   En caso de error, muestra un toast de error.
 */
-  async function cargar() {
+  async function cargar(cursor?: string) {
     setCargando(true) //Inicializa la función para el ususario.
     try {
       //Si hay algo escrito en el buscador (q), lo mete en una cajita especial (params) para pedir estudiantes específicos.
-      const params = q ? `?q=${encodeURIComponent(q)}` : '' 
+      const params = new URLSearchParams()
+      if (q) params.set('q', q)
+      if (cursor) params.set('cursor', cursor)
+      const query = params.toString() ? `?${params.toString()}` : ''
       //Hace solicitud al backend con el parametro del estudiante y el token del admin
-      const data = await apiFetch(`/students${params}`, { token })
+      const data = await apiFetch(`/students${query}`, { token })
       //Si todo sale bien, coloca los estudiantes recibidos (data) en la nueva lista.
-      // La API devuelve { students: [...], total: N }, extraemos el array
+      // La API devuelve { students: [...], nextCursor }, extraemos el array
       const estudiantes = Array.isArray(data) ? data : (data?.students || [])
-      setLista(estudiantes)
+      setLista(prev => cursor ? [...prev, ...estudiantes] : estudiantes)
+      setSiguiente(data?.nextCursor || null)
     } catch (e: any) {
       toast({
         title: 'Error',
@@ -105,10 +111,11 @@ export default function GestionEstudiantes() {
     if (!confirm('¿Eliminar estudiante y sus inscripciones?')) return
     try {
       //Llama al backend para borrar, tomando el id del estudiante y verificando el token del admin
-      await apiFetch(`/students/${id}`, { metodo: 'DELETE', token })
+      //Las inscripciones del estudiante se anulan en segundo plano (la respuesta trae el trabajo)
+      const respuesta = await apiFetch(`/students/${id}`, { metodo: 'DELETE', token })
       //Actualiza la lista LOCAL, borrando al estudiante que coincida con el id (sin recargar la página)
       setLista(prev => prev.filter(x => x._id !== id))
-      toast({ title: 'Estudiante eliminado', description: 'La acción se realizó correctamente.' })
+      toast({ title: 'Estudiante eliminado', description: respuesta?.mensaje || 'La acción se realizó correctamente.' })
       //Manejo de errores
     } catch (e: any) {
       toast({
@@ -171,7 +178,7 @@ export default function GestionEstudiantes() {
               <Button
                 className="bg-gradient-to-r from-purple-600 to-indigo-600"
                 type="button"
-                onClick={cargar}
+                onClick={() => cargar()}
                 disabled={cargando}
               >
                 Buscar
@@ -197,7 +204,7 @@ export default function GestionEstudiantes() {
             <CardDescription className="text-white/80">{lista.length} resultados</CardDescription>
           </CardHeader>
           <CardContent>
-            {cargando ? (
+            {cargando && lista.length === 0 ? (
               <p className="text-sm text-white/80">Cargando...</p>
             ) : lista.length === 0 ? (
               <p className="text-sm text-white/80">Sin resultados.</p>
@@ -208,6 +215,7 @@ export default function GestionEstudiantes() {
                     <div>
                       <div className="font-medium text-white">{e.nombre}</div>
                       <div className="text-sm text-white/80">{e.email}</div>
+                      <div className="text-xs text-white/60">{e.talleres_inscritos ?? 0} talleres inscritos</div>
                     </div>
                     <Button
                       variant="destructive"
@@ -221,6 +229,17 @@ export default function GestionEstudiantes() {
                 ))}
               </ul>
             )}
+            {siguiente && (
+              <Button
+                className="mt-4"
+                variant="outline"
+                type="button"
+                onClick={() => cargar(siguiente)}
+                disabled={cargando}
+              >
+                {cargando ? 'Cargando...' : 'Cargar más'}
+              </Button>
+            )}
           </CardContent>
         </Card>
         
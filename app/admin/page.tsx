@@ -60,7 +60,7 @@ export default function PanelAdmin() {
 
   async function crearTaller(valores: any) {
     try {
-      const creado = await apiFetch("/workshops", { metodo: "POST", cuerpo: valores, token })
+      const creado = await apiFetch("/workshops", { metodo: "POST", cuerpo: valores, token, idempotente: true })
       setTalleres(prev => [creado, ...prev])
       setAbiertoCrear(false)
       toast({ title: "Taller creado", description: "El taller se ha registrado correctamente." })
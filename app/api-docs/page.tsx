@@ -116,7 +116,7 @@ const endpoints = [
         path: "/registrations/mine",
         descripcion: "Ver mis inscripciones",
         auth: true,
-        response: { inscripciones: [{ taller_id: "...", fecha_inscripcion: "..." }] }
+        response: { talleres: [{ _id: "...", mi_inscripcion: { registrado_en: "..." } }], nextCursor: "..." }
       }
     ]
   },
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react"
 import type { Taller } from "@/types"
-import { apiFetch, obtenerTokenEstudiante } from "@/lib/api"
+import { apiFetch, obtenerMisRegistros, obtenerTokenEstudiante } from "@/lib/api"
 import { useRouter } from "next/navigation"
 import { Card, CardContent, CardHeader } from "@/components/shared/ui/card"
 import { Button } from "@/components/shared/ui/button"
@@ -51,8 +51,7 @@ export default function MisRegistros() {
   async function cargar() {
     setCargando(true)
     try {
-      const data = await apiFetch("/registrations/me", { token })
-      setTalleres(data)
+      setTalleres(await obtenerMisRegistros(token))
     } catch (e: any) {
       toast({ title: "Error", description: e.message, variant: "destructive" })
     } finally {
@@ -273,7 +273,14 @@ export default function RegistroEstudiante() {
       const data = await apiFetch("/auth/estudiantes/registro", {
         metodo: "POST",
         cuerpo: { nombre, email, contrasena },
+        idempotente: true,
       })
+      // Sin token (auto-login fallido o reintento de un registro ya hecho): hay que iniciar sesión
+      if (!data?.token) {
+        toast({ title: "¡Cuenta creada!", description: data?.mensaje || "Por favor inicia sesión." })
+        router.push(`/estudiantes/login?next=${encodeURIComponent(next)}`)
+        return
+      }
       guardarTokenEstudiante(data.token)
       toast({ title: "¡Cuenta creada!", description: "Bienvenido a SkillsForge. Ya puedes inscribirte a talleres." })
       router.push(next)
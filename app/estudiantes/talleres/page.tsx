@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react"
 import type { Taller } from "@/types"
-import { apiFetch, obtenerTokenEstudiante } from "@/lib/api"
+import { apiFetch, inscribirEnTaller, obtenerMisRegistros, obtenerTokenEstudiante } from "@/lib/api"
 import { useToast } from "@/lib/hooks/use-toast"
 import { Badge } from "@/components/shared/ui/badge"
 import { BotonInscripcion } from "@/components/workshops/boton-inscripcion"
@@ -39,7 +39,7 @@ export default function PaginaTalleres() {
 
   async function cargar() {
     setCargando(true)
-    const qs = new URLSearchParams()
+    const qs = new URLSearchParams({ view: "summary" })
     if (filtros.q) qs.set("q", filtros.q)
     if (filtros.categoria) qs.set("categoria", filtros.categoria)
 
@@ -59,7 +59,7 @@ export default function PaginaTalleres() {
           setUserEmail('')
         }
         try {
-          const registros = await apiFetch("/registrations/me", { token: studentToken })
+          const registros = await obtenerMisRegistros(studentToken)
           setMisRegistros(registros.map((r: Taller) => r._id))
         } catch {
           // No pasa nada si falla, solo no mostramos registros
@@ -110,10 +110,16 @@ export default function PaginaTalleres() {
             misRegistros={misRegistros}
             onInscribir={async (tallerId) => {
               try {
-                await apiFetch(`/workshops/${tallerId}/register`, { metodo: "POST", token })
-                setMisRegistros(prev => [...prev, tallerId])
-                toast({ title: "¡Inscrito!", description: "Te has inscrito correctamente al taller" })
-                cargar() // Recargar para actualizar cupos
+                const resultado = await inscribirEnTaller(tallerId, token)
+                if (resultado.estado === "en_espera") {
+                  toast({ title: "Lista de espera", description: `El taller está lleno. Quedaste en la posición ${resultado.posicion}.` })
+                } else if (resultado.estado === "pendiente") {
+                  toast({ title: "Inscripción en cola", description: "Tu turno aún se está procesando. Revisa Mis registros en unos minutos." })
+                } else {
+                  setMisRegistros(prev => [...prev, tallerId])
+                  toast({ title: "¡Inscrito!", description: "Te has inscrito correctamente al taller" })
+                  cargar() // Recargar para actualizar cupos
+                }
               } catch (e: any) {
                 toast({ title: "Error", description: e.message, variant: "destructive" })
               }
@@ -129,8 +135,9 @@ export default function PaginaTalleres() {
             <div className="grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
               {talleres.map((t) => {
                 // Es popular si tiene más inscripciones que el promedio
-                const avgInscripciones = talleres.reduce((acc, x) => acc + (x.inscripciones?.length || 0), 0) / talleres.length;
-                const isPopular = (t.inscripciones?.length || 0) > avgInscripciones && (t.inscripciones?.length || 0) >= 2;
+                const avgInscripciones = talleres.reduce((acc, x) => acc + (x.inscritos ?? x.inscripciones?.length ?? 0), 0) / talleres.length;
+                const inscritos = t.inscritos ?? t.inscripciones?.length ?? 0;
+                const isPopular = inscritos > avgInscripciones && inscritos >= 2;
 
                 return (
                   <div
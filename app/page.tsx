@@ -587,13 +587,16 @@ export default function Landing() {
                   <CodeBlock
                     label="Admin"
                     code={`POST ${API_BASE_URL}/auth/login
-Body: { "usuario": "admin", "contrasena": "admin123" }`}
+Body: { "usuario": "admin", "contrasena": "admin123" }
+GET  ${API_BASE_URL}/stats/history?from=2025-01-01&to=2025-01-31&granularity=day`}
                   />
                   <CodeBlock
                     label="Estudiantes"
                     code={`POST ${API_BASE_URL}/auth/estudiantes/registro
 POST ${API_BASE_URL}/auth/estudiantes/login
 GET  ${API_BASE_URL}/registrations/me
+POST ${API_BASE_URL}/registrations/batch
+GET  ${API_BASE_URL}/registrations/tickets/{id}
 POST ${API_BASE_URL}/workshops/{id}/register
 DELETE ${API_BASE_URL}/workshops/{id}/register`}
                   />
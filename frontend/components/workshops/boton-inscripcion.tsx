@@ -3,7 +3,7 @@
 import { useState } from "react"
 import { Button } from "@/components/shared/ui/button"
 import { useToast } from "@/lib/hooks/use-toast"
-import { apiFetch, obtenerTokenEstudiante } from "@/lib/api"
+import { apiFetch, inscribirEnTaller, obtenerTokenEstudiante } from "@/lib/api"
 import type { Taller } from "@/types"
 import { UserPlus, CheckCircle2 } from "lucide-react"
 import { useRouter } from "next/navigation"
@@ -48,9 +48,16 @@ export function BotonInscripcion({
         onRegistrado({ ...taller, cupos_disponibles: (taller.cupos_disponibles || 0) + 1 })
         toast({ title: "Inscripción anulada", description: "Has anulado tu inscripción al taller." })
       } else {
-        const actualizado = await apiFetch(`/workshops/${taller._id}/register`, { metodo: "POST", token })
-        onRegistrado(actualizado)
-        toast({ title: "Inscripción confirmada", description: "Te has inscrito al taller." })
+        const resultado = await inscribirEnTaller(taller._id, token)
+        if (resultado.estado === "en_espera") {
+          toast({ title: "Lista de espera", description: `El taller está lleno. Quedaste en la posición ${resultado.posicion}.` })
+        } else if (resultado.estado === "pendiente") {
+          toast({ title: "Inscripción en cola", description: "Tu turno aún se está procesando. Revisa Mis registros en unos minutos." })
+        } else {
+          // La respuesta no trae el taller completo: se descuenta el cupo localmente
+          onRegistrado({ ...taller, ...resultado.taller, cupos_disponibles: Math.max((taller.cupos_disponibles || 0) - 1, 0) })
+          toast({ title: "Inscripción confirmada", description: "Te has inscrito al taller." })
+        }
       }
     } catch (e: any) {
       toast({ title: yaRegistrado ? "No se pudo anular" : "No se pudo inscribir", description: e.message, variant: "destructive" })
@@ -13,10 +13,17 @@ type Opciones = {
   token?: string | null
   // Headers extra
   headers?: Record<string, string>
+  // Manda un Idempotency-Key (el mismo en todos los reintentos) para que repetir no duplique
+  idempotente?: boolean
 }
 
 // Hace peticiones a la API con reintentos, manejo de 401, rate limiting, etc.
 export async function apiFetch(ruta: string, opciones: Opciones = {}, intento: number = 0): Promise<any> {
+  // La clave se genera una sola vez: los reintentos de abajo reciben estas mismas opciones
+  if (opciones.idempotente && !opciones.headers?.["Idempotency-Key"]) {
+    opciones = { ...opciones, headers: { ...opciones.headers, "Idempotency-Key": nuevaClaveIdempotencia() } }
+  }
+
   const {
     metodo = "GET",
     cuerpo,
@@ -80,6 +87,12 @@ export async function apiFetch(ruta: string, opciones: Opciones = {}, intento: n
     return apiFetch(ruta, opciones, intento + 1)
   }
 
+  // Petición idempotente que el servidor aún está procesando: esperamos su respuesta
+  if (res.status === 409 && opciones.idempotente && res.headers.get("Retry-After") && intento < 3) {
+    await esperar(1000 * (parseInt(res.headers.get("Retry-After") || "1", 10) || 1))
+    return apiFetch(ruta, opciones, intento + 1)
+  }
+
   // Si el token expiró (401), intentamos refrescarlo
   if (res.status === 401) {
     const mensaje = (parsed?.mensaje || parsed?.message || "").toLowerCase()
@@ -180,6 +193,49 @@ function esperar(ms: number) {
   return new Promise(r => setTimeout(r, ms))
 }
 
+// Clave aleatoria para el header Idempotency-Key
+function nuevaClaveIdempotencia(): string {
+  if (typeof crypto !== "undefined" && typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID()
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+}
+
+// Consulta un ticket de inscripción (talleres con cola) hasta que se procese
+export async function esperarTicket(ticket: string, token: string, intervaloMs: number = 1500, maxIntentos: number = 40): Promise<any> {
+  for (let i = 0; i < maxIntentos; i++) {
+    const resultado = await apiFetch(`/registrations/tickets/${ticket}`, { token })
+    if (resultado?.estado !== "pendiente") return resultado
+    await esperar(intervaloMs)
+  }
+  return { ticket, estado: "pendiente" }
+}
+
+// Talleres en los que está inscrito el estudiante (sigue nextCursor hasta la última página)
+export async function obtenerMisRegistros(token: string | null): Promise<any[]> {
+  const talleres: any[] = []
+  let cursor: string | null = null
+  do {
+    const ruta: string = cursor ? `/registrations/me?cursor=${encodeURIComponent(cursor)}` : "/registrations/me"
+    const pagina = await apiFetch(ruta, { token })
+    talleres.push(...(pagina?.talleres || []))
+    cursor = pagina?.nextCursor || null
+  } while (cursor)
+  return talleres
+}
+
+// Inscribe en un taller y resume la respuesta en un estado:
+// "inscrito" (con el _id y la inscripción), "en_espera" (con posición) o "pendiente" (ticket aún en cola)
+export async function inscribirEnTaller(tallerId: string, token: string): Promise<{ estado: string; taller?: any; posicion?: number }> {
+  const respuesta = await apiFetch(`/workshops/${tallerId}/register`, { metodo: "POST", token, idempotente: true })
+  if (respuesta?.posicion !== undefined) return { estado: "en_espera", posicion: respuesta.posicion }
+  if (!respuesta?.ticket) return { estado: "inscrito", taller: respuesta }
+  // Taller de alta demanda: la inscripción se procesa por turnos
+  const ticket = await esperarTicket(respuesta.ticket, token)
+  if (ticket.estado === "rechazado") throw new Error(ticket.mensaje || "No se pudo inscribir")
+  return { estado: ticket.estado, posicion: ticket.posicion }
+}
+
 // Decodifica un JWT y devuelve el payload
 export function decodificarToken(token: string): Record<string, any> | null {
   try {
@@ -353,6 +409,14 @@ export async function obtenerStatsPublicas() {
   return apiFetch("/stats")
 }
 
+// Evolución de inscripciones y ocupación (admin); fechas yyyy-mm-dd en UTC
+export async function obtenerHistorialStats(token: string, desde?: string, hasta?: string, granularidad: "day" | "hour" = "day") {
+  const params = new URLSearchParams({ granularity: granularidad })
+  if (desde) params.set("from", desde)
+  if (hasta) params.set("to", hasta)
+  return apiFetch(`/stats/history?${params.toString()}`, { token })
+}
+
 // Lista de categorías
 export async function obtenerCategorias() {
   return apiFetch("/categories")
@@ -22,8 +22,10 @@ export type Taller = {
   rating?: number // 0-5 estrellas
   cupo: number // Máximo de gente
   cupos_disponibles?: number // Lugares libres
+  inscritos?: number // Cuánta gente se inscribió
   creado_en?: string | null
   actualizado_en?: string | null
+  cola_inscripcion?: boolean // Inscripción por turnos (alta demanda)
   inscripciones?: Inscripcion[] // Gente inscrita
 }
 
@@ -33,4 +35,5 @@ export type Estudiante = {
   nombre: string // Nombre completo
   email: string // Correo
   creado_en?: string // Cuándo se registró
+  talleres_inscritos?: number // Inscripciones activas
 }
\ No newline at end of file
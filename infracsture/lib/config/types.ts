@@ -31,6 +31,8 @@ export interface EnvironmentConfig {
     memorySize: number;
     reservedConcurrentExecutions?: number;
     tracing: boolean;
+    /** 'per-function' (por defecto) o 'lambdalith': una sola Lambda (router.handler) para toda la API */
+    deploymentMode?: 'per-function' | 'lambdalith';
   };
 
   /** Configuración de API Gateway */
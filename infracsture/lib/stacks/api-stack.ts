@@ -7,6 +7,8 @@ import * as logs from 'aws-cdk-lib/aws-logs';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import * as codedeploy from 'aws-cdk-lib/aws-codedeploy';
 import * as cloudwatch from 'aws-cdk-lib/aws-cloudwatch';
+import * as sqs from 'aws-cdk-lib/aws-sqs';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
 import { Construct } from 'constructs';
 import { EnvironmentConfig } from '../config/types';
 import * as path from 'path';
@@ -36,6 +38,38 @@ export class ApiStack extends cdk.Stack {
       description: 'Common dependencies for Lambda functions',
     });
 
+    // Cola de admisión para talleres de alta demanda (cola_inscripcion):
+    // FIFO con un grupo de mensajes por taller para respetar el orden de llegada
+    const admissionDlq = new sqs.Queue(this, 'AdmissionDLQ', {
+      queueName: `${config.resourcePrefix}-admission-dlq.fifo`,
+      fifo: true,
+      retentionPeriod: cdk.Duration.days(14),
+    });
+    const admissionQueue = new sqs.Queue(this, 'AdmissionQueue', {
+      queueName: `${config.resourcePrefix}-admission.fifo`,
+      fifo: true,
+      visibilityTimeout: cdk.Duration.seconds(60),
+      deadLetterQueue: {
+        queue: admissionDlq,
+        maxReceiveCount: 5,
+      },
+    });
+
+    // Cola de trabajos para la cascada al eliminar estudiantes (estándar: el orden no importa)
+    const studentCascadeDlq = new sqs.Queue(this, 'StudentCascadeDLQ', {
+      queueName: `${config.resourcePrefix}-student-cascade-dlq`,
+      retentionPeriod: cdk.Duration.days(14),
+    });
+    const studentCascadeQueue = new sqs.Queue(this, 'StudentCascadeQueue', {
+      queueName: `${config.resourcePrefix}-student-cascade`,
+      // Al menos el timeout del worker (5 min) para que un trabajo en curso no se entregue dos veces
+      visibilityTimeout: cdk.Duration.minutes(30),
+      deadLetterQueue: {
+        queue: studentCascadeDlq,
+        maxReceiveCount: 3,
+      },
+    });
+
     // Variables de entorno comunes
     const commonEnv = {
       TABLE_NAME: table.tableName,
@@ -44,10 +78,12 @@ export class ApiStack extends cdk.Stack {
       ENVIRONMENT: config.environment,
       LOG_LEVEL: 'INFO',
       POWERTOOLS_SERVICE_NAME: 'SkillsForge',
+      ADMISSION_QUEUE_URL: admissionQueue.queueUrl,
+      STUDENT_CASCADE_QUEUE_URL: studentCascadeQueue.queueUrl,
     };
 
     // Función helper para crear Lambdas con blue/green deployment
-    const createLambda = (name: string, handler: string, description: string) => {
+    const createFunction = (name: string, handler: string, description: string) => {
       const fn = new lambda.Function(this, name, {
         functionName: `${config.resourcePrefix}-${name}`,
         runtime: lambda.Runtime.PYTHON_3_11,
@@ -103,6 +139,18 @@ export class ApiStack extends cdk.Stack {
       return fn;
     };
 
+    // En modo lambdalith todas las rutas comparten una Lambda (router.handler),
+    // que acumula los permisos que se agregan a cada "función"
+    const lambdalith = config.lambda.deploymentMode === 'lambdalith';
+    let routerLambda: lambda.Function | undefined;
+    const createLambda = (name: string, handler: string, description: string) => {
+      if (lambdalith) {
+        routerLambda = routerLambda ?? createFunction('Router', 'router.handler', 'Single-router API (lambdalith)');
+        return routerLambda;
+      }
+      return createFunction(name, handler, description);
+    };
+
     // Lambda para endpoint raíz
     const rootLambda = createLambda('Root', 'root.handler', 'API root info');
 
@@ -120,12 +168,67 @@ export class ApiStack extends cdk.Stack {
     
     // Lambdas de estadísticas y categorías
     const statsLambda = createLambda('Stats', 'workshops/stats.handler', 'Platform statistics');
+    const statsHistoryLambda = createLambda('StatsHistory', 'workshops/stats_history.handler', 'Registration and occupancy history');
     const categoriesLambda = createLambda('Categories', 'workshops/categories.handler', 'Workshop categories');
 
     // Lambdas de inscripciones
     const registerStudentLambda = createLambda('RegisterStudent', 'registrations/register.handler', 'Register to workshop');
     const unregisterStudentLambda = createLambda('UnregisterStudent', 'registrations/unregister.handler', 'Unregister from workshop');
     const listMyRegistrationsLambda = createLambda('ListMyRegistrations', 'registrations/list_mine.handler', 'List my registrations');
+    const batchRegisterLambda = createLambda('BatchRegister', 'registrations/batch.handler', 'Register to several workshops');
+    const registrationTicketLambda = createLambda('RegistrationTicket', 'registrations/ticket.handler', 'Registration ticket status');
+    admissionQueue.grantSendMessages(registerStudentLambda);
+    admissionQueue.grantSendMessages(batchRegisterLambda);
+
+    // Consumidor único de la cola de admisión: concurrencia reservada 1 y lotes
+    // pequeños fijan el ritmo de escrituras sobre el item del taller
+    const admissionWorkerLambda = new lambda.Function(this, 'AdmissionWorker', {
+      functionName: `${config.resourcePrefix}-AdmissionWorker`,
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: 'registrations/admission_worker.handler',
+      code: lambda.Code.fromAsset(path.join(__dirname, '../../../backend-services/functions')),
+      timeout: cdk.Duration.seconds(30),
+      memorySize: config.lambda.memorySize,
+      environment: commonEnv,
+      layers: [commonLayer],
+      reservedConcurrentExecutions: 1,
+      logRetention: logs.RetentionDays.ONE_WEEK,
+      description: 'Drain admission tickets into registrations',
+    });
+    table.grantReadWriteData(admissionWorkerLambda);
+    admissionWorkerLambda.addEventSource(new lambdaEventSources.SqsEventSource(admissionQueue, {
+      batchSize: 10,
+      reportBatchItemFailures: true,
+    }));
+
+    // Lambdas de estudiantes (admin)
+    const listStudentsLambda = createLambda('ListStudents', 'students/list.handler', 'List students');
+    const deleteStudentLambda = createLambda('DeleteStudent', 'students/delete.handler', 'Delete student');
+    const studentJobLambda = createLambda('StudentJob', 'students/job.handler', 'Student job status');
+    studentCascadeQueue.grantSendMessages(deleteStudentLambda);
+    deleteStudentLambda.addToRolePolicy(new iam.PolicyStatement({
+      actions: ['cognito-idp:AdminDeleteUser'],
+      resources: [userPool.userPoolArn],
+    }));
+
+    // Worker de la cascada: un trabajo por invocación, transacciones en paralelo dentro del trabajo
+    const studentCascadeWorkerLambda = new lambda.Function(this, 'StudentCascadeWorker', {
+      functionName: `${config.resourcePrefix}-StudentCascadeWorker`,
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: 'students/delete_worker.handler',
+      code: lambda.Code.fromAsset(path.join(__dirname, '../../../backend-services/functions')),
+      timeout: cdk.Duration.minutes(5),
+      memorySize: config.lambda.memorySize,
+      environment: commonEnv,
+      layers: [commonLayer],
+      logRetention: logs.RetentionDays.ONE_WEEK,
+      description: 'Cancel registrations of deleted students',
+    });
+    table.grantReadWriteData(studentCascadeWorkerLambda);
+    studentCascadeWorkerLambda.addEventSource(new lambdaEventSources.SqsEventSource(studentCascadeQueue, {
+      batchSize: 1,
+      reportBatchItemFailures: true,
+    }));
 
     // Lambda de Asistente IA con Bedrock
     const aiAssistantLambda = createLambda('AIAssistant', 'ai/assistant.handler', 'AI Assistant powered by Bedrock');
@@ -154,10 +257,19 @@ export class ApiStack extends cdk.Stack {
       }));
     });
 
+    // El registro deshace el usuario de Cognito si el email ya se tomó en DynamoDB
+    registerLambda.addToRolePolicy(new iam.PolicyStatement({
+      actions: ['cognito-idp:AdminDeleteUser'],
+      resources: [userPool.userPoolArn],
+    }));
+
     // API Gateway
     this.api = new apigateway.RestApi(this, 'Api', {
       restApiName: `${config.resourcePrefix}-API`,
       description: 'SkillsForge REST API',
+      // Las Lambdas devuelven cuerpos gzip/br en base64 (isBase64Encoded);
+      // API Gateway solo los decodifica si el tipo está en binaryMediaTypes
+      binaryMediaTypes: ['*/*'],
       deployOptions: {
         stageName: config.environment,
         tracingEnabled: config.lambda.tracing,
@@ -170,9 +282,9 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
-        exposeHeaders: ['Content-Type', 'X-Amzn-RequestId'],
+        exposeHeaders: ['Content-Type', 'X-Amzn-RequestId', 'Idempotent-Replayed', 'Retry-After'],
         maxAge: cdk.Duration.days(1),
       },
     });
@@ -227,7 +339,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -238,7 +350,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -248,7 +360,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -262,7 +374,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -276,7 +388,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -294,7 +406,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -312,7 +424,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -320,24 +432,58 @@ export class ApiStack extends cdk.Stack {
       authorizer,
       authorizationType: apigateway.AuthorizationType.COGNITO,
     });
+    registrations.addResource('batch').addMethod('POST', new apigateway.LambdaIntegration(batchRegisterLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
+    registrations.addResource('tickets').addResource('{id}').addMethod('GET', new apigateway.LambdaIntegration(registrationTicketLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
 
     // Endpoint de estadísticas (público)
     const stats = this.api.root.addResource('stats', {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
     stats.addMethod('GET', new apigateway.LambdaIntegration(statsLambda));
+    stats.addResource('history').addMethod('GET', new apigateway.LambdaIntegration(statsHistoryLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
+
+    // Endpoints de estudiantes (admin)
+    const students = this.api.root.addResource('students', {
+      defaultCorsPreflightOptions: {
+        allowOrigins: apigateway.Cors.ALL_ORIGINS,
+        allowMethods: apigateway.Cors.ALL_METHODS,
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
+        allowCredentials: true,
+      },
+    });
+    students.addMethod('GET', new apigateway.LambdaIntegration(listStudentsLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
+    students.addResource('{id}').addMethod('DELETE', new apigateway.LambdaIntegration(deleteStudentLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
+    students.addResource('jobs').addResource('{id}').addMethod('GET', new apigateway.LambdaIntegration(studentJobLambda), {
+      authorizer,
+      authorizationType: apigateway.AuthorizationType.COGNITO,
+    });
 
     // Endpoint de categorías (público)
     const categories = this.api.root.addResource('categories', {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -348,7 +494,7 @@ export class ApiStack extends cdk.Stack {
       defaultCorsPreflightOptions: {
         allowOrigins: apigateway.Cors.ALL_ORIGINS,
         allowMethods: apigateway.Cors.ALL_METHODS,
-        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token'],
+        allowHeaders: ['Content-Type', 'Authorization', 'X-Amz-Date', 'X-Api-Key', 'X-Amz-Security-Token', 'Idempotency-Key'],
         allowCredentials: true,
       },
     });
@@ -357,6 +503,15 @@ export class ApiStack extends cdk.Stack {
       authorizationType: apigateway.AuthorizationType.COGNITO,
     });
 
+    // binaryMediaTypes */* también aplica a las integraciones MOCK que genera
+    // defaultCorsPreflightOptions: sin contentHandling API Gateway puede omitir
+    // su plantilla de request y el preflight OPTIONS responde 500
+    this.api.methods
+      .filter(method => method.httpMethod === 'OPTIONS')
+      .forEach(method => {
+        (method.node.defaultChild as apigateway.CfnMethod).addPropertyOverride('Integration.ContentHandling', 'CONVERT_TO_TEXT');
+      });
+
     this.apiUrl = this.api.url;
 
     // Outputs
@@ -4,6 +4,7 @@ import * as targets from 'aws-cdk-lib/aws-events-targets';
 import * as sns from 'aws-cdk-lib/aws-sns';
 import * as subs from 'aws-cdk-lib/aws-sns-subscriptions';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
 import * as logs from 'aws-cdk-lib/aws-logs';
 import * as sqs from 'aws-cdk-lib/aws-sqs';
@@ -82,6 +83,26 @@ export class EventsStack extends cdk.Stack {
       targets: [new targets.LambdaFunction(eventProcessorLambda)],
     });
 
+    // Regla: STUDENT_UNREGISTERED
+    new events.Rule(this, 'StudentUnregisteredRule', {
+      eventBus: this.eventBus,
+      eventPattern: {
+        source: ['skillsforge.registrations'],
+        detailType: ['STUDENT_UNREGISTERED'],
+      },
+      targets: [new targets.LambdaFunction(eventProcessorLambda)],
+    });
+
+    // Regla: STUDENT_PROMOTED (lista de espera, emitido desde el stream)
+    new events.Rule(this, 'StudentPromotedRule', {
+      eventBus: this.eventBus,
+      eventPattern: {
+        source: ['skillsforge.registrations'],
+        detailType: ['STUDENT_PROMOTED'],
+      },
+      targets: [new targets.LambdaFunction(eventProcessorLambda)],
+    });
+
     // Dead Letter Queue (DLQ) para eventos fallidos
     const dlq = new sqs.Queue(this, 'EventDLQ', {
       queueName: `${config.resourcePrefix}-EventDLQ`,
@@ -101,6 +122,38 @@ export class EventsStack extends cdk.Stack {
     // Enviar alarma DLQ al SNS topic
     dlqAlarm.addAlarmAction(new actions.SnsAction(this.notificationTopic));
 
+    // Lambda que consume el stream de DynamoDB (índice de búsqueda y proyecciones)
+    const streamProcessorLambda = new lambda.Function(this, 'StreamProcessor', {
+      functionName: `${config.resourcePrefix}-StreamProcessor`,
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: 'events/stream.handler',
+      code: lambda.Code.fromAsset(path.join(__dirname, '../../../backend-services/functions')),
+      timeout: cdk.Duration.seconds(60),
+      environment: {
+        TABLE_NAME: table.tableName,
+        ENVIRONMENT: config.environment,
+        // STUDENT_PROMOTED debe llegar al bus de las reglas
+        EVENT_BUS_NAME: this.eventBus.eventBusName,
+      },
+      logRetention: logs.RetentionDays.ONE_WEEK,
+      description: 'Maintain derived items from the DynamoDB stream',
+    });
+
+    table.grantReadWriteData(streamProcessorLambda);
+    this.eventBus.grantPutEventsTo(streamProcessorLambda);
+
+    // El handler reporta el primer registro sin aplicar (batchItemFailures) y
+    // Lambda reintenta desde ahí. Sin bisección: un reintento siempre empieza en
+    // el inicio de un grupo de contadores, que es lo que su marcador reconoce
+    streamProcessorLambda.addEventSource(new lambdaEventSources.DynamoEventSource(table, {
+      startingPosition: lambda.StartingPosition.TRIM_HORIZON,
+      batchSize: 100,
+      bisectBatchOnError: false,
+      reportBatchItemFailures: true,
+      retryAttempts: 3,
+      onFailure: new lambdaEventSources.SqsDlq(dlq),
+    }));
+
     // Lambda para recordatorios de talleres
     const reminderLambda = new lambda.Function(this, 'ReminderLambda', {
       functionName: `${config.resourcePrefix}-WorkshopReminder`,
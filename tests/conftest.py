@@ -0,0 +1,168 @@
+"""
+Fixtures compartidas: una tabla DynamoDB en memoria (moto) con el mismo
+esquema de llaves e índices que la tabla de la aplicación (data-stack.ts)
+"""
+import json
+import os
+from unittest.mock import MagicMock
+
+import itertools
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_aws
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('TABLE_NAME', 'skillsforge-test')
+
+from shared import aws, catalog
+
+INDEXES = ('GSI1', 'GSI2', 'GSI3')
+
+
+def clear_clients():
+    aws.get_client.cache_clear()
+    aws.get_resource.cache_clear()
+    aws.get_table.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def empty_catalog_cache():
+    """El caché del catálogo vive en el módulo: cada test empieza sin él"""
+    catalog._cache.update(version=None, loaded_at=0.0, workshops=None)
+    yield
+    catalog._cache.update(version=None, loaded_at=0.0, workshops=None)
+
+
+@pytest.fixture
+def table():
+    """Tabla vacía por test; los clientes cacheados de shared.aws se recrean dentro del mock"""
+    with mock_aws():
+        clear_clients()
+        key_attributes = ['PK', 'SK'] + [f'{index}{part}' for index in INDEXES for part in ('PK', 'SK')]
+        boto3.client('dynamodb').create_table(
+            TableName=os.environ['TABLE_NAME'],
+            KeySchema=[
+                {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+            ],
+            AttributeDefinitions=[{'AttributeName': name, 'AttributeType': 'S'} for name in key_attributes],
+            GlobalSecondaryIndexes=[{
+                'IndexName': index,
+                'KeySchema': [
+                    {'AttributeName': f'{index}PK', 'KeyType': 'HASH'},
+                    {'AttributeName': f'{index}SK', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            } for index in INDEXES],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        yield aws.get_table()
+        clear_clients()
+
+
+@pytest.fixture
+def use_table(table, monkeypatch):
+    """
+    Apunta un módulo de handler a la tabla del test; su cliente de
+    EventBridge (si tiene) se reemplaza por un MagicMock
+    """
+    def use(module):
+        monkeypatch.setattr(module, 'table', table)
+        if hasattr(module, 'events'):
+            monkeypatch.setattr(module, 'events', MagicMock())
+        return module
+    return use
+
+
+@pytest.fixture
+def put_workshop(table):
+    """Crea el item METADATA de un taller con sus llaves de GSI1 y GSI2"""
+    def put(workshop_id, cupo, fecha='2025-01-15', hora='10:00', categoria='tecnologia', **attributes):
+        item = {
+            'PK': f'WORKSHOP#{workshop_id}',
+            'SK': 'METADATA',
+            'GSI1PK': 'WORKSHOP#ALL',
+            'GSI1SK': f'{fecha}#{hora}',
+            'GSI2PK': f'CATEGORY#{categoria}',
+            'GSI2SK': f'{fecha}#{hora}',
+            'nombre': f'Taller {workshop_id}',
+            'descripcion': '',
+            'lugar': 'Aula 1',
+            'fecha': fecha,
+            'hora': hora,
+            'categoria': categoria,
+            'cupo': cupo,
+            **attributes,
+        }
+        table.put_item(Item=item)
+        return item
+    return put
+
+
+@pytest.fixture
+def get_workshop(table):
+    """Item METADATA de un taller con lectura consistente"""
+    def get(workshop_id):
+        return table.get_item(
+            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            ConsistentRead=True
+        ).get('Item')
+    return get
+
+
+@pytest.fixture
+def api_event():
+    """Evento de API Gateway (proxy) con los claims del Cognito Authorizer"""
+    def build(role=None, sub='s1', path=None, query=None, body=None, headers=None, **claims):
+        event = {
+            'headers': headers or {},
+            'pathParameters': path,
+            'queryStringParameters': query,
+            'body': json.dumps(body) if body is not None else None,
+        }
+        if role is not None:
+            event['requestContext'] = {'authorizer': {'claims': {
+                'custom:role': role,
+                'sub': sub,
+                'name': f'Estudiante {sub}',
+                'email': f'{sub}@example.com',
+                **claims,
+            }}}
+        return event
+    return build
+
+
+@pytest.fixture
+def stream_record():
+    """
+    Registro del stream de DynamoDB (NEW_AND_OLD_IMAGES) para el cambio de un
+    item; los SequenceNumber crecen en el orden en que se construyen
+    """
+    serializer = TypeSerializer()
+    sequence = itertools.count(1000)
+    
+    def image(item):
+        return {k: serializer.serialize(v) for k, v in item.items()}
+    
+    def build(old=None, new=None, timestamp=1733050800):
+        item = new or old
+        number = next(sequence)
+        change = {
+            'Keys': image({'PK': item['PK'], 'SK': item['SK']}),
+            'SequenceNumber': str(number),
+            'ApproximateCreationDateTime': timestamp,
+        }
+        if old:
+            change['OldImage'] = image(old)
+        if new:
+            change['NewImage'] = image(new)
+        return {
+            'eventID': f'event-{number}',
+            'eventName': 'INSERT' if not old else 'REMOVE' if not new else 'MODIFY',
+            'dynamodb': change,
+        }
+    return build
@@ -0,0 +1,153 @@
+"""
+Admisión por turnos: tickets encolados en LocalTicketQueue y procesados por
+registrations/admission_worker.py
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from registrations import admission_worker
+from shared.admission import (
+    LocalTicketQueue, issue_ticket, ticket_key,
+    TICKET_PENDING, TICKET_REGISTERED, TICKET_WAITLISTED, TICKET_REJECTED,
+)
+from shared.registrations import registration_key
+from shared.waitlist import waitlist_items
+
+
+@pytest.fixture
+def worker_table(use_table):
+    return use_table(admission_worker).table
+
+
+@pytest.fixture
+def queue():
+    return LocalTicketQueue()
+
+
+def enqueue(table, queue, workshop_id, student_id):
+    return issue_ticket(table, queue, workshop_id, {
+        'estudiante_id': student_id,
+        'nombre': f'Estudiante {student_id}',
+        'email': f'{student_id}@example.com',
+        'registrado_en': '2024-12-01T10:00:00',
+    })
+
+
+def ticket_state(table, ticket):
+    return table.get_item(Key=ticket_key(ticket['ticket_id']), ConsistentRead=True)['Item']
+
+
+def test_issue_ticket_stores_pending_ticket(worker_table, queue):
+    ticket = enqueue(worker_table, queue, 'w1', 's1')
+    
+    assert ticket_state(worker_table, ticket)['estado'] == TICKET_PENDING
+    assert len(queue.messages) == 1
+
+
+def test_issue_ticket_removes_ticket_when_send_fails(worker_table):
+    broken = MagicMock()
+    broken.send.side_effect = RuntimeError('cola no disponible')
+    
+    with pytest.raises(RuntimeError):
+        enqueue(worker_table, broken, 'w1', 's1')
+    
+    assert worker_table.scan()['Items'] == []
+
+
+def test_drain_admits_in_order_until_full(worker_table, queue, put_workshop, get_workshop):
+    put_workshop('w1', 2)
+    tickets = [enqueue(worker_table, queue, 'w1', student_id) for student_id in ('s1', 's2', 's3', 's4')]
+    
+    result = admission_worker.handler(queue.drain(), None)
+    
+    assert result == {'batchItemFailures': []}
+    assert not queue.messages
+    states = [ticket_state(worker_table, ticket) for ticket in tickets]
+    assert [state['estado'] for state in states] == [TICKET_REGISTERED, TICKET_REGISTERED, TICKET_WAITLISTED, TICKET_WAITLISTED]
+    assert [state.get('posicion') for state in states[2:]] == [1, 2]
+    assert get_workshop('w1')['inscritos'] == 2
+    assert get_workshop('w1')['en_espera'] == 2
+    assert [item['estudiante_id'] for item in waitlist_items(worker_table, 'w1')] == ['s3', 's4']
+    entries = admission_worker.events.put_events.call_args.kwargs['Entries']
+    assert [entry['DetailType'] for entry in entries] == ['STUDENT_REGISTERED'] * 2
+
+
+def test_drain_respects_batch_size(worker_table, queue, put_workshop, get_workshop):
+    put_workshop('w1', -1)
+    for index in range(12):
+        enqueue(worker_table, queue, 'w1', f's{index}')
+    
+    admission_worker.handler(queue.drain(), None)
+    assert get_workshop('w1')['inscritos'] == 10
+    
+    admission_worker.handler(queue.drain(), None)
+    assert get_workshop('w1')['inscritos'] == 12
+
+
+def test_rejected_tickets_are_closed(worker_table, queue, put_workshop):
+    put_workshop('w1', 5)
+    first = enqueue(worker_table, queue, 'w1', 's1')
+    duplicate = enqueue(worker_table, queue, 'w1', 's1')
+    missing = enqueue(worker_table, queue, 'no-existe', 's2')
+    
+    admission_worker.handler(queue.drain(), None)
+    
+    assert ticket_state(worker_table, first)['estado'] == TICKET_REGISTERED
+    assert ticket_state(worker_table, duplicate)['estado'] == TICKET_REJECTED
+    assert ticket_state(worker_table, duplicate)['mensaje'] == 'Ya estás inscrito en este taller'
+    assert ticket_state(worker_table, missing)['estado'] == TICKET_REJECTED
+    assert ticket_state(worker_table, missing)['mensaje'] == 'Taller no encontrado'
+
+
+def test_redelivered_batch_is_not_applied_twice(worker_table, queue, put_workshop, get_workshop):
+    put_workshop('w1', 5)
+    ticket = enqueue(worker_table, queue, 'w1', 's1')
+    records = queue.drain()
+    
+    admission_worker.handler(records, None)
+    admission_worker.handler(records, None)
+    
+    assert get_workshop('w1')['inscritos'] == 1
+    assert ticket_state(worker_table, ticket)['estado'] == TICKET_REGISTERED
+
+
+def test_admit_on_closed_ticket_writes_nothing(worker_table, queue, put_workshop, get_workshop):
+    """Dos entregas que pasan ticket_pending a la vez: la segunda transacción no aplica"""
+    put_workshop('w1', 5)
+    ticket = enqueue(worker_table, queue, 'w1', 's1')
+    
+    assert admission_worker.admit(ticket)['estado'] == TICKET_REGISTERED
+    worker_table.delete_item(Key=registration_key('w1', 's1'))
+    
+    assert admission_worker.admit(ticket) is None
+    assert get_workshop('w1')['inscritos'] == 1
+    assert 'Item' not in worker_table.get_item(Key=registration_key('w1', 's1'))
+
+
+def test_failure_returns_ticket_and_followers_to_queue(worker_table, queue, put_workshop, monkeypatch):
+    put_workshop('w1', 5)
+    tickets = [enqueue(worker_table, queue, 'w1', student_id) for student_id in ('s1', 's2', 's3')]
+    records = queue.drain()
+    admit = admission_worker.admit
+    
+    def flaky_admit(ticket):
+        if ticket['ticket_id'] == tickets[1]['ticket_id']:
+            raise RuntimeError('throttling')
+        return admit(ticket)
+    
+    monkeypatch.setattr(admission_worker, 'admit', flaky_admit)
+    result = admission_worker.handler(records, None)
+    
+    assert result['batchItemFailures'] == [{'itemIdentifier': record['messageId']} for record in records['Records'][1:]]
+    assert [ticket_state(worker_table, ticket)['estado'] for ticket in tickets] == [TICKET_REGISTERED, TICKET_PENDING, TICKET_PENDING]
+
+
+def test_worker_admits_into_queued_workshop(worker_table, queue, put_workshop, get_workshop):
+    put_workshop('w1', 5, cola_inscripcion=True)
+    ticket = enqueue(worker_table, queue, 'w1', 's1')
+    
+    admission_worker.handler(queue.drain(), None)
+    
+    assert ticket_state(worker_table, ticket)['estado'] == TICKET_REGISTERED
+    assert get_workshop('w1')['inscritos'] == 1
@@ -0,0 +1,57 @@
+"""
+auth/register.py: fallos de la transacción USER# + EMAIL# tras crear el
+usuario en Cognito
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from auth import register
+from shared.users import email_item, email_key
+
+
+@pytest.fixture
+def cognito(use_table, monkeypatch):
+    use_table(register)
+    client = MagicMock()
+    client.sign_up.return_value = {'UserSub': 'u1'}
+    client.admin_initiate_auth.return_value = {
+        'AuthenticationResult': {'IdToken': 'id-token', 'RefreshToken': 'refresh-token'}
+    }
+    monkeypatch.setattr(register, 'cognito', client)
+    # El email se toma entre la verificación previa y la transacción
+    monkeypatch.setattr(register, 'email_taken', lambda table, email: False)
+    return client
+
+
+def signup(api_event):
+    return api_event(body={'nombre': 'Ana', 'email': 'ana@example.com', 'contrasena': 'Segura#123'})
+
+
+def test_creates_user(cognito, table, api_event):
+    response = register.handler(signup(api_event), None)
+    
+    assert response['statusCode'] == 201
+    assert 'Item' in table.get_item(Key={'PK': 'USER#u1', 'SK': 'METADATA'})
+    cognito.admin_delete_user.assert_not_called()
+
+
+def test_email_taken_in_between_is_conflict(cognito, table, api_event):
+    table.put_item(Item=email_item('ana@example.com', 'otro', '2024-12-01T10:00:00'))
+    
+    response = register.handler(signup(api_event), None)
+    
+    assert response['statusCode'] == 409
+    assert json.loads(response['body'])['mensaje'] == 'El email ya está registrado'
+    cognito.admin_delete_user.assert_called_once()
+
+
+def test_other_cancellation_is_not_reported_as_duplicate(cognito, table, api_event):
+    table.put_item(Item={'PK': 'USER#u1', 'SK': 'METADATA', 'email': 'viejo@example.com'})
+    
+    response = register.handler(signup(api_event), None)
+    
+    assert response['statusCode'] == 500
+    cognito.admin_delete_user.assert_called_once()
+    assert 'Item' not in table.get_item(Key=email_key('ana@example.com'))
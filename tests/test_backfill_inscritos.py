@@ -0,0 +1,69 @@
+"""
+maintenance/backfill_inscritos.py: el contador sale de los items REG#
+"""
+import json
+
+import pytest
+
+from maintenance import backfill_inscritos
+from shared.registrations import registration_item
+
+
+@pytest.fixture
+def backfill(use_table):
+    return use_table(backfill_inscritos).handler
+
+
+def add_registrations(table, workshop_id, *student_ids):
+    for student_id in student_ids:
+        table.put_item(Item=registration_item(workshop_id, {
+            'estudiante_id': student_id, 'nombre': '', 'email': '', 'registrado_en': '2024-12-01T10:00:00',
+        }))
+
+
+def test_counts_registration_items(backfill, table, put_workshop, get_workshop):
+    put_workshop('desviado', 10, inscritos=5)
+    put_workshop('sin_contador', 10)
+    put_workshop('correcto', 10, inscritos=2)
+    add_registrations(table, 'desviado', 's1', 's2')
+    add_registrations(table, 'sin_contador', 's1')
+    add_registrations(table, 'correcto', 's1', 's2')
+    
+    body = json.loads(backfill({}, None)['body'])
+    
+    assert body == {'actualizados': 2, 'omitidos': []}
+    assert get_workshop('desviado')['inscritos'] == 2
+    assert get_workshop('sin_contador')['inscritos'] == 1
+    assert get_workshop('correcto')['inscritos'] == 2
+
+
+def test_migrated_workshop_keeps_its_count(backfill, table, put_workshop, get_workshop):
+    """Sin la lista `inscripciones` (ya migrada) el contador no vuelve a cero"""
+    put_workshop('w1', 10, inscritos=3)
+    add_registrations(table, 'w1', 's1', 's2', 's3')
+    
+    backfill({}, None)
+    
+    assert get_workshop('w1')['inscritos'] == 3
+
+
+def test_concurrent_registration_is_not_overwritten(backfill, table, put_workshop, get_workshop, monkeypatch):
+    put_workshop('w1', 10, inscritos=5)
+    add_registrations(table, 'w1', 's1')
+    count = backfill_inscritos.count_registrations
+    
+    def count_then_register(table, workshop_id):
+        result = count(table, workshop_id)
+        add_registrations(table, workshop_id, 's2')
+        table.update_item(
+            Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+            UpdateExpression='ADD inscritos :one',
+            ExpressionAttributeValues={':one': 1}
+        )
+        return result
+    
+    monkeypatch.setattr(backfill_inscritos, 'count_registrations', count_then_register)
+    body = json.loads(backfill({}, None)['body'])
+    
+    assert body == {'actualizados': 0, 'omitidos': ['w1']}
+    assert get_workshop('w1')['inscritos'] == 6
@@ -0,0 +1,72 @@
+"""
+registrations/batch.py: resultado por taller de una inscripción múltiple
+"""
+import json
+
+import pytest
+
+from registrations import batch
+from shared.registrations import registration_key
+from shared.waitlist import waitlist_key
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(batch)
+    return batch.handler
+
+
+def register(handler, api_event, *workshop_ids, sub='s1'):
+    response = handler(api_event('student', sub=sub, body={'talleres': list(workshop_ids)}), None)
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    return body, {result['_id']: result for result in body['resultados']}
+
+
+def test_full_workshop_joins_waitlist(handler, api_event, table, put_workshop, get_workshop):
+    put_workshop('libre', 5)
+    put_workshop('lleno', 1, inscritos=1)
+    
+    body, results = register(handler, api_event, 'libre', 'lleno')
+    
+    assert results['libre']['statusCode'] == 201
+    assert results['lleno']['statusCode'] == 202
+    assert results['lleno']['posicion'] == 1
+    assert (body['inscritos'], body['en_espera'], body['fallidos']) == (1, 1, 0)
+    assert 'Item' in table.get_item(Key=waitlist_key('lleno', 's1'))
+    assert get_workshop('lleno')['en_espera'] == 1
+
+
+def test_waitlist_positions_follow_arrival(handler, api_event, put_workshop):
+    put_workshop('lleno', 0)
+    register(handler, api_event, 'lleno', sub='s1')
+    
+    _, results = register(handler, api_event, 'lleno', sub='s2')
+    
+    assert results['lleno']['posicion'] == 2
+
+
+def test_other_failures_are_reported(handler, api_event, table, put_workshop):
+    put_workshop('w1', 5)
+    register(handler, api_event, 'w1')
+    
+    body, results = register(handler, api_event, 'w1', 'no-existe')
+    
+    assert results['w1']['statusCode'] == 409
+    assert results['no-existe']['statusCode'] == 404
+    assert (body['inscritos'], body['en_espera'], body['fallidos']) == (0, 0, 2)
+    assert 'Item' in table.get_item(Key=registration_key('w1', 's1'))
+
+
+def test_queued_workshop_gets_a_ticket(handler, api_event, table, put_workshop, get_workshop):
+    put_workshop('libre', 5)
+    put_workshop('cola', 5, cola_inscripcion=True)
+    
+    body, results = register(handler, api_event, 'cola', 'libre')
+    
+    assert results['libre']['statusCode'] == 201
+    assert results['cola']['statusCode'] == 202
+    assert results['cola']['ticket']
+    assert (body['inscritos'], body['en_cola'], body['fallidos']) == (1, 1, 0)
+    assert get_workshop('cola').get('inscritos', 0) == 0
+    assert 'Item' not in table.get_item(Key=registration_key('cola', 's1'))
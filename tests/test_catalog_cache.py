@@ -0,0 +1,61 @@
+"""
+Caché en memoria del catálogo (shared.catalog): se recarga solo cuando
+cambia CATALOG#VERSION
+"""
+from shared import catalog
+
+
+def test_cache_is_reused_until_version_changes(table, put_workshop):
+    put_workshop('w1', 10)
+    assert [item['PK'] for item in catalog.load_catalog(table)] == ['WORKSHOP#w1']
+    
+    # Sin cambio de versión el taller nuevo no aparece
+    put_workshop('w2', 10, fecha='2025-01-16')
+    assert [item['PK'] for item in catalog.load_catalog(table)] == ['WORKSHOP#w1']
+    
+    catalog.bump_catalog_version(table)
+    assert [item['PK'] for item in catalog.load_catalog(table)] == ['WORKSHOP#w1', 'WORKSHOP#w2']
+
+
+def test_expired_cache_reloads_without_version_change(table, put_workshop, monkeypatch):
+    put_workshop('w1', 10)
+    catalog.load_catalog(table)
+    put_workshop('w2', 10, fecha='2025-01-16')
+    
+    monkeypatch.setitem(catalog._cache, 'loaded_at', -catalog.CACHE_MAX_AGE_SECONDS)
+    assert len(catalog.load_catalog(table)) == 2
+
+
+def test_oversized_catalog_is_not_cached(table, put_workshop, monkeypatch):
+    # max_items toma MAX_CACHED_WORKSHOPS al definirse la función
+    monkeypatch.setattr(catalog._read_catalog, '__defaults__', (1,))
+    put_workshop('w1', 10)
+    put_workshop('w2', 10, fecha='2025-01-16')
+    
+    assert catalog.load_catalog(table) is None
+    assert len(catalog.all_workshops(table)) == 2
+
+
+def test_overlay_counters_reads_current_inscritos(table, put_workshop):
+    put_workshop('w1', 10, inscritos=1)
+    cached = catalog.load_catalog(table)
+    table.update_item(
+        Key={'PK': 'WORKSHOP#w1', 'SK': 'METADATA'},
+        UpdateExpression='SET inscritos = :n',
+        ExpressionAttributeValues={':n': 4}
+    )
+    
+    overlaid = catalog.overlay_counters(table, cached)
+    assert overlaid[0]['inscritos'] == 4
+    assert cached[0]['inscritos'] == 1
+    assert overlaid[0]['nombre'] == 'Taller w1'
+
+
+def test_batch_get_splits_requests(table, put_workshop):
+    ids = [f'w{i:03d}' for i in range(catalog.BATCH_GET_SIZE + 5)]
+    for workshop_id in ids:
+        put_workshop(workshop_id, 10)
+    
+    found = catalog.batch_get_workshops(table, ids + ['no-existe'], ('cupo',))
+    assert sorted(found) == ids
+    assert set(found['w000']) == {'PK', 'SK', 'cupo'}
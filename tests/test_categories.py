@@ -0,0 +1,88 @@
+"""
+Contadores CATEGORY#<id>/COUNT que mantiene el stream y GET /categories
+"""
+import json
+
+import pytest
+
+from events import stream
+from shared.stats import category_key
+from workshops import categories
+
+
+def workshop(workshop_id, cupo, inscritos=0, categoria='cloud'):
+    return {
+        'PK': f'WORKSHOP#{workshop_id}',
+        'SK': 'METADATA',
+        'nombre': f'Taller {workshop_id}',
+        'categoria': categoria,
+        'fecha': '2025-01-15',
+        'hora': '10:00',
+        'cupo': cupo,
+        'inscritos': inscritos,
+    }
+
+
+@pytest.fixture
+def apply(use_table, stream_record):
+    """Procesa una secuencia de imágenes del mismo taller como un lote del stream"""
+    use_table(stream)
+    
+    def run(*images):
+        records = [stream_record(old=old, new=new) for old, new in zip((None,) + images, images)]
+        assert stream.handler({'Records': records}, None) == {'batchItemFailures': []}
+    return run
+
+
+@pytest.fixture
+def counter(table):
+    def read(category_id):
+        item = table.get_item(Key=category_key(category_id), ConsistentRead=True).get('Item', {})
+        return {name: int(item.get(name, 0)) for name in ('cantidad', 'cupos', 'cupos_disponibles')}
+    return read
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(categories)
+    return categories.handler
+
+
+def test_counts_workshops_and_free_seats(apply, counter):
+    apply(workshop('w1', 10), workshop('w1', 10, inscritos=4))
+    apply(workshop('w2', 5, inscritos=5))
+    
+    assert counter('cloud') == {'cantidad': 2, 'cupos': 15, 'cupos_disponibles': 6}
+
+
+def test_category_change_moves_the_workshop(apply, counter):
+    apply(workshop('w1', 10, inscritos=2), workshop('w1', 10, inscritos=2, categoria='data'))
+    
+    assert counter('cloud') == {'cantidad': 0, 'cupos': 0, 'cupos_disponibles': 0}
+    assert counter('data') == {'cantidad': 1, 'cupos': 10, 'cupos_disponibles': 8}
+
+
+def test_unlimited_workshop_counts_without_seats(apply, counter):
+    apply(workshop('w1', -1, inscritos=30))
+    
+    assert counter('cloud') == {'cantidad': 1, 'cupos': 0, 'cupos_disponibles': 0}
+
+
+def test_handler_reads_the_counters(apply, handler, api_event):
+    apply(workshop('w1', 10, inscritos=3))
+    
+    response = handler(api_event(), None)
+    
+    assert response['statusCode'] == 200
+    body = {category['id']: category for category in json.loads(response['body'])}
+    assert [category['id'] for category in categories.CATEGORIES] == list(body)
+    assert (body['cloud']['cantidad'], body['cloud']['cupos_disponibles']) == (1, 7)
+    assert (body['data']['cantidad'], body['data']['cupos_disponibles']) == (0, 0)
+
+
+def test_handler_etag_changes_with_the_counters(apply, handler, api_event):
+    etag = handler(api_event(), None)['headers']['ETag']
+    
+    assert handler(api_event(headers={'If-None-Match': etag}), None)['statusCode'] == 304
+    apply(workshop('w1', 10))
+    assert handler(api_event(headers={'If-None-Match': etag}), None)['statusCode'] == 200
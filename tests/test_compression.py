@@ -0,0 +1,72 @@
+"""
+Compresión negociada de respuestas grandes (shared.compression)
+"""
+import base64
+import gzip
+import json
+
+import pytest
+
+from shared import compression
+from shared.http import etag_matches
+
+
+@pytest.fixture(autouse=True)
+def without_brotli(monkeypatch):
+    """brotli es opcional: los tests no dependen de que esté instalado"""
+    monkeypatch.setattr(compression, 'brotli', None)
+
+
+def response(body, status=200):
+    return {
+        'statusCode': status,
+        'headers': {'Content-Type': 'application/json', 'ETag': '"abc"'},
+        'body': body,
+    }
+
+
+LARGE_BODY = json.dumps([{'nombre': f'Taller {i}', 'descripcion': 'x' * 40} for i in range(50)])
+
+
+def test_parse_accept_encoding_q_values():
+    assert compression.parse_accept_encoding('gzip;q=0.5, br, *;q=0, deflate;q=x') == {
+        'gzip': 0.5, 'br': 1.0, '*': 0.0, 'deflate': 0.0,
+    }
+    assert compression.parse_accept_encoding(None) == {}
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'gzip'),
+    ('*', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    (None, None),
+])
+def test_choose_encoding(header, expected):
+    headers = {'accept-encoding': header} if header else {}
+    assert compression.choose_encoding({'headers': headers}) == expected
+
+
+def test_large_body_is_gzipped(api_event):
+    event = api_event(headers={'Accept-Encoding': 'gzip'})
+    
+    result = compression.compress_response(event, response(LARGE_BODY))
+    
+    assert result['isBase64Encoded'] is True
+    assert result['headers']['Content-Encoding'] == 'gzip'
+    assert result['headers']['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(base64.b64decode(result['body'])).decode('utf-8') == LARGE_BODY
+    # El ETag comprimido sigue validando contra el ETag de la representación original
+    assert result['headers']['ETag'] == '"abc-gzip"'
+    assert etag_matches({'headers': {'If-None-Match': result['headers']['ETag']}}, '"abc"')
+
+
+@pytest.mark.parametrize('body, status', [('{"ok": true}', 200), (LARGE_BODY, 404)])
+def test_small_or_error_bodies_are_untouched(api_event, body, status):
+    event = api_event(headers={'Accept-Encoding': 'gzip'})
+    
+    result = compression.compress_response(event, response(body, status))
+    
+    assert result['body'] == body
+    assert 'Content-Encoding' not in result['headers']
+    assert result['headers']['Vary'] == 'Accept-Encoding'
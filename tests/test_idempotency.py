@@ -0,0 +1,220 @@
+"""
+Decorador idempotent: repetición de la respuesta, claves reutilizadas con
+otra petición, peticiones en curso y liberación de la clave ante errores
+"""
+import hashlib
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from auth import register as auth_register
+from shared.idempotency import idempotent, IDEMPOTENCY_PREFIX, REPLAYED_HEADER
+
+
+def request(key='clave-1', body='{"a": 1}', sub='s1'):
+    return {
+        'headers': {'Idempotency-Key': key} if key is not None else {},
+        'pathParameters': {'id': 'w1'},
+        'body': body,
+        'requestContext': {'authorizer': {'claims': {'sub': sub}}},
+    }
+
+
+class CountingHandler:
+    """Handler de prueba que cuenta sus ejecuciones y responde lo configurado"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def __call__(self, event, context):
+        self.calls += 1
+        response = self.responses[min(self.calls, len(self.responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def created(body):
+    return {'statusCode': 201, 'headers': {'Content-Type': 'application/json'}, 'body': json.dumps(body)}
+
+
+def stored_key(table, key='clave-1'):
+    return table.get_item(Key={'PK': f'{IDEMPOTENCY_PREFIX}{key}', 'SK': 'METADATA'}).get('Item')
+
+
+def test_without_header_runs_every_time(table):
+    inner = CountingHandler(created({'n': 1}))
+    handler = idempotent('tests.scope')(inner)
+    
+    handler(request(key=None), None)
+    handler(request(key=None), None)
+    
+    assert inner.calls == 2
+
+
+def test_retry_replays_stored_response(table):
+    inner = CountingHandler(created({'n': 1}), created({'n': 2}))
+    handler = idempotent('tests.scope')(inner)
+    
+    first = handler(request(), None)
+    second = handler(request(), None)
+    
+    assert inner.calls == 1
+    assert first['statusCode'] == 201
+    assert second['statusCode'] == 201
+    assert json.loads(second['body']) == {'n': 1}
+    assert second['headers'][REPLAYED_HEADER] == 'true'
+    assert REPLAYED_HEADER not in first['headers']
+
+
+@pytest.mark.parametrize('changed', [{'body': '{"a": 2}'}, {'sub': 's2'}])
+def test_key_reused_with_other_request_is_rejected(table, changed):
+    inner = CountingHandler(created({'n': 1}))
+    handler = idempotent('tests.scope')(inner)
+    handler(request(), None)
+    
+    response = handler(request(**changed), None)
+    
+    assert response['statusCode'] == 422
+    assert inner.calls == 1
+
+
+def test_key_reused_in_other_scope_is_rejected(table):
+    idempotent('tests.scope')(CountingHandler(created({'n': 1})))(request(), None)
+    
+    response = idempotent('tests.other')(CountingHandler(created({'n': 2})))(request(), None)
+    
+    assert response['statusCode'] == 422
+
+
+def test_concurrent_request_gets_conflict(table):
+    nested = {}
+    
+    def inner(event, context):
+        # Un reintento que llega mientras la primera petición sigue ejecutándose
+        nested['response'] = handler(request(), None)
+        return created({'n': 1})
+    
+    handler = idempotent('tests.scope')(inner)
+    first = handler(request(), None)
+    
+    assert first['statusCode'] == 201
+    assert nested['response']['statusCode'] == 409
+    assert nested['response']['headers']['Retry-After'] == '1'
+
+
+def test_server_error_releases_key(table):
+    inner = CountingHandler({'statusCode': 500, 'body': '{}'}, created({'n': 2}))
+    handler = idempotent('tests.scope')(inner)
+    
+    assert handler(request(), None)['statusCode'] == 500
+    assert stored_key(table) is None
+    
+    retry = handler(request(), None)
+    
+    assert inner.calls == 2
+    assert json.loads(retry['body']) == {'n': 2}
+
+
+def test_exception_releases_key(table):
+    inner = CountingHandler(RuntimeError('falla'), created({'n': 2}))
+    handler = idempotent('tests.scope')(inner)
+    
+    with pytest.raises(RuntimeError):
+        handler(request(), None)
+    assert stored_key(table) is None
+    
+    assert handler(request(), None)['statusCode'] == 201
+
+
+def test_client_error_is_stored(table):
+    inner = CountingHandler({'statusCode': 409, 'body': '{"mensaje": "Cupo lleno"}'})
+    handler = idempotent('tests.scope')(inner)
+    
+    handler(request(), None)
+    retry = handler(request(), None)
+    
+    assert inner.calls == 1
+    assert retry['statusCode'] == 409
+
+
+@pytest.mark.parametrize('key', ['   ', 'x' * 256])
+def test_invalid_key_is_rejected(table, key):
+    inner = CountingHandler(created({'n': 1}))
+    
+    response = idempotent('tests.scope')(inner)(request(key=key), None)
+    
+    assert response['statusCode'] == 400
+    assert inner.calls == 0
+
+
+def test_fingerprint_is_salted_per_key(table):
+    handler = idempotent('tests.scope')(CountingHandler(created({'n': 1})))
+    handler(request(key='clave-1'), None)
+    handler(request(key='clave-2'), None)
+    
+    first, second = stored_key(table, 'clave-1'), stored_key(table, 'clave-2')
+    
+    assert first['sal'] != second['sal']
+    assert first['huella'] != second['huella']
+    assert first['huella'] != hashlib.sha256(request()['body'].encode('utf-8')).hexdigest()
+
+
+def test_secret_fields_stay_out_of_the_fingerprint(table):
+    inner = CountingHandler(created({'n': 1}))
+    handler = idempotent('tests.scope', secret_fields=('contrasena',))(inner)
+    handler(request(body='{"email": "a@b.com", "contrasena": "Uno-1111"}'), None)
+    
+    same = handler(request(body='{"email": "a@b.com", "contrasena": "Otra-2222"}'), None)
+    other = handler(request(body='{"email": "c@d.com", "contrasena": "Uno-1111"}'), None)
+    
+    assert inner.calls == 1
+    assert same['headers'][REPLAYED_HEADER] == 'true'
+    assert other['statusCode'] == 422
+
+
+def test_stored_response_is_what_retries_get(table):
+    inner = CountingHandler(created({'secreto': 'x', 'n': 1}))
+    strip = lambda response: {**response, 'body': json.dumps({'n': 1})}
+    handler = idempotent('tests.scope', stored_response=strip)(inner)
+    
+    first = handler(request(), None)
+    retry = handler(request(), None)
+    
+    assert json.loads(first['body']) == {'secreto': 'x', 'n': 1}
+    assert json.loads(retry['body']) == {'n': 1}
+    assert 'secreto' not in stored_key(table)['respuesta']
+
+
+@pytest.fixture
+def cognito(use_table, monkeypatch):
+    use_table(auth_register)
+    client = MagicMock()
+    client.sign_up.return_value = {'UserSub': 'u1'}
+    client.admin_initiate_auth.return_value = {
+        'AuthenticationResult': {'IdToken': 'id-token', 'RefreshToken': 'refresh-token'}
+    }
+    monkeypatch.setattr(auth_register, 'cognito', client)
+    return client
+
+
+def signup(api_event, contrasena='Segura#123'):
+    return api_event(
+        body={'nombre': 'Ana', 'email': 'ana@example.com', 'contrasena': contrasena},
+        headers={'Idempotency-Key': 'registro-1'}
+    )
+
+
+def test_auth_register_keeps_tokens_and_password_out_of_the_table(cognito, table, api_event):
+    first = auth_register.handler(signup(api_event), None)
+    retry = auth_register.handler(signup(api_event), None)
+    
+    assert json.loads(first['body'])['token'] == 'id-token'
+    stored = stored_key(table, 'registro-1')
+    assert 'token' not in stored['respuesta'] and 'Segura#123' not in str(stored)
+    assert retry['statusCode'] == 201
+    assert 'token' not in json.loads(retry['body'])
+    assert json.loads(retry['body'])['estudiante']['_id'] == 'u1'
+    assert cognito.sign_up.call_count == 1
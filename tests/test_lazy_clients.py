@@ -0,0 +1,33 @@
+"""
+Los módulos de handlers no crean clientes AWS al importarse (shared.aws):
+las rutas que responden sin tocar AWS no pagan boto3 en el cold start
+"""
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+from shared import aws
+
+FUNCTIONS_DIR = pathlib.Path(aws.__file__).resolve().parents[1]
+MODULES = sorted(
+    '.'.join(path.relative_to(FUNCTIONS_DIR).with_suffix('').parts)
+    for path in [*FUNCTIONS_DIR.glob('*.py'), *FUNCTIONS_DIR.glob('*/*.py')]
+    if path.parent.name != 'shared' and path.name != '__init__.py'
+)
+
+
+@pytest.mark.parametrize('module_name', MODULES)
+def test_import_creates_no_clients(module_name, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError(f'{module_name} crea un cliente AWS al importarse')
+    
+    monkeypatch.setattr('boto3.client', fail)
+    monkeypatch.setattr('boto3.resource', fail)
+    monkeypatch.delitem(sys.modules, module_name, raising=False)
+    aws.get_client.cache_clear()
+    aws.get_resource.cache_clear()
+    aws.get_table.cache_clear()
+    
+    importlib.import_module(module_name)
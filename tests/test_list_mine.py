@@ -0,0 +1,81 @@
+"""
+registrations/list_mine.py: inscripciones del estudiante paginadas por cursor
+"""
+import json
+
+import pytest
+
+from registrations import list_mine
+from shared.registrations import registration_item
+
+
+@pytest.fixture
+def handler(use_table, table, put_workshop):
+    use_table(list_mine)
+    for day in range(1, 6):
+        put_workshop(f'w{day}', 10)
+        table.put_item(Item=registration_item(f'w{day}', {
+            'estudiante_id': 's1',
+            'nombre': 'Estudiante s1',
+            'email': 's1@example.com',
+            'registrado_en': f'2024-11-0{day}T10:00:00',
+        }))
+    return list_mine.handler
+
+
+def call(handler, api_event, sub='s1', **query):
+    response = handler(api_event('student', sub=sub, query=query or None), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_pages_follow_next_cursor(handler, api_event):
+    seen = []
+    cursor = None
+    while True:
+        query = {'limit': '2', **({'cursor': cursor} if cursor else {})}
+        status, body = call(handler, api_event, **query)
+        assert status == 200
+        assert len(body['talleres']) <= 2
+        seen.extend(taller['_id'] for taller in body['talleres'])
+        cursor = body['nextCursor']
+        if not cursor:
+            break
+    
+    assert seen == ['w5', 'w4', 'w3', 'w2', 'w1']
+
+
+def test_each_call_is_one_bounded_query(handler, api_event, table, monkeypatch):
+    queries = []
+    query = table.query
+    monkeypatch.setattr(table, 'query', lambda **kwargs: queries.append(kwargs) or query(**kwargs))
+    
+    status, body = call(handler, api_event, limit='3')
+    
+    assert status == 200
+    assert [taller['mi_inscripcion']['registrado_en'][:10] for taller in body['talleres']] == [
+        '2024-11-05', '2024-11-04', '2024-11-03'
+    ]
+    assert len(queries) == 1 and queries[0]['Limit'] == 3
+
+
+@pytest.mark.parametrize('query', [{'limit': 'muchos'}, {'cursor': 'no-es-un-cursor'}])
+def test_invalid_pagination_is_bad_request(handler, api_event, query):
+    status, body = call(handler, api_event, **query)
+    
+    assert status == 400
+    assert body['mensaje'] == 'Parámetros de paginación inválidos'
+
+
+def test_cursor_of_another_student_is_rejected(handler, api_event):
+    _, body = call(handler, api_event, limit='2')
+    
+    status, _ = call(handler, api_event, sub='s2', cursor=body['nextCursor'])
+    
+    assert status == 400
+
+
+def test_student_without_registrations(handler, api_event):
+    status, body = call(handler, api_event, sub='s2')
+    
+    assert status == 200
+    assert body == {'talleres': [], 'nextCursor': None}
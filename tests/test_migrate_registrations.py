@@ -0,0 +1,98 @@
+"""
+maintenance/migrate_registrations.py: copia la lista embebida a items REG#
+sin que el stream cuente esas copias como inscripciones nuevas
+"""
+import json
+
+import pytest
+
+from events import stream
+from maintenance import migrate_registrations
+from shared.registrations import MIGRATION_MARKER, registration_item, registration_key
+
+
+def embedded(*student_ids):
+    return [{
+        'estudiante_id': student_id,
+        'nombre': f'Estudiante {student_id}',
+        'email': f'{student_id}@example.com',
+        'registrado_en': '2024-11-01T10:00:00',
+    } for student_id in student_ids]
+
+
+@pytest.fixture
+def migrate(use_table):
+    return use_table(migrate_registrations).handler
+
+
+@pytest.fixture
+def stream_table(use_table):
+    return use_table(stream).table
+
+
+def test_moves_embedded_list_to_registration_items(migrate, table, put_workshop, get_workshop):
+    put_workshop('w1', 10, inscripciones=embedded('s1', 's2'), inscritos=2)
+    put_workshop('nuevo', 10, inscritos=0)
+    
+    body = json.loads(migrate({}, None)['body'])
+    
+    assert body == {'migrados': 1, 'omitidos': 0}
+    workshop = get_workshop('w1')
+    assert 'inscripciones' not in workshop
+    assert workshop['inscritos'] == 2
+    assert MIGRATION_MARKER in workshop
+    registration = table.get_item(Key=registration_key('w1', 's1'))['Item']
+    assert registration['GSI3PK'] == 'USER#s1'
+    assert registration[MIGRATION_MARKER] == workshop[MIGRATION_MARKER]
+
+
+def test_counter_includes_registrations_made_by_new_code(migrate, table, put_workshop, get_workshop):
+    put_workshop('w1', 10, inscripciones=embedded('s1'), inscritos=2)
+    table.put_item(Item=registration_item('w1', embedded('s2')[0]))
+    
+    migrate({}, None)
+    
+    assert get_workshop('w1')['inscritos'] == 2
+
+
+def test_concurrent_registration_skips_workshop(migrate, table, put_workshop, get_workshop, monkeypatch):
+    put_workshop('w1', 10, inscripciones=embedded('s1'), inscritos=1)
+    count = migrate_registrations.count_registrations
+    
+    def count_then_register(table, workshop_id):
+        result = count(table, workshop_id)
+        table.update_item(
+            Key={'PK': 'WORKSHOP#w1', 'SK': 'METADATA'},
+            UpdateExpression='ADD inscritos :one',
+            ExpressionAttributeValues={':one': 1}
+        )
+        return result
+    
+    monkeypatch.setattr(migrate_registrations, 'count_registrations', count_then_register)
+    body = json.loads(migrate({}, None)['body'])
+    
+    assert body == {'migrados': 0, 'omitidos': 1}
+    assert 'inscripciones' in get_workshop('w1')
+
+
+def test_stream_ignores_migration_writes(stream_table, stream_record, put_workshop):
+    workshop = put_workshop('w1', 10, inscripciones=embedded('s1'))
+    migrated = {k: v for k, v in workshop.items() if k != 'inscripciones'}
+    migrated.update(inscritos=1, **{MIGRATION_MARKER: '2024-12-01T10:00:00'})
+    registration = {**registration_item('w1', embedded('s1')[0]), MIGRATION_MARKER: '2024-12-01T10:00:00'}
+    
+    assert stream.record_deltas(stream_record(new=registration)) is None
+    assert stream.record_deltas(stream_record(old=workshop, new=migrated)) is None
+
+
+def test_stream_counts_changes_after_migration(stream_table, stream_record, put_workshop):
+    workshop = {**put_workshop('w1', 10, inscritos=1), MIGRATION_MARKER: '2024-12-01T10:00:00'}
+    registration = {**registration_item('w1', embedded('s1')[0]), MIGRATION_MARKER: '2024-12-01T10:00:00'}
+    
+    cancelled = stream.record_deltas(stream_record(old=registration))
+    decremented = stream.record_deltas(stream_record(old=workshop, new={**workshop, 'inscritos': 0}))
+    new_registration = stream.record_deltas(stream_record(new=registration_item('w1', embedded('s2')[0])))
+    
+    assert cancelled == {'students': {'s1': -1}}
+    assert decremented['stats']['registros'] == -1
+    assert new_registration == {'students': {'s2': 1}}
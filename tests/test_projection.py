@@ -0,0 +1,53 @@
+"""
+Proyección de campos de talleres (view=summary|full y fields=)
+"""
+import pytest
+
+from shared.projection import (
+    SUMMARY_FIELDS, WORKSHOP_FIELDS, resolve_fields, metadata_fields,
+    projection_kwargs, serialize_workshop,
+)
+
+ITEM = {
+    'PK': 'WORKSHOP#w1',
+    'SK': 'METADATA',
+    'nombre': 'Taller w1',
+    'cupo': 10,
+    'inscritos': 12,
+    'rating': 4,
+}
+
+
+def test_fields_take_precedence_over_view():
+    assert resolve_fields({'fields': 'nombre, cupo,nombre', 'view': 'summary'}) == ('nombre', 'cupo')
+    assert resolve_fields({'view': 'summary'}) == SUMMARY_FIELDS
+    assert resolve_fields({}) == WORKSHOP_FIELDS
+
+
+@pytest.mark.parametrize('params', [{'fields': 'nombre,PK'}, {'fields': ' , '}, {'view': 'compact'}])
+def test_invalid_fields_or_view_raise(params):
+    with pytest.raises(ValueError):
+        resolve_fields(params)
+
+
+def test_listings_reject_registration_only_fields():
+    assert metadata_fields(WORKSHOP_FIELDS) == SUMMARY_FIELDS
+    with pytest.raises(ValueError):
+        metadata_fields(('inscripciones',))
+
+
+def test_projection_reads_derived_attributes():
+    kwargs = projection_kwargs(('nombre', 'cupos_disponibles'))
+    assert list(kwargs['ExpressionAttributeNames'].values()) == ['PK', 'SK', 'nombre', 'cupo', 'inscritos']
+    assert kwargs['ProjectionExpression'] == '#p0, #p1, #p2, #p3, #p4'
+    assert projection_kwargs(SUMMARY_FIELDS) == {}
+
+
+def test_serialize_only_requested_fields():
+    assert serialize_workshop(ITEM, ('nombre', 'instructor', 'cupos_disponibles', 'rating')) == {
+        '_id': 'w1',
+        'nombre': 'Taller w1',
+        'instructor': '',
+        'cupos_disponibles': 0,
+        'rating': 4.0,
+    }
@@ -0,0 +1,160 @@
+"""
+Mapeo de las CancellationReasons de register_transaction a respuestas y
+handler de registrations/register.py
+"""
+import json
+
+import pytest
+
+from events import processor
+from registrations import register as register_handler
+
+from shared.admission import ticket_key, TICKET_PENDING
+from shared.registrations import (
+    register_transaction, registration_key, cancellation_reasons, condition_failed,
+    registration_error, WORKSHOP_FULL, ADMISSION_QUEUED,
+)
+
+
+def inscripcion(student_id):
+    return {
+        'estudiante_id': student_id,
+        'nombre': f'Estudiante {student_id}',
+        'email': f'{student_id}@example.com',
+        'registrado_en': '2024-12-01T10:00:00',
+    }
+
+
+def register(table, workshop_id, student_id):
+    """Ejecuta register_transaction; devuelve las CancellationReasons o None si se aplicó"""
+    client = table.meta.client
+    try:
+        client.transact_write_items(
+            TransactItems=register_transaction(table, workshop_id, inscripcion(student_id))
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        return cancellation_reasons(e)
+    return None
+
+
+def test_register_success_increments_counter(table, put_workshop, get_workshop):
+    put_workshop('w1', 2)
+    
+    assert register(table, 'w1', 's1') is None
+    assert get_workshop('w1')['inscritos'] == 1
+    assert 'Item' in table.get_item(Key=registration_key('w1', 's1'))
+
+
+def test_duplicate_registration_is_conflict(table, put_workshop, get_workshop):
+    put_workshop('w1', 5)
+    register(table, 'w1', 's1')
+    
+    reasons = register(table, 'w1', 's1')
+    
+    assert len(reasons) == 2
+    assert condition_failed(reasons[1])
+    assert registration_error(*reasons) == (409, 'Ya estás inscrito en este taller')
+    assert get_workshop('w1')['inscritos'] == 1
+
+
+def test_missing_workshop_is_not_found(table):
+    reasons = register(table, 'no-existe', 's1')
+    
+    assert condition_failed(reasons[0])
+    assert 'Item' not in reasons[0]
+    assert registration_error(*reasons) == (404, 'Taller no encontrado')
+
+
+@pytest.mark.parametrize('cupo, inscritos', [(1, 1), (0, None), (0, 0)])
+def test_full_workshop_returns_old_item(table, put_workshop, cupo, inscritos):
+    attributes = {} if inscritos is None else {'inscritos': inscritos}
+    put_workshop('w1', cupo, **attributes)
+    
+    reasons = register(table, 'w1', 's2')
+    
+    assert condition_failed(reasons[0])
+    assert 'Item' in reasons[0]
+    assert registration_error(*reasons) == WORKSHOP_FULL
+
+
+def test_unlimited_workshop_accepts_registrations(table, put_workshop, get_workshop):
+    put_workshop('w1', -1, inscritos=1000)
+    
+    assert register(table, 'w1', 's1') is None
+    assert get_workshop('w1')['inscritos'] == 1001
+
+
+@pytest.mark.parametrize('cupo, inscritos', [(5, 0), (1, 1)])
+def test_queued_workshop_rejects_direct_registration(table, put_workshop, get_workshop, cupo, inscritos):
+    put_workshop('w1', cupo, inscritos=inscritos, cola_inscripcion=True)
+    
+    reasons = register(table, 'w1', 's1')
+    
+    assert registration_error(*reasons) == ADMISSION_QUEUED
+    assert get_workshop('w1')['inscritos'] == inscritos
+
+
+def test_workshop_without_queue_flag_set_to_false(table, put_workshop):
+    put_workshop('w1', 5, cola_inscripcion=False)
+    
+    assert register(table, 'w1', 's1') is None
+
+
+def test_no_failed_condition_maps_to_none():
+    reasons = [{'Code': 'None'}, {'Code': 'TransactionConflict'}]
+    
+    assert registration_error(*reasons) is None
+
+
+def test_duplicate_takes_precedence_over_full():
+    reasons = [
+        {'Code': 'ConditionalCheckFailed', 'Item': {'cupo': {'N': '1'}}},
+        {'Code': 'ConditionalCheckFailed'},
+    ]
+    
+    assert registration_error(*reasons) == (409, 'Ya estás inscrito en este taller')
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(register_handler)
+    return register_handler.handler
+
+
+def test_handler_does_not_read_the_workshop(handler, table, api_event, put_workshop, get_workshop, monkeypatch):
+    put_workshop('w1', 2)
+    reads = []
+    get_item = table.get_item
+    monkeypatch.setattr(table, 'get_item', lambda **kwargs: reads.append(kwargs) or get_item(**kwargs))
+    
+    response = handler(api_event('student', path={'id': 'w1'}), None)
+    
+    assert reads == []    
+    assert response['statusCode'] == 201
+    body = json.loads(response['body'])
+    assert body['_id'] == 'w1'
+    assert body['inscripcion']['estudiante_id'] == 's1'
+    assert get_workshop('w1')['inscritos'] == 1
+    detail = json.loads(register_handler.events.put_events.call_args.kwargs['Entries'][0]['Detail'])
+    assert detail['workshopId'] == 'w1' and 'workshopName' not in detail
+
+
+def test_handler_issues_ticket_for_queued_workshop(handler, table, api_event, put_workshop, get_workshop):
+    put_workshop('w1', 2, cola_inscripcion=True)
+    
+    response = handler(api_event('student', path={'id': 'w1'}), None)
+    
+    assert response['statusCode'] == 202
+    body = json.loads(response['body'])
+    assert body['estado'] == TICKET_PENDING
+    assert table.get_item(Key=ticket_key(body['ticket']))['Item']['estado'] == TICKET_PENDING
+    assert get_workshop('w1').get('inscritos', 0) == 0
+    assert 'Item' not in table.get_item(Key=registration_key('w1', 's1'))
+
+
+def test_processor_resolves_missing_workshop_name(use_table, put_workshop):
+    use_table(processor)
+    put_workshop('w1', 2)
+    
+    assert processor.get_workshop_name('w1') == 'Taller w1'
+    assert processor.get_workshop_name('no-existe') == ''
@@ -0,0 +1,113 @@
+"""
+Buckets por hora y por día que agrega el stream y GET /stats/history
+"""
+import json
+
+import pytest
+
+from events import stream
+from shared.metrics import metric_key, bucket_periods, public_bucket
+from workshops import stats_history
+
+# 2024-12-01T11:00:00Z
+TIMESTAMP = 1733050800
+
+
+def workshop(workshop_id, inscritos, cupo=10, categoria='cloud'):
+    return {
+        'PK': f'WORKSHOP#{workshop_id}',
+        'SK': 'METADATA',
+        'nombre': f'Taller {workshop_id}',
+        'categoria': categoria,
+        'fecha': '2025-01-15',
+        'hora': '10:00',
+        'cupo': cupo,
+        'inscritos': inscritos,
+    }
+
+
+@pytest.fixture
+def apply(use_table, stream_record):
+    use_table(stream)
+    
+    def run(*changes, timestamp=TIMESTAMP):
+        records = [stream_record(old=old, new=new, timestamp=timestamp) for old, new in changes]
+        assert stream.handler({'Records': records}, None) == {'batchItemFailures': []}
+    return run
+
+
+@pytest.fixture
+def bucket(table):
+    def read(granularity, period):
+        item = table.get_item(Key=metric_key(granularity, period), ConsistentRead=True).get('Item')
+        return public_bucket(item) if item else None
+    return read
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(stats_history)
+    return stats_history.handler
+
+
+def history(handler, api_event, role='admin', **query):
+    response = handler(api_event(role, query=query), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_bucket_periods_use_utc():
+    assert bucket_periods(TIMESTAMP) == {'hour': '2024-12-01#11', 'day': '2024-12-01'}
+
+
+def test_stream_adds_flows_and_occupancy(apply, bucket):
+    apply((None, workshop('w1', 0)))
+    apply(
+        (workshop('w1', 0), workshop('w1', 3)),
+        (workshop('w1', 3), workshop('w1', 2)),
+    )
+    
+    hour = bucket('hour', '2024-12-01#11')
+    assert hour['periodo'] == '2024-12-01T11:00'
+    assert (hour['registros'], hour['cancelaciones']) == (3, 1)
+    assert hour['categorias']['cloud'] == {'registros': 3, 'cancelaciones': 1, 'ocupacion': 20}
+    assert bucket('day', '2024-12-01')['registros'] == 3
+
+
+def test_creating_a_workshop_is_not_a_flow(apply, bucket):
+    apply((None, workshop('w1', 4)))
+    
+    hour = bucket('hour', '2024-12-01#11')
+    assert hour is None or (hour['registros'], hour['cancelaciones']) == (0, 0)
+
+
+def test_handler_returns_buckets_in_range(apply, handler, api_event):
+    apply((None, workshop('w1', 0)))
+    apply((workshop('w1', 0), workshop('w1', 2)))
+    apply((workshop('w1', 2), workshop('w1', 3)), timestamp=TIMESTAMP + 24 * 3600)
+    
+    status, body = history(handler, api_event, **{'from': '2024-12-01', 'to': '2024-12-02'})
+    
+    assert status == 200
+    assert body['granularity'] == 'day'
+    assert [(b['periodo'], b['registros']) for b in body['buckets']] == [('2024-12-01', 2), ('2024-12-02', 1)]
+    
+    status, body = history(handler, api_event, granularity='hour', to='2024-12-01')
+    assert [b['periodo'] for b in body['buckets']] == ['2024-12-01T11:00']
+
+
+@pytest.mark.parametrize('query', [
+    {'granularity': 'minute'},
+    {'from': '2024-12-05', 'to': '2024-12-01'},
+    {'from': 'ayer'},
+    {'granularity': 'hour', 'from': '2024-01-01', 'to': '2024-12-01'},
+])
+def test_invalid_ranges_are_bad_requests(handler, api_event, query):
+    status, _ = history(handler, api_event, **query)
+    
+    assert status == 400
+
+
+def test_requires_admin(handler, api_event):
+    status, _ = history(handler, api_event, role='student')
+    
+    assert status == 403
@@ -0,0 +1,163 @@
+"""
+events/stream.py: contadores de STATS#GLOBAL sumados una sola vez por grupo
+de registros, y GET /stats que solo lee ese item
+"""
+import json
+
+import pytest
+
+from events import stream
+from shared.registrations import registration_item
+from shared.stats import STATS_KEY
+from workshops import stats as stats_handler
+
+
+def workshop(workshop_id, cupo, inscritos=0, categoria='tecnologia'):
+    return {
+        'PK': f'WORKSHOP#{workshop_id}',
+        'SK': 'METADATA',
+        'nombre': f'Taller {workshop_id}',
+        'categoria': categoria,
+        'fecha': '2025-01-15',
+        'hora': '10:00',
+        'cupo': cupo,
+        'inscritos': inscritos,
+    }
+
+
+def student(student_id):
+    return {'PK': f'USER#{student_id}', 'SK': 'METADATA', 'role': 'student', 'nombre': student_id}
+
+
+def registration(workshop_id, student_id):
+    return registration_item(workshop_id, {
+        'estudiante_id': student_id,
+        'nombre': student_id,
+        'email': f'{student_id}@example.com',
+        'registrado_en': '2024-12-01T10:00:00',
+    })
+
+
+@pytest.fixture
+def stream_table(use_table):
+    return use_table(stream).table
+
+
+@pytest.fixture
+def global_stats(table):
+    def read():
+        item = table.get_item(Key=STATS_KEY, ConsistentRead=True).get('Item', {})
+        return {counter: int(item.get(counter, 0)) for counter in ('talleres', 'estudiantes', 'registros', 'cupos')}
+    return read
+
+
+@pytest.fixture
+def records(stream_table, stream_record):
+    """Lote típico: un taller, un estudiante y su inscripción"""
+    stream_table.put_item(Item=student('s1'))
+    return [
+        stream_record(new=workshop('w1', 10)),
+        stream_record(new=student('s1')),
+        stream_record(new=registration('w1', 's1')),
+        stream_record(old=workshop('w1', 10), new=workshop('w1', 10, inscritos=1)),
+    ]
+
+
+def test_batch_updates_global_stats(records, global_stats, stream_table):
+    assert stream.handler({'Records': records}, None) == {'batchItemFailures': []}
+    
+    assert global_stats() == {'talleres': 1, 'estudiantes': 1, 'registros': 1, 'cupos': 10}
+    user = stream_table.get_item(Key={'PK': 'USER#s1', 'SK': 'METADATA'})['Item']
+    assert user['inscritos_count'] == 1
+
+
+def test_redelivered_batch_is_counted_once(records, global_stats):
+    stream.handler({'Records': records}, None)
+    stream.handler({'Records': records}, None)
+    
+    assert global_stats() == {'talleres': 1, 'estudiantes': 1, 'registros': 1, 'cupos': 10}
+
+
+def test_groups_split_at_the_transaction_limit(records, global_stats, stream_table, monkeypatch):
+    monkeypatch.setattr(stream, 'TRANSACT_MAX_ITEMS', 4)
+    
+    assert stream.handler({'Records': records}, None) == {'batchItemFailures': []}
+    
+    markers = [item for item in stream_table.scan()['Items'] if item['PK'].startswith('STREAM#')]
+    assert len(markers) > 1
+    assert global_stats() == {'talleres': 1, 'estudiantes': 1, 'registros': 1, 'cupos': 10}
+
+
+def test_failed_record_is_reported_and_earlier_ones_kept(records, global_stats, monkeypatch):
+    record_deltas = stream.record_deltas
+    
+    def failing(record):
+        if record is records[2]:
+            raise RuntimeError('throttling')
+        return record_deltas(record)
+    
+    monkeypatch.setattr(stream, 'record_deltas', failing)
+    result = stream.handler({'Records': records}, None)
+    
+    assert result == {'batchItemFailures': [{'itemIdentifier': stream.sequence_number(records[2])}]}
+    assert global_stats() == {'talleres': 1, 'estudiantes': 1, 'registros': 0, 'cupos': 10}
+    
+    monkeypatch.undo()
+    retry = stream.handler({'Records': records[2:]}, None)
+    assert retry == {'batchItemFailures': []}
+
+
+def test_deleted_student_skips_only_its_counter(stream_table, stream_record, global_stats):
+    records = [
+        stream_record(new=workshop('w1', 5)),
+        stream_record(new=registration('w1', 'borrado')),
+        stream_record(old=workshop('w1', 5), new=workshop('w1', 5, inscritos=1)),
+    ]
+    
+    assert stream.handler({'Records': records}, None) == {'batchItemFailures': []}
+    
+    assert global_stats()['registros'] == 1
+    assert 'Item' not in stream_table.get_item(Key={'PK': 'USER#borrado', 'SK': 'METADATA'})
+
+
+def test_workshop_removal_subtracts_its_contribution(stream_table, stream_record, global_stats):
+    stream.handler({'Records': [stream_record(new=workshop('w1', 10, inscritos=3))]}, None)
+    
+    stream.handler({'Records': [stream_record(old=workshop('w1', 10, inscritos=3))]}, None)
+    
+    assert global_stats() == {'talleres': 0, 'estudiantes': 0, 'registros': 0, 'cupos': 0}
+
+
+def test_unlimited_workshop_adds_no_seats(stream_table, stream_record, global_stats):
+    stream.handler({'Records': [stream_record(new=workshop('w1', -1, inscritos=4))]}, None)
+    
+    assert global_stats() == {'talleres': 1, 'estudiantes': 0, 'registros': 4, 'cupos': 0}
+
+
+class TestGetStats:
+    @pytest.fixture
+    def handler(self, use_table):
+        use_table(stats_handler)
+        return stats_handler.handler
+    
+    def test_reads_the_materialized_item(self, handler, table, api_event):
+        table.put_item(Item={**STATS_KEY, 'talleres': 2, 'estudiantes': 3, 'registros': 5, 'cupos': 20})
+        
+        response = handler(api_event(), None)
+        
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {
+            'talleres': 2, 'estudiantes': 3, 'registros': 5, 'cupos': 20, 'ocupacion': 25,
+        }
+    
+    def test_missing_item_is_all_zeros(self, handler, api_event):
+        body = json.loads(handler(api_event(), None)['body'])
+        
+        assert body == {'talleres': 0, 'estudiantes': 0, 'registros': 0, 'cupos': 0, 'ocupacion': 0}
+    
+    def test_matching_etag_is_not_modified(self, handler, api_event):
+        etag = handler(api_event(), None)['headers']['ETag']
+        
+        response = handler(api_event(headers={'If-None-Match': etag}), None)
+        
+        assert response['statusCode'] == 304
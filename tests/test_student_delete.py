@@ -0,0 +1,146 @@
+"""
+DELETE /students/{id}: borrado del usuario y trabajo en segundo plano que
+anula sus inscripciones y esperas (students/delete_worker.py)
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.admission import LocalTicketQueue
+from shared.jobs import JOB_COMPLETED, JOB_FAILED
+from shared.registrations import registration_item, registration_key
+from shared.users import email_item, email_key, user_key
+from shared.waitlist import join_waitlist, waitlist_key
+from students import delete, delete_worker, job
+
+
+def inscripcion(student_id):
+    return {
+        'estudiante_id': student_id,
+        'nombre': f'Estudiante {student_id}',
+        'email': 'ana@example.com',
+        'registrado_en': '2024-12-01T10:00:00',
+    }
+
+
+@pytest.fixture
+def queue(use_table, monkeypatch):
+    use_table(delete)
+    use_table(delete_worker)
+    use_table(job)
+    # El backend en memoria de moto no es seguro entre hilos: la cascada corre en uno
+    monkeypatch.setattr(delete_worker, 'CASCADE_WORKERS', 1)
+    monkeypatch.setattr(delete, 'cognito', MagicMock())
+    monkeypatch.setattr(delete, 'USER_POOL_ID', 'pool')
+    queue = LocalTicketQueue()
+    monkeypatch.setattr(delete, 'cascade_queue', queue)
+    return queue
+
+
+@pytest.fixture
+def student(table, put_workshop):
+    """Estudiante con dos inscripciones y una espera"""
+    table.put_item(Item={**user_key('s1'), 'email': 'ana@example.com', 'role': 'student'})
+    table.put_item(Item=email_item('ana@example.com', 's1', '2024-11-01T10:00:00'))
+    for workshop_id in ('w1', 'w2'):
+        put_workshop(workshop_id, 5, inscritos=1)
+        table.put_item(Item=registration_item(workshop_id, inscripcion('s1')))
+    put_workshop('lleno', 0)
+    join_waitlist(table, 'lleno', inscripcion('s1'))
+    return 's1'
+
+
+def delete_student(api_event, student_id='s1'):
+    response = delete.handler(api_event('admin', path={'id': student_id}), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def job_status(api_event, job_id):
+    response = job.handler(api_event('admin', path={'id': job_id}), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_cascade_removes_registrations_and_waits(queue, student, table, api_event, get_workshop):
+    status, body = delete_student(api_event)
+    
+    assert status == 202
+    assert 'Item' not in table.get_item(Key=user_key('s1'))
+    assert 'Item' not in table.get_item(Key=email_key('ana@example.com'))
+    delete.cognito.admin_delete_user.assert_called_once_with(UserPoolId='pool', Username='ana@example.com')
+    
+    assert delete_worker.handler(queue.drain(), None) == {'batchItemFailures': []}
+    
+    assert [get_workshop(w)['inscritos'] for w in ('w1', 'w2')] == [0, 0]
+    assert get_workshop('lleno')['en_espera'] == 0
+    assert 'Item' not in table.get_item(Key=registration_key('w1', 's1'))
+    assert 'Item' not in table.get_item(Key=waitlist_key('lleno', 's1'))
+    status, progress = job_status(api_event, body['job'])
+    assert status == 200
+    assert (progress['estado'], progress['total'], progress['procesados'], progress['omitidos']) == (JOB_COMPLETED, 3, 3, 0)
+
+
+def test_retried_job_does_not_decrement_twice(queue, student, api_event, get_workshop):
+    _, body = delete_student(api_event)
+    records = queue.drain()
+    delete_worker.handler(records, None)
+    
+    delete_worker.handler(records, None)
+    
+    assert get_workshop('w1')['inscritos'] == 0
+    _, progress = job_status(api_event, body['job'])
+    assert (progress['estado'], progress['total'], progress['procesados']) == (JOB_COMPLETED, 0, 0)
+
+
+def test_orphan_registration_is_deleted(queue, student, table, api_event):
+    table.delete_item(Key={'PK': 'WORKSHOP#w2', 'SK': 'METADATA'})
+    delete_student(api_event)
+    
+    assert delete_worker.handler(queue.drain(), None) == {'batchItemFailures': []}
+    
+    assert 'Item' not in table.get_item(Key=registration_key('w2', 's1'))
+
+
+def test_lookup_by_email(queue, student, table, api_event):
+    status, body = delete_student(api_event, 'ana@example.com')
+    
+    assert status == 202
+    assert body['email'] == 'ana@example.com'
+    assert 'Item' not in table.get_item(Key=user_key('s1'))
+
+
+def test_unknown_student_is_not_found(queue, api_event):
+    status, _ = delete_student(api_event, 'nadie')
+    
+    assert status == 404
+
+
+def test_enqueue_failure_marks_job_failed(queue, student, api_event, monkeypatch):
+    broken = MagicMock()
+    broken.send.side_effect = RuntimeError('cola no disponible')
+    monkeypatch.setattr(delete, 'cascade_queue', broken)
+    
+    status, body = delete_student(api_event)
+    
+    assert status == 202
+    assert body['estado'] == JOB_FAILED
+    _, progress = job_status(api_event, body['job'])
+    assert progress['estado'] == JOB_FAILED
+
+
+def test_failed_cascade_returns_to_queue(queue, student, api_event, monkeypatch):
+    _, body = delete_student(api_event)
+    records = queue.drain()
+    monkeypatch.setattr(delete_worker, 'student_entries', MagicMock(side_effect=RuntimeError('throttling')))
+    
+    result = delete_worker.handler(records, None)
+    
+    assert result == {'batchItemFailures': [{'itemIdentifier': records['Records'][0]['messageId']}]}
+    _, progress = job_status(api_event, body['job'])
+    assert progress['estado'] == JOB_FAILED
+
+
+def test_unknown_job_is_not_found(queue, api_event):
+    status, _ = job_status(api_event, 'no-existe')
+    
+    assert status == 404
@@ -0,0 +1,84 @@
+"""
+students/list.py: estudiantes desde GSI1 paginados por cursor
+"""
+import json
+
+import pytest
+
+from shared.registrations import STUDENT_COUNTER
+from students import list as students_list
+
+
+@pytest.fixture
+def handler(use_table, table):
+    use_table(students_list)
+    for day in range(1, 6):
+        table.put_item(Item={
+            'PK': f'USER#s{day}',
+            'SK': 'PROFILE',
+            'GSI1PK': 'USER#STUDENTS',
+            'GSI1SK': f'2024-11-0{day}T10:00:00',
+            'email': f's{day}@example.com',
+            'nombre': f'Estudiante s{day}',
+            'creado_en': f'2024-11-0{day}T10:00:00',
+            STUDENT_COUNTER: day,
+        })
+    # Los administradores no están en la partición de estudiantes
+    table.put_item(Item={'PK': 'USER#admin', 'SK': 'PROFILE', 'email': 'admin@example.com'})
+    return students_list.handler
+
+
+def call(handler, api_event, role='admin', **query):
+    response = handler(api_event(role, query=query or None), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+@pytest.mark.parametrize('order, expected', [
+    ('desc', ['s5', 's4', 's3', 's2', 's1']),
+    ('asc', ['s1', 's2', 's3', 's4', 's5']),
+])
+def test_pages_follow_next_cursor(handler, api_event, order, expected):
+    seen = []
+    cursor = None
+    while True:
+        query = {'limit': '2', 'order': order, **({'cursor': cursor} if cursor else {})}
+        status, body = call(handler, api_event, **query)
+        assert status == 200
+        assert len(body['students']) <= 2
+        seen.extend(student['_id'] for student in body['students'])
+        cursor = body['nextCursor']
+        if not cursor:
+            break
+    
+    assert seen == expected
+
+
+def test_student_fields(handler, api_event):
+    status, body = call(handler, api_event, limit='1')
+    
+    assert status == 200
+    assert body['students'] == [{
+        '_id': 's5',
+        'email': 's5@example.com',
+        'nombre': 'Estudiante s5',
+        'apellido': '',
+        'carnet': '',
+        'carrera': '',
+        'fecha_registro': '2024-11-05T10:00:00',
+        'talleres_inscritos': 5,
+        'estado': 'activo',
+    }]
+
+
+@pytest.mark.parametrize('query', [{'cursor': 'no-es-un-cursor'}, {'limit': 'diez'}, {'order': 'random'}])
+def test_invalid_parameters_are_rejected(handler, api_event, query):
+    status, body = call(handler, api_event, **query)
+    
+    assert status == 400
+    assert body['mensaje'] == 'Parámetros de paginación inválidos'
+
+
+def test_requires_admin(handler, api_event):
+    status, _ = call(handler, api_event, role='student')
+    
+    assert status == 403
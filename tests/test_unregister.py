@@ -0,0 +1,83 @@
+"""
+registrations/unregister.py: anulación atómica (REG# + contador) o salida
+de la lista de espera
+"""
+import json
+
+import pytest
+
+from registrations import unregister
+from shared.registrations import registration_item, registration_key
+from shared.waitlist import join_waitlist, waitlist_key
+
+
+def inscripcion(student_id):
+    return {
+        'estudiante_id': student_id,
+        'nombre': f'Estudiante {student_id}',
+        'email': f'{student_id}@example.com',
+        'registrado_en': '2024-12-01T10:00:00',
+    }
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(unregister)
+    return unregister.handler
+
+
+def call(handler, api_event, workshop_id='w1', role='student'):
+    response = handler(api_event(role, path={'id': workshop_id}), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_removes_registration_and_decrements(handler, api_event, table, put_workshop, get_workshop):
+    put_workshop('w1', 5, inscritos=2)
+    table.put_item(Item=registration_item('w1', inscripcion('s1')))
+    
+    status, body = call(handler, api_event)
+    
+    assert status == 200
+    assert body['cupos_disponibles'] == 4
+    assert get_workshop('w1')['inscritos'] == 1
+    assert 'Item' not in table.get_item(Key=registration_key('w1', 's1'))
+    entry = unregister.events.put_events.call_args.kwargs['Entries'][0]
+    assert entry['DetailType'] == 'STUDENT_UNREGISTERED'
+
+
+def test_not_registered_is_not_found(handler, api_event, put_workshop, get_workshop):
+    put_workshop('w1', 5, inscritos=1)
+    
+    status, body = call(handler, api_event)
+    
+    assert status == 404
+    assert body['mensaje'] == 'No estás inscrito en este taller'
+    assert get_workshop('w1')['inscritos'] == 1
+
+
+def test_waiting_student_leaves_the_waitlist(handler, api_event, table, put_workshop, get_workshop):
+    put_workshop('w1', 0)
+    join_waitlist(table, 'w1', inscripcion('s1'))
+    
+    status, body = call(handler, api_event)
+    
+    assert status == 200
+    assert body['mensaje'] == 'Saliste de la lista de espera'
+    assert get_workshop('w1')['en_espera'] == 0
+    assert 'Item' not in table.get_item(Key=waitlist_key('w1', 's1'))
+
+
+def test_deleted_workshop_is_not_found(handler, api_event, table):
+    table.put_item(Item=registration_item('w1', inscripcion('s1')))
+    
+    status, body = call(handler, api_event)
+    
+    assert status == 404
+    assert body['mensaje'] == 'Taller no encontrado'
+    assert 'Item' in table.get_item(Key=registration_key('w1', 's1'))
+
+
+def test_requires_student(handler, api_event):
+    status, _ = call(handler, api_event, role='admin')
+    
+    assert status == 403
@@ -0,0 +1,104 @@
+"""
+Promoción de la lista de espera (events/stream.py): cada rama de las
+CancellationReasons de promote_transaction
+"""
+import pytest
+
+from events import stream
+from shared.registrations import registration_item, registration_key
+from shared.waitlist import waitlist_key, waitlist_items
+
+
+@pytest.fixture
+def stream_table(use_table):
+    return use_table(stream).table
+
+
+@pytest.fixture
+def put_waiting(table):
+    """Agrega un estudiante a la lista de espera (el contador en_espera lo lleva el test)"""
+    def put(workshop_id, student_id, since):
+        table.put_item(Item={
+            **waitlist_key(workshop_id, student_id),
+            'workshop_id': workshop_id,
+            'estudiante_id': student_id,
+            'nombre': f'Estudiante {student_id}',
+            'email': f'{student_id}@example.com',
+            'en_espera_desde': since,
+        })
+    return put
+
+
+def waiting_ids(table, workshop_id):
+    return [item['estudiante_id'] for item in waitlist_items(table, workshop_id)]
+
+
+def is_registered(table, workshop_id, student_id):
+    return 'Item' in table.get_item(Key=registration_key(workshop_id, student_id))
+
+
+def test_promotes_in_arrival_order(stream_table, put_workshop, get_workshop, put_waiting):
+    item = put_workshop('w1', 2, inscritos=0, en_espera=2)
+    put_waiting('w1', 'tarde', '2024-12-01T10:05:00')
+    put_waiting('w1', 'temprano', '2024-12-01T10:00:00')
+    
+    promoted = stream.promote_waitlist('w1', item)
+    
+    assert [entry['estudiante_id'] for entry in promoted] == ['temprano', 'tarde']
+    assert get_workshop('w1')['inscritos'] == 2
+    assert get_workshop('w1')['en_espera'] == 0
+    assert waiting_ids(stream_table, 'w1') == []
+    entries = stream.events.put_events.call_args.kwargs['Entries']
+    assert {entry['EventBusName'] for entry in entries} == {stream.EVENT_BUS_NAME}
+
+
+def test_stops_when_workshop_is_full(stream_table, put_workshop, get_workshop, put_waiting):
+    item = put_workshop('w1', 1, inscritos=0, en_espera=3)
+    put_waiting('w1', 's1', '2024-12-01T10:00:00')
+    put_waiting('w1', 's2', '2024-12-01T10:01:00')
+    put_waiting('w1', 's3', '2024-12-01T10:02:00')
+    
+    promoted = stream.promote_waitlist('w1', item)
+    
+    assert [entry['estudiante_id'] for entry in promoted] == ['s1']
+    assert get_workshop('w1')['inscritos'] == 1
+    assert get_workshop('w1')['en_espera'] == 2
+    assert waiting_ids(stream_table, 'w1') == ['s2', 's3']
+
+
+def test_stops_when_workshop_was_deleted(stream_table, put_waiting):
+    put_waiting('w1', 's1', '2024-12-01T10:00:00')
+    
+    assert stream.promote_waitlist('w1', {'nombre': 'Taller w1'}) == []
+    assert waiting_ids(stream_table, 'w1') == ['s1']
+    stream.events.put_events.assert_not_called()
+
+
+def test_already_registered_leaves_waitlist(stream_table, put_workshop, get_workshop, put_waiting):
+    item = put_workshop('w1', 3, inscritos=1, en_espera=2)
+    stream_table.put_item(Item=registration_item('w1', {
+        'estudiante_id': 's1', 'nombre': '', 'email': '', 'registrado_en': '2024-12-01T09:00:00',
+    }))
+    put_waiting('w1', 's1', '2024-12-01T10:00:00')
+    put_waiting('w1', 's2', '2024-12-01T10:01:00')
+    
+    promoted = stream.promote_waitlist('w1', item)
+    
+    assert [entry['estudiante_id'] for entry in promoted] == ['s2']
+    assert get_workshop('w1')['inscritos'] == 2
+    assert get_workshop('w1')['en_espera'] == 0
+    assert waiting_ids(stream_table, 'w1') == []
+
+
+def test_skips_entry_that_left_the_waitlist(stream_table, put_workshop, get_workshop, put_waiting, monkeypatch):
+    item = put_workshop('w1', 2, inscritos=0, en_espera=1)
+    put_waiting('w1', 's2', '2024-12-01T10:01:00')
+    # La entrada de s1 se leyó de la lista pero el estudiante salió antes de la promoción
+    gone = {**waitlist_key('w1', 's1'), 'estudiante_id': 's1', 'en_espera_desde': '2024-12-01T10:00:00'}
+    monkeypatch.setattr(stream, 'waitlist_items', lambda table, workshop_id: [gone] + waitlist_items(table, workshop_id))
+    
+    promoted = stream.promote_waitlist('w1', item)
+    
+    assert [entry['estudiante_id'] for entry in promoted] == ['s2']
+    assert not is_registered(stream_table, 'w1', 's1')
+    assert get_workshop('w1')['inscritos'] == 1
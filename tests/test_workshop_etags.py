@@ -0,0 +1,163 @@
+"""
+ETag / If-None-Match en GET /workshops y GET /workshops/{id}: el ETag sale de
+la versión de los talleres, así un 304 se responde sin serializar
+"""
+import pytest
+
+from shared.catalog import bump_catalog_version
+from shared.registrations import registration_item
+from workshops import get as get_workshop_handler
+from workshops import list as list_workshops
+
+
+def not_serialized(*args, **kwargs):
+    raise AssertionError('un 304 no debe serializar el cuerpo')
+
+
+@pytest.fixture
+def list_handler(use_table):
+    return use_table(list_workshops).handler
+
+
+@pytest.fixture
+def get_handler(use_table):
+    return use_table(get_workshop_handler).handler
+
+
+@pytest.fixture
+def workshop(put_workshop):
+    return put_workshop('w1', 10, inscritos=0, creado_en='2024-12-01T10:00:00', actualizado_en=None)
+
+
+def register(table, student_id, workshop_id='w1'):
+    """Inscripción y contador tal como quedan tras register_transaction"""
+    table.put_item(Item=registration_item(workshop_id, {
+        'estudiante_id': student_id, 'nombre': '', 'email': '', 'registrado_en': f'2024-12-02T{student_id}',
+    }))
+    table.update_item(
+        Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+        UpdateExpression='ADD inscritos :one',
+        ExpressionAttributeValues={':one': 1}
+    )
+
+
+def edit(table, workshop_id='w1', **attributes):
+    """Edición de un taller como la hace workshops/update.py"""
+    table.update_item(
+        Key={'PK': f'WORKSHOP#{workshop_id}', 'SK': 'METADATA'},
+        UpdateExpression='SET actualizado_en = :now, ' + ', '.join(f'{k} = :{k}' for k in attributes),
+        ExpressionAttributeValues={':now': '2024-12-03T10:00:00', **{f':{k}': v for k, v in attributes.items()}}
+    )
+    bump_catalog_version(table)
+
+
+def revalidate(handler, api_event, etag, **kwargs):
+    return handler(api_event(headers={'If-None-Match': etag}, **kwargs), None)
+
+
+class TestList:
+    def test_matching_etag_skips_serialization(self, list_handler, api_event, workshop, monkeypatch):
+        first = list_handler(api_event(), None)
+        monkeypatch.setattr(list_workshops, 'serialize_workshop', not_serialized)
+        monkeypatch.setattr(list_workshops, 'dumps', not_serialized)
+        
+        second = revalidate(list_handler, api_event, first['headers']['ETag'])
+        
+        assert first['statusCode'] == 200
+        assert second['statusCode'] == 304
+        assert second['headers']['ETag'] == first['headers']['ETag']
+        assert second['body'] == ''
+    
+    def test_registration_changes_etag_with_warm_catalog(self, list_handler, api_event, table, workshop):
+        first = list_handler(api_event(), None)
+        register(table, 's1')
+        
+        second = revalidate(list_handler, api_event, first['headers']['ETag'])
+        
+        assert second['statusCode'] == 200
+        assert '"inscritos":1' in second['body']
+    
+    def test_registration_keeps_etag_without_counter_fields(self, list_handler, api_event, table, workshop):
+        first = list_handler(api_event(query={'fields': 'nombre'}), None)
+        register(table, 's1')
+        
+        second = revalidate(list_handler, api_event, first['headers']['ETag'], query={'fields': 'nombre'})
+        
+        assert second['statusCode'] == 304
+    
+    def test_edit_changes_etag(self, list_handler, api_event, table, workshop):
+        first = list_handler(api_event(), None)
+        edit(table, nombre='Otro nombre')
+        
+        second = revalidate(list_handler, api_event, first['headers']['ETag'])
+        
+        assert second['statusCode'] == 200
+        assert 'Otro nombre' in second['body']
+    
+    def test_new_workshop_changes_etag(self, list_handler, api_event, table, workshop, put_workshop):
+        first = list_handler(api_event(), None)
+        put_workshop('w2', 5, creado_en='2024-12-04T10:00:00')
+        bump_catalog_version(table)
+        
+        assert revalidate(list_handler, api_event, first['headers']['ETag'])['statusCode'] == 200
+    
+    def test_compressed_etag_revalidates(self, list_handler, api_event, put_workshop):
+        for index in range(20):
+            put_workshop(f'w{index:02}', 10, descripcion='x' * 100, creado_en='2024-12-01T10:00:00')
+        headers = {'Accept-Encoding': 'gzip'}
+        
+        first = list_handler(api_event(headers=headers), None)
+        second = list_handler(api_event(headers={**headers, 'If-None-Match': first['headers']['ETag']}), None)
+        
+        assert first['headers']['Content-Encoding'] == 'gzip'
+        assert first['headers']['ETag'].endswith('-gzip"')
+        assert second['statusCode'] == 304
+
+
+class TestGet:
+    def get(self, handler, api_event, headers=None, **query):
+        return handler(api_event(path={'id': 'w1'}, query=query or None, headers=headers), None)
+    
+    def test_matching_etag_skips_serialization(self, get_handler, api_event, workshop, monkeypatch):
+        first = self.get(get_handler, api_event)
+        monkeypatch.setattr(get_workshop_handler, 'serialize_workshop', not_serialized)
+        monkeypatch.setattr(get_workshop_handler, 'dumps', not_serialized)
+        
+        second = self.get(get_handler, api_event, headers={'If-None-Match': first['headers']['ETag']})
+        
+        assert first['statusCode'] == 200
+        assert second['statusCode'] == 304
+    
+    @pytest.mark.parametrize('query, changes', [({}, True), ({'fields': 'nombre,cupo'}, False), ({'view': 'summary'}, True)])
+    def test_registration_changes_etag_when_counted(self, get_handler, api_event, table, workshop, query, changes):
+        first = self.get(get_handler, api_event, **query)
+        register(table, 's1')
+        
+        second = self.get(get_handler, api_event, headers={'If-None-Match': first['headers']['ETag']}, **query)
+        
+        assert second['statusCode'] == (200 if changes else 304)
+    
+    def test_registration_list_changes_etag(self, get_handler, api_event, table, workshop):
+        register(table, 's1')
+        first = self.get(get_handler, api_event, fields='inscripciones')
+        # Otro estudiante reemplaza al primero: el contador no cambia, la lista sí
+        table.delete_item(Key={'PK': 'WORKSHOP#w1', 'SK': 'REG#s1'})
+        table.put_item(Item=registration_item('w1', {
+            'estudiante_id': 's2', 'nombre': '', 'email': '', 'registrado_en': '2024-12-02T11:00:00',
+        }))
+        
+        second = self.get(get_handler, api_event, headers={'If-None-Match': first['headers']['ETag']}, fields='inscripciones')
+        
+        assert second['statusCode'] == 200
+        assert 's2' in second['body']
+    
+    def test_edit_changes_etag(self, get_handler, api_event, table, workshop):
+        first = self.get(get_handler, api_event)
+        edit(table, lugar='Aula 2')
+        
+        second = self.get(get_handler, api_event, headers={'If-None-Match': first['headers']['ETag']})
+        
+        assert second['statusCode'] == 200
+    
+    def test_missing_workshop(self, get_handler, api_event, table):
+        assert self.get(get_handler, api_event)['statusCode'] == 404
@@ -0,0 +1,64 @@
+"""
+workshops/update.py: el cupo nunca queda por debajo de los inscritos
+"""
+import json
+
+import pytest
+
+from workshops import update
+
+
+@pytest.fixture
+def handler(use_table):
+    use_table(update)
+    return update.handler
+
+
+def put_cupo(handler, api_event, cupo):
+    return handler(api_event('admin', path={'id': 'w1'}, body={'cupo': cupo}), None)
+
+
+def test_updates_cupo(handler, api_event, put_workshop, get_workshop):
+    put_workshop('w1', 10, inscritos=3)
+    
+    response = put_cupo(handler, api_event, 5)
+    
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['cupos_disponibles'] == 2
+    assert get_workshop('w1')['cupo'] == 5
+
+
+def test_rejects_cupo_below_registrations(handler, api_event, put_workshop, get_workshop):
+    put_workshop('w1', 10, inscritos=3)
+    
+    response = put_cupo(handler, api_event, 2)
+    
+    assert response['statusCode'] == 400
+    assert '(3)' in json.loads(response['body'])['mensaje']
+    assert get_workshop('w1')['cupo'] == 10
+
+
+def test_registration_between_read_and_write(handler, api_event, table, put_workshop, get_workshop, monkeypatch):
+    stale = put_workshop('w1', 10, inscritos=3)
+    table.update_item(
+        Key={'PK': 'WORKSHOP#w1', 'SK': 'METADATA'},
+        UpdateExpression='SET inscritos = :inscritos',
+        ExpressionAttributeValues={':inscritos': 4}
+    )
+    monkeypatch.setattr(table, 'get_item', lambda **kwargs: {'Item': stale})
+    
+    response = put_cupo(handler, api_event, 3)
+    monkeypatch.undo()
+    
+    assert response['statusCode'] == 400
+    assert '(4)' in json.loads(response['body'])['mensaje']
+    assert get_workshop('w1')['cupo'] == 10
+
+
+def test_other_fields_skip_the_condition(handler, api_event, put_workshop, get_workshop):
+    put_workshop('w1', 10, inscritos=3)
+    
+    response = handler(api_event('admin', path={'id': 'w1'}, body={'lugar': 'Aula 2'}), None)
+    
+    assert response['statusCode'] == 200
+    assert get_workshop('w1')['lugar'] == 'Aula 2'
@@ -0,0 +1,125 @@
+"""
+GET /workshops: paginación por cursor sobre el índice, el catálogo en
+memoria y el ranking de búsqueda
+"""
+import json
+
+import pytest
+
+from shared.search import sync_workshop_terms
+from workshops import list as list_workshops
+
+
+@pytest.fixture
+def handler(use_table):
+    return use_table(list_workshops).handler
+
+
+@pytest.fixture(params=['catalogo', 'query'])
+def source(request, monkeypatch):
+    """Cada página se resuelve desde el catálogo en memoria o con una Query al índice"""
+    if request.param == 'query':
+        # Catálogo demasiado grande para cachear
+        monkeypatch.setattr(list_workshops, 'load_catalog', lambda table: None)
+    return request.param
+
+
+@pytest.fixture
+def workshops(table, put_workshop):
+    """Seis talleres en dos categorías, uno por día, indexados para la búsqueda"""
+    items = []
+    for day in range(1, 7):
+        categoria = 'tecnologia' if day % 2 else 'arte'
+        item = put_workshop(f'w{day}', 10, fecha=f'2025-01-0{day}', categoria=categoria, nombre=f'Python {categoria} {day}')
+        sync_workshop_terms(table, f'w{day}', None, item)
+        items.append(item)
+    return items
+
+
+def get_page(handler, api_event, **query):
+    response = handler(api_event(query=query), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def collect(handler, api_event, **query):
+    """IDs de todas las páginas siguiendo nextCursor"""
+    ids = []
+    cursor = None
+    while True:
+        params = dict(query, **({'cursor': cursor} if cursor else {}))
+        status, body = get_page(handler, api_event, **params)
+        assert status == 200
+        ids.extend(workshop['_id'] for workshop in body['workshops'])
+        cursor = body['nextCursor']
+        if not cursor:
+            return ids
+
+
+def test_pages_follow_index_order(handler, api_event, workshops, source):
+    assert collect(handler, api_event, limit='2') == [f'w{day}' for day in range(1, 7)]
+
+
+def test_filters_apply_before_paging(handler, api_event, workshops, source):
+    status, body = get_page(handler, api_event, categoria='arte', fechaDesde='2025-01-03', limit='1')
+    
+    assert status == 200
+    assert [workshop['_id'] for workshop in body['workshops']] == ['w4']
+    assert body['nextCursor']
+    assert collect(handler, api_event, categoria='arte', fechaDesde='2025-01-03', limit='1') == ['w4', 'w6']
+
+
+def test_date_range_includes_whole_last_day(handler, api_event, workshops, source):
+    assert collect(handler, api_event, fechaDesde='2025-01-02', fechaHasta='2025-01-04') == ['w2', 'w3', 'w4']
+
+
+def test_search_pages_over_ranking(handler, api_event, workshops, source):
+    ids = collect(handler, api_event, q='python arte', limit='2')
+    
+    assert sorted(ids) == ['w2', 'w4', 'w6']
+
+
+def test_query_without_indexable_terms_filters_by_substring(handler, api_event, table, put_workshop, source):
+    put_workshop('c', 10, nombre='Taller de C')
+    put_workshop('go', 10, nombre='Go para todos')
+    
+    status, body = get_page(handler, api_event, q='c')
+    
+    assert status == 200
+    assert [workshop['_id'] for workshop in body['workshops']] == ['c']
+
+
+@pytest.mark.parametrize('first, second', [
+    ({'q': 'python'}, {}),
+    ({'q': 'python'}, {'q': 'arte'}),
+    ({}, {'q': 'python'}),
+    ({}, {'categoria': 'arte'}),
+    ({'categoria': 'arte'}, {'categoria': 'tecnologia'}),
+])
+def test_cursor_from_another_query_is_rejected(handler, api_event, workshops, source, first, second):
+    status, body = get_page(handler, api_event, limit='1', **first)
+    assert status == 200 and body['nextCursor']
+    
+    status, body = get_page(handler, api_event, limit='1', cursor=body['nextCursor'], **second)
+    
+    assert status == 400
+
+
+@pytest.mark.parametrize('cursor', ['no-es-base64!', 'eyJvZmZzZXQiOiIxIn0'])
+def test_invalid_cursor_is_rejected(handler, api_event, workshops, cursor):
+    status, _ = get_page(handler, api_event, cursor=cursor)
+    
+    assert status == 400
+
+
+def test_read_budget_returns_cursor_to_continue(handler, api_event, table, put_workshop, monkeypatch):
+    monkeypatch.setattr(list_workshops, 'load_catalog', lambda table: None)
+    monkeypatch.setattr(list_workshops, 'MAX_QUERY_PAGES', 1)
+    for day in range(1, 5):
+        put_workshop(f'w{day}', 10, fecha=f'2025-01-0{day}', nombre='Robótica' if day == 4 else 'Cerámica')
+    
+    status, body = get_page(handler, api_event, q='b', limit='2')
+    
+    assert status == 200
+    assert body['workshops'] == []
+    assert body['nextCursor']
+    assert collect(handler, api_event, q='b', limit='2') == ['w4']